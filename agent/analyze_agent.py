@@ -49,8 +49,16 @@ def create_multi_df_analyze_agent(
         analysis_tools.list_available_dataframes,
         analysis_tools.get_dataframe_info,
         analysis_tools.execute_python_on_dataframes,
+        analysis_tools.get_result_page,
         analysis_tools.analyze_financial_metrics,
+        analysis_tools.analyze_financial_metrics_batch,
+        analysis_tools.get_financial_ratios,
+        analysis_tools.analyze_multi_year_trend,
+        analysis_tools.screen_companies,
     ]
+    # duckdb가 설치된 경우에만 SQL 도구 사용
+    if analysis_tools.HAS_DUCKDB:
+        tools.append(analysis_tools.execute_sql_on_dataframes)
     
     # 3. LLM 초기화
     api_key = get_openai_api_key()
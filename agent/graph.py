@@ -337,8 +337,10 @@ def run_dart_workflow(user_input: str, data_store: SessionDataStore = None, verb
         최종 상태
     """
     from utils.callbacks import SimpleToolCallbackHandler
+    from utils.warmup import get_warm_workflow
     
-    app = create_dart_workflow(verbose=verbose)
+    # 백그라운드에서 미리 컴파일된 워크플로우가 있으면 재사용
+    app = get_warm_workflow(verbose) or create_dart_workflow(verbose=verbose)
     
     initial_state = {
         "messages": [HumanMessage(content=user_input)],
@@ -8,7 +8,13 @@ from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from typing import Optional
 
-from tools.opendart.langchain_tools import search_corp_code, search_financial_statements, set_data_store
+from tools.opendart.langchain_tools import (
+    search_corp_code,
+    search_financial_statements,
+    search_financial_statements_bulk,
+    load_screening_universe,
+    set_data_store
+)
 from resources.config import OPENAI_API_KEY
 from resources.prompt_loader import prompt_loader
 from utils.data_store import SessionDataStore
@@ -43,6 +49,8 @@ def create_opendart_agent(
     tools = [
         search_corp_code,
         search_financial_statements,
+        search_financial_statements_bulk,
+        load_screening_universe,
     ]
     
     # 3. 에이전트가 사용할 LLM 정의
@@ -8,6 +8,7 @@ import argparse
 from agent.graph import run_dart_workflow
 from utils.data_store import SessionDataStore
 from utils.callbacks import SimpleToolCallbackHandler
+from utils.warmup import start_warmup
 
 
 def run_console_mode(verbose=False):
@@ -16,6 +17,9 @@ def run_console_mode(verbose=False):
     Args:
         verbose (bool): 상세 출력 모드 여부
     """
+    # 회사 인덱스, HTTP 연결, 워크플로우를 백그라운드에서 미리 준비
+    start_warmup(verbose=verbose)
+    
     print("DART 데이터 분석 에이전트 (콘솔 모드)")
     print("=" * 50)
     if not verbose:
@@ -7,6 +7,9 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 DART_API_KEY = os.getenv("DART_API_KEY")
 
+# OpenDart 관련 로컬 상태(호출 횟수, 캐시 등)를 저장할 디렉토리
+DART_CACHE_DIR = os.getenv("DART_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "dart_agent"))
+
 # API 키 유효성 검사 (개발 시에는 경고만 표시)
 def validate_api_keys():
     """API 키의 유효성을 검사하고 경고를 표시합니다."""
@@ -35,6 +38,11 @@ def get_dart_api_key():
     """DART API 키를 반환합니다."""
     return DART_API_KEY
 
+def get_cache_dir():
+    """로컬 캐시 디렉토리 경로를 반환합니다 (없으면 생성)."""
+    os.makedirs(DART_CACHE_DIR, exist_ok=True)
+    return DART_CACHE_DIR
+
 def load_env():
     """환경 변수를 다시 로드합니다."""
     load_dotenv(override=True) 
@@ -16,6 +16,8 @@ class PromptLoader:
             base_path (str): 프롬프트 파일들이 저장된 기본 경로
         """
         self.base_path = base_path
+        # 한 번 읽은 프롬프트는 메모리에 보관합니다 (reload_prompt로 갱신)
+        self._cache: Dict[str, str] = {}
     
     def load_prompt(self, agent_name: str, prompt_type: str = "system") -> str:
         """
@@ -32,12 +34,16 @@ class PromptLoader:
             FileNotFoundError: 프롬프트 파일이 존재하지 않을 경우
         """
         file_path = os.path.join(self.base_path, agent_name, f"{prompt_type}.txt")
+        if file_path in self._cache:
+            return self._cache[file_path]
         
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"프롬프트 파일을 찾을 수 없습니다: {file_path}")
         
         with open(file_path, "r", encoding="utf-8") as f:
-            return f.read().strip()
+            prompt = f.read().strip()
+        self._cache[file_path] = prompt
+        return prompt
     
     def load_agent_prompts(self, agent_name: str) -> Dict[str, str]:
         """
@@ -76,6 +82,8 @@ class PromptLoader:
         Returns:
             str: 프롬프트 텍스트
         """
+        file_path = os.path.join(self.base_path, agent_name, f"{prompt_type}.txt")
+        self._cache.pop(file_path, None)
         return self.load_prompt(agent_name, prompt_type)
 
 
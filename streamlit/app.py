@@ -11,10 +11,18 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agent.graph import create_dart_workflow
-from utils.data_store import SessionDataStore
+from utils.data_store import PERSIST_DIR, SessionDataStore, fork_session, new_session_id, session_dir_for, sweep_sessions
 from utils.callbacks import StreamlitLogCallbackHandler
+from utils.warmup import start_warmup, is_ready, get_warm_workflow
 
 
+# --- 프로세스 시작 시 백그라운드 준비 (프로세스당 1회) ---
+@st.cache_resource
+def _start_warmup():
+    return start_warmup(verbose=False)
+
+_start_warmup()
+
 # --- 페이지 설정 ---
 st.set_page_config(
     page_title="DART 데이터 분석 에이전트",
@@ -51,17 +59,45 @@ if "langchain_messages" not in st.session_state:
                          "- 여러 기업의 재무 데이터를 비교 분석할 수 있습니다.")
     ]
 
+def create_session_store(session_id=None) -> SessionDataStore:
+    """
+    세션 데이터 저장소를 만듭니다. DART_STORE_PERSIST_DIR가 설정되어 있으면 URL의 세션 ID로
+    이전에 저장한 데이터를 복원하여, 컨테이너가 재시작되어도 다시 조회하지 않아도 됩니다.
+    같은 세션을 다른 탭(또는 공유된 URL)이 사용 중이면 데이터를 복사한 새 세션으로 분기합니다.
+    세션 ID가 있는 URL을 가진 사람은 저장된 데이터에 접근할 수 있으므로 URL을 공유할 때 주의해야 합니다.
+    오래 사용하지 않은 세션과 분기된 복사본은 sweep_sessions가 보관 기간/크기 한도에 따라 정리합니다.
+    """
+    sweep_sessions()
+    session_dir = session_dir_for(session_id)
+    if session_dir is None and PERSIST_DIR:
+        session_id = new_session_id()
+        session_dir = session_dir_for(session_id)
+    store = SessionDataStore(session_dir=session_dir)
+    if session_dir is not None and store.session_dir is None:
+        session_id = new_session_id()
+        fork_session(session_dir, session_dir_for(session_id))
+        store = SessionDataStore(session_dir=session_dir_for(session_id))
+    if store.session_dir is not None:
+        st.query_params["session"] = session_id
+    return store
+
+
 if "data_store" not in st.session_state:
-    st.session_state.data_store = SessionDataStore()
+    st.session_state.data_store = create_session_store(st.query_params.get("session"))
     
 if "graph_app" not in st.session_state:
-    st.session_state.graph_app = create_dart_workflow(verbose=st.session_state.get("verbose", False))
+    verbose = st.session_state.get("verbose", False)
+    # 미리 컴파일된 워크플로우가 있으면 재사용
+    st.session_state.graph_app = get_warm_workflow(verbose) or create_dart_workflow(verbose=verbose)
 
 if "verbose" not in st.session_state:
     st.session_state.verbose = False
 
 # --- 사이드바 - 저장된 데이터 표시 ---
 with st.sidebar:
+    if not is_ready():
+        st.caption("⏳ 초기화 중입니다. 첫 요청은 조금 느릴 수 있습니다.")
+    
     st.header("📊 저장된 데이터")
     
     if st.session_state.data_store.list_keys():
@@ -90,8 +126,9 @@ with st.sidebar:
         st.session_state.langchain_messages = [
             AIMessage(content="안녕하세요! DART 공시 정보에 대해 무엇이든 물어보세요.")
         ]
-        st.session_state.data_store = SessionDataStore()
-        st.session_state.graph_app = create_dart_workflow(verbose=st.session_state.verbose)
+        st.session_state.data_store.delete_session_files()
+        st.session_state.data_store = create_session_store()
+        st.session_state.graph_app = get_warm_workflow(st.session_state.verbose) or create_dart_workflow(verbose=st.session_state.verbose)
         st.rerun()
 
     # verbose 모드 토글
@@ -148,7 +185,7 @@ with messages_container:
 if prompt := st.chat_input("여기에 질문을 입력하세요..."):
     # graph_app이 None인 경우 재생성
     if st.session_state.graph_app is None:
-        st.session_state.graph_app = create_dart_workflow(verbose=st.session_state.verbose)
+        st.session_state.graph_app = get_warm_workflow(st.session_state.verbose) or create_dart_workflow(verbose=st.session_state.verbose)
     
     # 사용자 메시지 추가
     st.session_state.user_agent_messages.append({
@@ -0,0 +1,51 @@
+"""테스트 공용 픽스처"""
+
+from typing import Dict, Sequence
+
+import pandas as pd
+import pytest
+
+# 표준 지표 → (account_id, sj_div, account_nm)
+_STATEMENT_ACCOUNTS = {
+    "자산총계": ("ifrs-full_Assets", "BS", "자산총계"),
+    "유동자산": ("ifrs-full_CurrentAssets", "BS", "유동자산"),
+    "부채총계": ("ifrs-full_Liabilities", "BS", "부채총계"),
+    "유동부채": ("ifrs-full_CurrentLiabilities", "BS", "유동부채"),
+    "자본총계": ("ifrs-full_Equity", "BS", "자본총계"),
+    "매출액": ("ifrs-full_Revenue", "IS", "매출액"),
+    "매출총이익": ("ifrs-full_GrossProfit", "IS", "매출총이익"),
+    "영업이익": ("dart_OperatingIncomeLoss", "IS", "영업이익"),
+    "당기순이익": ("ifrs-full_ProfitLoss", "IS", "당기순이익"),
+}
+
+
+def make_statement(amounts: Dict[str, Sequence[int]]) -> pd.DataFrame:
+    """
+    fnlttSinglAcntAll 형식의 재무제표 DataFrame을 만듭니다.
+
+    Args:
+        amounts: 표준 지표 → (당기, 전기, 전전기) 금액
+    """
+    rows = []
+    for metric, values in amounts.items():
+        account_id, sj_div, account_nm = _STATEMENT_ACCOUNTS[metric]
+        values = list(values) + [None] * (3 - len(values))
+        rows.append({
+            "sj_div": sj_div,
+            "account_id": account_id,
+            "account_nm": account_nm,
+            "account_detail": "-",
+            "thstrm_amount": values[0],
+            "frmtrm_amount": values[1],
+            "bfefrmtrm_amount": values[2],
+        })
+    df = pd.DataFrame(rows)
+    for col in ("thstrm_amount", "frmtrm_amount", "bfefrmtrm_amount"):
+        df[col] = df[col].astype("Int64")
+    return df
+
+
+@pytest.fixture
+def statement():
+    """재무제표 DataFrame을 만드는 함수 (make_statement)"""
+    return make_statement
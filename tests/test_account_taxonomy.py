@@ -0,0 +1,73 @@
+"""표준 계정 분류(taxonomy) 지표 찾기 테스트"""
+
+import pandas as pd
+
+from utils.account_taxonomy import canonical_metric, resolve
+
+
+def test_canonical_metric():
+    assert canonical_metric("매출액") == "매출액"
+    assert canonical_metric("매출") == "매출액"
+    assert canonical_metric("EPS") == "기본주당이익"
+    assert canonical_metric("ifrs-full_Revenue") == "매출액"
+    # 분류표에 없는 표준 계정 ID는 그대로, 모르는 이름은 None
+    assert canonical_metric("ifrs-full_Goodwill") == "ifrs-full_Goodwill"
+    assert canonical_metric("없는지표") is None
+
+
+def test_resolve_prefers_account_id_over_similar_names():
+    """계정명 부분 일치("매출원가", "부채와자본총계")에 걸리지 않고 계정 ID로 찾아야 함"""
+    df = pd.DataFrame({
+        "sj_div": ["BS", "BS", "IS", "IS"],
+        "account_id": ["ifrs-full_EquityAndLiabilities", "ifrs-full_Liabilities",
+                       "ifrs-full_CostOfSales", "ifrs-full_Revenue"],
+        "account_nm": ["부채와자본총계", "부채총계", "매출원가", "매출액"],
+        "thstrm_amount": [300, 100, 70, 200],
+    })
+
+    resolved = resolve(df, ["매출", "부채총계"])
+
+    assert resolved.loc["매출", "thstrm_amount"] == 200
+    assert resolved.loc["부채총계", "thstrm_amount"] == 100
+    assert resolved["matched_by"].tolist() == ["account_id", "account_id"]
+
+
+def test_resolve_custom_account_by_exact_name():
+    """표준계정코드를 쓰지 않는 계정만 계정명(정확히 일치)으로 찾아야 함"""
+    df = pd.DataFrame({
+        "sj_div": ["IS", "IS", "IS"],
+        "account_id": ["-표준계정코드 미사용-", "-표준계정코드 미사용-", "dart_OtherGains"],
+        "account_nm": ["영업이익(손실)", "영업외수익", "영업이익"],
+        "thstrm_amount": [50, 10, 999],
+    })
+
+    resolved = resolve(df, ["영업이익"])
+
+    assert resolved.loc["영업이익", "thstrm_amount"] == 50
+    assert resolved.loc["영업이익", "matched_by"] == "name"
+
+
+def test_resolve_prefers_income_statement_over_comprehensive():
+    df = pd.DataFrame({
+        "sj_div": ["CIS", "IS"],
+        "account_id": ["ifrs-full_ProfitLoss", "ifrs-full_ProfitLoss"],
+        "account_nm": ["당기순이익", "당기순이익"],
+        "thstrm_amount": [1, 2],
+    })
+
+    assert resolve(df, ["순이익"]).loc["순이익", "sj_div"] == "IS"
+
+
+def test_resolve_missing_metric_is_na():
+    df = pd.DataFrame({
+        "sj_div": ["BS"],
+        "account_id": ["ifrs-full_Assets"],
+        "account_nm": ["자산총계"],
+        "thstrm_amount": pd.array([10], dtype="int64"),
+    })
+
+    resolved = resolve(df, ["자산총계", "매출액", "없는지표"])
+
+    assert resolved.loc["자산총계", "thstrm_amount"] == 10
+    assert resolved.loc[["매출액", "없는지표"], "thstrm_amount"].isna().all()
+    assert str(resolved["thstrm_amount"].dtype) == "Int64"
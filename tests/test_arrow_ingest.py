@@ -0,0 +1,81 @@
+"""Arrow 재무제표 응답 변환 테스트"""
+
+import json
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import pandas as pd
+
+from tools.opendart.arrow_ingest import read_statement_body
+from tools.opendart.statement_schema import apply_statement_schema
+
+
+def _statement_body(rows: int) -> bytes:
+    """rows개 계정 행을 가진 fnlttSinglAcntAll.json 형식의 응답 본문을 만듭니다."""
+    statement = [
+        {
+            "rcept_no": "20240312000736",
+            "reprt_code": "11011",
+            "bsns_year": "2023",
+            "corp_code": "00126380",
+            "sj_div": "BS" if i % 2 else "IS",
+            "sj_nm": "재무상태표" if i % 2 else "손익계산서",
+            "account_id": f"ifrs-full_Account{i}",
+            "account_nm": f"계정{i}",
+            "account_detail": "-",
+            "thstrm_nm": "제 55 기",
+            "thstrm_amount": f"{i * 1_000_000:,}",
+            "frmtrm_nm": "제 54 기",
+            "frmtrm_amount": str(i * 900_000),
+            "ord": str(i),
+            "currency": "KRW",
+        }
+        for i in range(rows)
+    ]
+    return json.dumps({"status": "000", "message": "정상", "list": statement},
+                      ensure_ascii=False).encode("utf-8")
+
+
+def test_read_statement_body():
+    df, envelope = read_statement_body(_statement_body(3))
+
+    assert envelope == {"status": "000", "message": "정상"}
+    assert len(df) == 3
+    assert df["thstrm_amount"].tolist() == [0, 1_000_000, 2_000_000]
+    assert str(df["sj_div"].dtype) == "category"
+
+
+def test_dtypes_match_json_path():
+    """Arrow 경로와 JSON 경로의 컬럼 타입이 같아야 함"""
+    body = _statement_body(5)
+
+    df, _ = read_statement_body(body)
+    expected = apply_statement_schema(pd.DataFrame(json.loads(body)["list"]))
+
+    assert df.dtypes.astype(str).to_dict() == expected.dtypes.astype(str).to_dict()
+    assert str(df["thstrm_amount"].dtype) == "Int64"
+    assert str(df["ord"].dtype) == "Int16"
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_read_large_statement_body():
+    """기본 블록 크기(1MB)보다 큰 응답도 Arrow로 읽어야 함"""
+    body = _statement_body(10_000)
+    assert len(body) > 1 << 20
+
+    df, envelope = read_statement_body(body)
+
+    assert envelope["status"] == "000"
+    assert len(df) == 10_000
+    assert df["frmtrm_amount"].iloc[-1] == 9_999 * 900_000
+
+
+def test_read_error_body():
+    body = json.dumps({"status": "013", "message": "조회된 데이타가 없습니다."}).encode("utf-8")
+
+    df, envelope = read_statement_body(body)
+
+    assert df is None
+    assert envelope["status"] == "013"
@@ -0,0 +1,171 @@
+"""SessionDataStore 메모리 예산(내려놓기/다시 불러오기)과 세션 영속화 테스트"""
+
+import gc
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from utils import data_store
+from utils.data_store import SessionDataStore, fork_session, frame_bytes, new_session_id, session_dir_for
+
+
+@pytest.fixture(autouse=True)
+def spill_dir(tmp_path, monkeypatch):
+    """내려놓기 디렉터리를 테스트마다 따로 사용"""
+    path = tmp_path / "spill"
+    monkeypatch.setattr(data_store, "SPILL_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def persist_dir(tmp_path, monkeypatch):
+    path = tmp_path / "sessions"
+    monkeypatch.setattr(data_store, "PERSIST_DIR", str(path))
+    return path
+
+
+def _frame(seed: int, rows: int = 10_000) -> pd.DataFrame:
+    return pd.DataFrame({"x": np.arange(rows) + seed, "y": np.full(rows, float(seed))})
+
+
+def test_spill_and_reload():
+    store = SessionDataStore()
+    store.memory_limit = int(frame_bytes(_frame(0)) * 1.5)
+
+    store.add("a", _frame(1))
+    store.add("b", _frame(2))
+
+    stats = store.stats()
+    assert stats["spills"] == 1 and stats["evictions"] == 1
+    assert stats["resident_keys"] == 1 and stats["spilled_keys"] == 1
+    assert store.stats()["resident_bytes"] <= store.memory_limit
+
+    pd.testing.assert_frame_equal(store.get("a"), _frame(1))
+    stats = store.stats()
+    assert stats["reloads"] == 1
+    # 다시 불러온 a 대신 오래 사용하지 않은 b를 내려놓음
+    assert stats["resident_keys"] == 1
+    assert store.list_keys() == ["a", "b"]
+
+
+def test_modified_frame_survives_eviction():
+    """get()으로 받은 DataFrame을 직접 수정하면 내려놓을 때 파일을 다시 써야 함"""
+    store = SessionDataStore()
+    store.memory_limit = int(frame_bytes(_frame(0)) * 1.5)
+    store.add("a", _frame(1))
+    store.add("b", _frame(2))
+
+    frame = store.get("a")
+    frame.loc[0, "x"] = -1
+    del frame
+    store.add("c", _frame(3))
+    store.get("b")
+
+    assert "a" not in store._data
+    assert store.get("a").loc[0, "x"] == -1
+
+
+def test_copied_frames_do_not_change_store():
+    store = SessionDataStore()
+    store.add("a", _frame(1))
+
+    frame = store.frames(copy=True)["a"]
+    frame.loc[0, "x"] = -1
+
+    assert store.get("a").loc[0, "x"] == 1
+
+
+def test_budget_includes_fact_table(statement):
+    """팩트 테이블도 예산에 포함되어 DataFrame과 함께 내려놓아야 하며, 조회 결과는 그대로여야 함"""
+    store = SessionDataStore()
+    for i in range(4):
+        store.add(f"corp{i}", statement({"매출액": (1000 + i, 900), "자산총계": (5000 + i, 4000)}), {
+            "corp_code": f"0000000{i}", "corp_name": f"회사{i}", "bsns_year": "2023", "fs_div": "CFS",
+        })
+    full = store.facts.frame.sort_index()
+
+    store.memory_limit = store._used_bytes() // 2
+    store._enforce_budget()
+
+    stats = store.stats()
+    assert stats["resident_bytes"] + stats["facts_bytes"] <= store.memory_limit
+    assert stats["evictions"] >= 1
+    pd.testing.assert_frame_equal(store.facts.frame.sort_index(), full, check_categorical=False)
+
+
+def test_stale_spill_dirs_are_swept(spill_dir, monkeypatch):
+    stale = spill_dir / "session_stale"
+    stale.mkdir(parents=True)
+    (stale / "old.parquet").write_bytes(b"x")
+    old = time.time() - 3600
+    os.utime(stale, (old, old))
+    monkeypatch.setattr(data_store, "_spill_dir_swept", False)
+
+    SessionDataStore()
+
+    assert not stale.exists()
+
+
+def test_resume_session(persist_dir):
+    session_dir = session_dir_for(new_session_id())
+    store = SessionDataStore(session_dir=session_dir)
+    store.add("a", _frame(1), {"corp_name": "A"})
+    store.add("b", _frame(2))
+    del store
+    gc.collect()  # 저장소가 사라지면 세션 디렉터리 잠금이 풀림
+
+    resumed = SessionDataStore(session_dir=session_dir)
+
+    assert resumed.session_dir == session_dir
+    assert resumed.stats()["restored"] == 2
+    # 파일은 처음 조회할 때 읽음
+    assert resumed.stats()["resident_keys"] == 0
+    assert resumed.list_keys() == ["a", "b"]
+    assert resumed.get_metadata("a") == {"corp_name": "A"}
+    pd.testing.assert_frame_equal(resumed.get("b"), _frame(2))
+
+
+def test_locked_session_is_forked(persist_dir):
+    """다른 저장소가 사용 중인 세션은 영속화하지 않고, fork_session으로 복사한 새 세션을 사용해야 함"""
+    session_dir = session_dir_for(new_session_id())
+    owner = SessionDataStore(session_dir=session_dir)
+    owner.add("a", _frame(1))
+
+    second = SessionDataStore(session_dir=session_dir)
+    assert second.session_dir is None
+
+    fork_dir = session_dir_for(new_session_id())
+    assert fork_session(session_dir, fork_dir) == 1
+    forked = SessionDataStore(session_dir=fork_dir)
+    forked.add("b", _frame(2))
+
+    pd.testing.assert_frame_equal(forked.get("a"), _frame(1))
+    assert owner.list_keys() == ["a"]
+
+
+def test_sweep_sessions(persist_dir):
+    """오래 사용하지 않은 세션은 삭제하고, 사용 중인 세션은 남겨야 함"""
+    expired_dir = session_dir_for(new_session_id())
+    expired = SessionDataStore(session_dir=expired_dir)
+    expired.add("a", _frame(1))
+    del expired
+    gc.collect()
+    old = time.time() - (data_store.PERSIST_TTL_HOURS + 1) * 3600
+    for root, _, names in os.walk(expired_dir):
+        for name in names:
+            os.utime(os.path.join(root, name), (old, old))
+    os.utime(expired_dir, (old, old))
+
+    live_dir = session_dir_for(new_session_id())
+    live = SessionDataStore(session_dir=live_dir)
+    live.add("b", _frame(2))
+    os.utime(live_dir, (old, old))
+
+    assert data_store.sweep_sessions(force=True) == 1
+    assert not os.path.exists(expired_dir)
+    assert live.get("b") is not None and os.path.exists(live_dir)
@@ -0,0 +1,77 @@
+"""다년도 재무 패널 테스트"""
+
+import math
+
+import pandas as pd
+
+from utils.fact_table import FactTable
+from utils.panel import build_panel, cagr, covering_years, yoy_growth
+
+
+def _facts(statement, reports):
+    """{사업연도: {지표: (당기, 전기, 전전기)}} 사업보고서들로 팩트 테이블을 만듭니다."""
+    facts = FactTable()
+    for year, amounts in reports.items():
+        facts.append(f"a_{year}", statement(amounts), {
+            "corp_code": "00000001", "corp_name": "A", "bsns_year": year,
+            "reprt_code": "11011", "fs_div": "CFS",
+        })
+    return facts
+
+
+def test_covering_years():
+    assert covering_years(["2019", "2020", "2021", "2022", "2023"]) == ["2023", "2020"]
+    assert covering_years([2023]) == ["2023"]
+    assert covering_years(["2021", "2023"]) == ["2023"]
+
+
+def test_build_panel_uses_latest_report(statement):
+    """여러 보고서에 같은 회계연도가 있으면 가장 최근 보고서(재작성된 값)를 사용해야 함"""
+    facts = _facts(statement, {
+        "2020": {"매출액": (100, 90, 80)},
+        "2023": {"매출액": (160, 130, 111)},
+    })
+
+    panel = build_panel(facts, ["매출"])
+
+    assert list(panel.columns) == [2018, 2019, 2020, 2021, 2022, 2023]
+    row = panel.loc[("A", "매출")]
+    assert row.tolist() == [80.0, 90.0, 100.0, 111.0, 130.0, 160.0]
+
+
+def test_build_panel_keeps_missing_years_as_nan(statement):
+    facts = _facts(statement, {"2023": {"매출액": (120, None, 100)}})
+
+    panel = build_panel(facts, ["매출액"])
+
+    assert list(panel.columns) == [2021, 2022, 2023]
+    assert math.isnan(panel.loc[("A", "매출액"), 2022])
+
+
+def test_yoy_growth():
+    panel = pd.DataFrame([[100.0, 120.0, 0.0, 50.0]], columns=[2020, 2021, 2022, 2023])
+
+    growth = yoy_growth(panel)
+
+    assert math.isnan(growth.iloc[0, 0])
+    assert growth.iloc[0, 1] == 20.0
+    assert growth.iloc[0, 2] == -100.0
+    # 전년 값이 0이면 NaN
+    assert math.isnan(growth.iloc[0, 3])
+
+
+def test_cagr():
+    panel = pd.DataFrame(
+        [[100.0, None, 121.0], [None, 50.0, 60.0], [-10.0, 5.0, 20.0], [None, None, 7.0]],
+        columns=[2021, 2022, 2023],
+    )
+
+    result = cagr(panel)
+
+    assert round(result.loc[0, "cagr"], 6) == 10.0
+    assert result.loc[1, "start_year"] == 2022
+    assert round(result.loc[1, "cagr"], 6) == 20.0
+    # 시작 값이 양수가 아니거나 기간이 0년이면 계산하지 않음
+    assert math.isnan(result.loc[2, "cagr"])
+    assert math.isnan(result.loc[3, "cagr"])
+    assert result.loc[3, "start_year"] == result.loc[3, "end_year"] == 2023
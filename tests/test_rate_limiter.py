@@ -0,0 +1,109 @@
+"""OpenDart 호출 속도 제한 테스트"""
+
+import time
+
+import pytest
+
+from tools.opendart import rate_limiter
+from tools.opendart.rate_limiter import (
+    RECOVERY_AFTER,
+    DailyQuota,
+    QuotaExceededError,
+    RateLimiter,
+    TokenBucket,
+)
+
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate=20, burst=2)
+
+    start = time.monotonic()
+    bucket.acquire()
+    bucket.acquire()
+    assert time.monotonic() - start < 0.04
+
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.04
+
+
+def test_token_bucket_drain():
+    bucket = TokenBucket(rate=20, burst=5)
+    bucket.drain()
+
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.04
+
+
+def test_quota_merges_processes(tmp_path, monkeypatch):
+    """같은 API 키를 쓰는 여러 카운터(프로세스)의 호출 횟수가 파일에서 합쳐져야 함"""
+    monkeypatch.setattr(rate_limiter, "QUOTA_SYNC_MARGIN", 0)
+    path = str(tmp_path / "quota.json")
+    first = DailyQuota("key", limit=100, path=path)
+    second = DailyQuota("key", limit=100, path=path)
+    other_key = DailyQuota("other", limit=100, path=path)
+
+    for _ in range(3):
+        first.consume()
+    for _ in range(2):
+        second.consume()
+    other_key.consume()
+    first.flush()
+    second.flush()
+    other_key.flush()
+
+    assert DailyQuota("key", limit=100, path=path).used == 5
+    assert DailyQuota("other", limit=100, path=path).used == 1
+
+
+def test_quota_limit(tmp_path):
+    quota = DailyQuota("key", limit=2, path=str(tmp_path / "quota.json"))
+    quota.consume()
+    quota.consume()
+
+    with pytest.raises(QuotaExceededError):
+        quota.consume()
+    assert quota.remaining == 0
+
+
+def test_quota_syncs_every_call_near_limit(tmp_path, monkeypatch):
+    """남은 호출이 QUOTA_SYNC_MARGIN보다 적으면 다른 프로세스의 사용량을 매 호출마다 반영해야 함"""
+    monkeypatch.setattr(rate_limiter, "QUOTA_SYNC_MARGIN", 10)
+    path = str(tmp_path / "quota.json")
+    first = DailyQuota("key", limit=5, path=path)
+    second = DailyQuota("key", limit=5, path=path)
+
+    for _ in range(3):
+        first.consume()
+    second.consume()
+    second.consume()
+
+    with pytest.raises(QuotaExceededError):
+        second.consume()
+
+
+def test_rate_limiter_backoff_and_recovery():
+    limiter = RateLimiter("key", rate=10, burst=1, min_rate=1)
+
+    limiter.report("020")
+    assert limiter.rate == 5
+
+    # 정상 응답(000, 013)만 회복 횟수에 포함하고, 그 밖의 오류 응답은 연속 횟수를 끊음
+    for _ in range(RECOVERY_AFTER - 1):
+        limiter.report("013")
+    limiter.report("100")
+    limiter.report(None)
+    assert limiter.rate == 5
+
+    for _ in range(RECOVERY_AFTER):
+        limiter.report("000")
+    assert limiter.rate == 6
+
+
+def test_rate_limiter_min_rate():
+    limiter = RateLimiter("key", rate=10, burst=1, min_rate=2)
+
+    for _ in range(5):
+        limiter.report("020")
+
+    assert limiter.rate == 2
@@ -0,0 +1,62 @@
+"""재무비율 엔진 테스트"""
+
+import math
+
+import pandas as pd
+
+from utils.ratio_engine import RatioEngine, canonical_ratio, compute_ratios
+
+
+def test_canonical_ratio():
+    assert canonical_ratio("부채비율") == "부채비율"
+    assert canonical_ratio("자기자본이익률") == "ROE"
+    assert canonical_ratio("roe") == "ROE"
+    assert canonical_ratio("매출 YoY") == "매출액증가율"
+    assert canonical_ratio("없는비율") is None
+
+
+def test_compute_ratios():
+    current = pd.DataFrame({"부채총계": [100.0, 50.0], "자본총계": [200.0, 0.0],
+                            "매출액": [1000.0, 500.0], "영업이익": [150.0, -20.0]})
+    previous = pd.DataFrame({"매출액": [800.0, 0.0]})
+
+    ratios = compute_ratios(current, previous)
+
+    assert ratios.loc[0, "부채비율"] == 50.0
+    assert ratios.loc[0, "영업이익률"] == 15.0
+    assert ratios.loc[0, "매출액증가율"] == 25.0
+    # 분모가 0이거나 없으면 NaN (inf가 아님)
+    assert math.isnan(ratios.loc[1, "부채비율"])
+    assert math.isnan(ratios.loc[1, "매출액증가율"])
+    assert math.isnan(ratios.loc[0, "유동비율"])
+
+
+def test_ratio_engine_update_and_replace(statement):
+    engine = RatioEngine()
+    df = statement({
+        "자산총계": (1000, 900),
+        "부채총계": (400, 300),
+        "자본총계": (600, 600),
+        "매출액": (2000, 1600),
+        "영업이익": (300, 200),
+        "당기순이익": (120, 100),
+    })
+
+    assert engine.update("a_2023", df, ("A", "2023", "CFS"))
+    frame = engine.frame
+    assert frame.loc["a_2023", "corp_name"] == "A"
+    assert round(frame.loc["a_2023", "부채비율"], 2) == 66.67
+    assert frame.loc["a_2023", "ROE"] == 20.0
+    assert frame.loc["a_2023", "매출액증가율"] == 25.0
+
+    # 같은 키는 교체하고 다시 계산
+    engine.update("a_2023", statement({"부채총계": (600,), "자본총계": (600,)}), ("A", "2023", "CFS"))
+    assert engine.frame.loc["a_2023", "부채비율"] == 100.0
+    assert len(engine) == 1
+
+
+def test_ratio_engine_ignores_non_statement():
+    engine = RatioEngine()
+
+    assert not engine.update("other", pd.DataFrame({"x": [1]}))
+    assert len(engine) == 0
@@ -0,0 +1,74 @@
+"""OpenDart 응답 캐시 테스트"""
+
+import os
+from datetime import date
+
+import pytest
+
+from tools.opendart import response_cache
+from tools.opendart.response_cache import (
+    CLOSED_YEAR_TTL,
+    CURRENT_YEAR_TTL,
+    NO_DATA_TTL,
+    ResponseCache,
+    ttl_for,
+)
+
+
+class _Clock:
+    """time.time()을 대신하는 수동 시계"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(response_cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "responses.sqlite"), max_bytes=10_000)
+    yield cache
+    cache._conn.close()
+
+
+def test_ttl_for():
+    this_year = date.today().year
+    assert ttl_for(str(this_year - 1), "11011", "000") == CLOSED_YEAR_TTL["11011"]
+    assert ttl_for(str(this_year), "11011", "000") == CURRENT_YEAR_TTL
+    assert ttl_for(str(this_year - 1), "11011", "013") == NO_DATA_TTL
+    # 오류 응답은 캐시하지 않음
+    assert ttl_for(str(this_year - 1), "11011", "020") is None
+    assert ttl_for(str(this_year - 1), "11011", None) is None
+
+
+def test_round_trip_and_expiry(cache, clock):
+    cache.put("k", {"status": "000", "list": [{"account_nm": "매출액"}]}, ttl=60)
+
+    assert cache.get("k")["list"][0]["account_nm"] == "매출액"
+
+    clock.now += 61
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_evicts_least_recently_used(cache, clock):
+    # 압축되지 않는 4KB 응답 세 개는 한도(10KB)를 넘음
+    for key in ("a", "b"):
+        cache.put_payload(key, os.urandom(4000), "000", ttl=3600)
+        clock.now += 1
+    cache.get_payload("a")
+    clock.now += 1
+    cache.put_payload("c", os.urandom(4000), "000", ttl=3600)
+
+    assert cache.get_payload("b") is None
+    assert cache.get_payload("a") is not None
+    assert cache.get_payload("c") is not None
+    assert cache.stats()["bytes"] <= cache.max_bytes
@@ -0,0 +1,76 @@
+"""코드 실행 샌드박스 풀 테스트 (실행 시간/CPU/메모리 한도)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import data_store
+from utils.data_store import SessionDataStore
+from utils.sandbox import SandboxPool, _rss_mb
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_store, "SPILL_DIR", str(tmp_path / "spill"))
+    store = SessionDataStore()
+    store.add("prices", pd.DataFrame({"x": np.arange(100)}))
+    return store
+
+
+@pytest.fixture
+def pool():
+    pool = SandboxPool(size=1, cpu_seconds=1, wall_seconds=3, max_rss_mb=512)
+    yield pool
+    pool.close()
+
+
+def test_run_reads_store_frames(pool, store):
+    reply = pool.run("result = data['prices']['x'].sum()", store)
+
+    assert reply == {"value": "4950"}
+
+
+def test_run_returns_frames_and_errors(pool, store):
+    reply = pool.run("result = data['prices'].head(3)", store)
+    pd.testing.assert_frame_equal(reply["value"], pd.DataFrame({"x": np.arange(3)}))
+
+    assert "ZeroDivisionError" in pool.run("result = 1 / 0", store)["error"]
+    assert "'result'" in pool.run("x = 1", store)["error"]
+
+
+def test_worker_changes_do_not_reach_store(pool, store):
+    pool.run("data['prices'].loc[0, 'x'] = -1\nresult = 1", store)
+
+    assert store.get("prices").loc[0, "x"] == 0
+    assert pool.run("result = int(data['prices'].loc[0, 'x'])", store) == {"value": "0"}
+
+
+def test_cpu_limit_replaces_worker(pool, store):
+    reply = pool.run("while True:\n    pass", store)
+
+    assert "CPU 시간 제한(1초)" in reply["error"]
+    # 한도를 넘은 뒤에도 다음 호출은 정상 실행
+    assert pool.run("result = 1", store) == {"value": "1"}
+
+
+def test_wall_time_limit(store):
+    pool = SandboxPool(size=1, cpu_seconds=30, wall_seconds=1)
+    try:
+        reply = pool.run("import time\ntime.sleep(10)\nresult = 1", store)
+
+        assert "시간 제한(1초)" in reply["error"]
+        assert pool.run("result = 2", store) == {"value": "2"}
+    finally:
+        pool.close()
+
+
+@pytest.mark.skipif(_rss_mb(1) is None, reason="/proc에서 RSS를 확인할 수 없는 환경")
+def test_memory_limit(store):
+    pool = SandboxPool(size=1, cpu_seconds=30, wall_seconds=30, max_rss_mb=300)
+    try:
+        reply = pool.run("import time\nblock = b'x' * (600 * 1024 * 1024)\ntime.sleep(10)\nresult = 1", store)
+
+        assert "메모리 한도(300MB)" in reply["error"]
+        assert pool.run("result = 3", store) == {"value": "3"}
+    finally:
+        pool.close()
@@ -0,0 +1,81 @@
+"""재무 스크리닝 테스트"""
+
+import pandas as pd
+import pytest
+
+from utils.screener import Condition, ScreeningTable, parse_condition
+
+
+def test_parse_condition():
+    assert parse_condition("영업이익률 > 15") == Condition("영업이익률", ">", 15.0)
+    assert parse_condition("부채비율<=100%") == Condition("부채비율", "<=", 100.0)
+    assert parse_condition("매출 >= 1조") == Condition("매출액", ">=", 1e12)
+    assert parse_condition("자산총계 < 5,000억원") == Condition("자산총계", "<", 5e11)
+    assert parse_condition("roe != -3.5") == Condition("ROE", "!=", -3.5)
+
+
+@pytest.mark.parametrize("text", ["영업이익률 15", "영업이익률 > 높음", "> 15"])
+def test_parse_condition_rejects_bad_format(text):
+    with pytest.raises(ValueError, match="형식"):
+        parse_condition(text)
+
+
+def test_parse_condition_rejects_unknown_field():
+    with pytest.raises(ValueError, match="지원하지 않는"):
+        parse_condition("없는지표 > 1")
+
+
+def _key_accounts(rows):
+    """(corp_code, fs_div, 매출액, 영업이익, 부채총계, 자본총계) 목록으로 주요계정 응답 DataFrame을 만듭니다."""
+    records = []
+    for corp_code, fs_div, revenue, operating_income, liabilities, equity in rows:
+        for account_nm, amount in (("매출액", revenue), ("영업이익", operating_income),
+                                   ("부채총계", liabilities), ("자본총계", equity)):
+            records.append({
+                "corp_code": corp_code, "bsns_year": "2023", "reprt_code": "11011", "fs_div": fs_div,
+                "account_nm": account_nm, "thstrm_amount": amount, "frmtrm_amount": None,
+            })
+    return pd.DataFrame(records)
+
+
+@pytest.fixture
+def table():
+    table = ScreeningTable()
+    table.load_key_accounts(_key_accounts([
+        ("A", "CFS", 1000, 200, 50, 100),   # 영업이익률 20%, 부채비율 50%
+        ("B", "CFS", 1000, 300, 300, 100),  # 영업이익률 30%, 부채비율 300%
+        ("C", "CFS", 1000, 160, 80, 100),   # 영업이익률 16%, 부채비율 80%
+        ("C", "OFS", 1000, 900, 10, 100),   # 연결 값이 있으므로 사용하지 않음
+        ("D", "OFS", 1000, 500, 10, 100),   # 연결 값이 없으므로 개별 값 사용
+    ]), corp_names={"A": "에이", "B": "비", "C": "씨", "D": "디"})
+    return table
+
+
+def test_screen_filters_and_sorts(table):
+    result, matched = table.screen(["영업이익률 > 15", "부채비율 < 100"])
+
+    assert matched == 3
+    assert result["corp_name"].tolist() == ["디", "에이", "씨"]
+    assert result["fs_div"].tolist() == ["OFS", "CFS", "CFS"]
+    assert result.columns.tolist() == ["corp_name", "stock_code", "fs_div", "영업이익률", "부채비율"]
+
+
+def test_screen_sort_and_top_k(table):
+    result, matched = table.screen(["영업이익률 > 0"], sort_by="부채비율", ascending=True, top_k=2)
+
+    assert matched == 4
+    assert result["corp_name"].tolist() == ["디", "에이"]
+
+
+def test_screen_replaces_rows_with_same_key(table):
+    table.load_key_accounts(_key_accounts([("B", "CFS", 1000, 100, 50, 100)]), corp_names={"B": "비"})
+
+    result, matched = table.screen(["영업이익률 >= 20"])
+
+    assert matched == 2
+    assert "비" not in result["corp_name"].tolist()
+
+
+def test_screen_rejects_unknown_sort_field(table):
+    with pytest.raises(ValueError, match="정렬 기준"):
+        table.screen(["영업이익률 > 0"], sort_by="없는지표")
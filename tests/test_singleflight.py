@@ -0,0 +1,89 @@
+"""singleflight 호출 병합 테스트"""
+
+import threading
+import time
+
+import pytest
+
+from utils.singleflight import SingleFlight
+
+
+def _run_concurrently(flight, key, fn, callers):
+    """같은 key로 callers개 스레드가 동시에 flight.do를 호출하고 (결과, 예외) 목록을 반환합니다."""
+    outcomes = []
+    lock = threading.Lock()
+
+    def call():
+        try:
+            value = (flight.do(key, fn), None)
+        except Exception as e:
+            value = (None, e)
+        with lock:
+            outcomes.append(value)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    leader, _ = _run_concurrently(flight, "key", fetch, 1)
+    assert started.wait(5)
+    followers, outcomes = _run_concurrently(flight, "key", fetch, 4)
+    # 나중에 들어온 호출들이 진행 중인 실행에 합류할 시간을 둔 뒤 실행을 끝냄
+    time.sleep(0.2)
+    release.set()
+    for thread in leader + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert outcomes == [("result", None)] * 4
+    assert flight.in_flight() == 0
+
+
+def test_followers_receive_result_and_errors():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("boom")
+
+    threads, outcomes = _run_concurrently(flight, "key", fail, 3)
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(outcomes) == 3
+    assert all(isinstance(error, ValueError) for _, error in outcomes)
+    assert flight.in_flight() == 0
+
+
+def test_results_are_not_cached():
+    flight = SingleFlight()
+    counter = iter(range(10))
+
+    assert flight.do("key", lambda: next(counter)) == 0
+    assert flight.do("key", lambda: next(counter)) == 1
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    assert flight.do("a", lambda: "a") == "a"
+    assert flight.do("b", lambda: "b") == "b"
+    with pytest.raises(KeyError):
+        flight.do("c", lambda: {}["missing"])
+    assert flight.in_flight() == 0
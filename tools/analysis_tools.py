@@ -3,22 +3,39 @@ Multi-DataFrame 분석을 위한 LangChain 도구들
 """
 
 from langchain.tools import tool
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 import numpy as np
 import json
+import re
+from fnmatch import fnmatchcase
 
+from utils.account_index import ACCOUNT_NAME_MAPPINGS, AccountIndex, normalize_account_name
+from utils.account_taxonomy import PER_SHARE_METRICS, canonical_metric, resolve
 from utils.data_store import SessionDataStore
+from utils.fact_table import FactTable
+from utils.panel import build_panel, cagr, yoy_growth
+from utils.ratio_engine import RATIO_NAMES, canonical_ratio, describe_ratio
+from utils.result_renderer import render_frame, render_value
+from utils.sandbox import SANDBOX_ENABLED, get_sandbox_pool, run_code
+from utils.sql_engine import HAS_DUCKDB, SQL_MAX_ROWS, SqlEngine
+from utils.screener import is_ratio
 
 
 # 전역 데이터 저장소 (에이전트 생성 시 설정됨)
 _global_data_store: Optional[SessionDataStore] = None
 
+# 전역 데이터 저장소에 연결된 SQL 엔진 (최초 SQL 실행 시 생성)
+_sql_engine: Optional[SqlEngine] = None
+
 
 def set_data_store(data_store: SessionDataStore):
     """분석 도구들이 사용할 데이터 저장소를 설정합니다."""
-    global _global_data_store
+    global _global_data_store, _sql_engine
     _global_data_store = data_store
+    if _sql_engine is not None:
+        _sql_engine.close()
+        _sql_engine = None
 
 
 @tool
@@ -45,8 +62,9 @@ def get_dataframe_info(df_key: str) -> str:
     """
     지정한 키(df_key)에 해당하는 데이터프레임의 기본 정보를 반환합니다.
     
-    데이터의 구조를 파악할 때 사용합니다. Shape, 컬럼 목록, 데이터 타입, 
+    데이터의 구조를 파악할 때 사용합니다. Shape, 컬럼 목록과 데이터 타입, 
     그리고 상위 5개 행을 포함한 상세 정보를 제공합니다.
+    더 많은 행이 필요하면 get_result_page(handle=df_key)로 나누어 조회하세요.
     
     Args:
         df_key (str): 조회할 DataFrame의 키
@@ -61,37 +79,31 @@ def get_dataframe_info(df_key: str) -> str:
         return "데이터 저장소가 초기화되지 않았습니다."
         
     try:
-        df = _global_data_store.get(df_key)
+        # 저장 시점에 계산된 요약 사용
+        profile = _global_data_store.profile(df_key)
+        rows, columns = profile.shape
         
         info_parts = [
             f"=== DataFrame: {df_key} ===",
-            f"Shape: {df.shape} (행: {df.shape[0]}, 열: {df.shape[1]})",
-            f"\nColumns ({len(df.columns)}개):",
-            ", ".join(df.columns.tolist()),
-            f"\nData Types:",
+            f"Shape: {profile.shape} (행: {rows}, 열: {columns})",
+            f"\nColumns ({columns}개, 이름(타입)):",
+            ", ".join(f"{col}({dtype})" for col, dtype in profile.dtypes.items()),
         ]
         
-        # 데이터 타입 정보
-        for col, dtype in df.dtypes.items():
-            info_parts.append(f"  - {col}: {dtype}")
-        
-        # 주요 컬럼 확인
-        if 'account_nm' in df.columns and 'thstrm_amount' in df.columns:
-            info_parts.append("\n주요 계정 항목 (상위 10개):")
-            # thstrm_amount가 null이 아닌 행만 필터링하고 상위 10개 선택
-            filtered_df = df[df['thstrm_amount'].notna()]
-            if not filtered_df.empty:
-                # nlargest를 사용하여 상위 10개 항목 선택
-                sorted_df = filtered_df.sort_values('thstrm_amount', ascending=False).head(10)
-                for idx in sorted_df.index:
-                    account_nm = sorted_df.loc[idx, 'account_nm']
-                    thstrm_amount = sorted_df.loc[idx, 'thstrm_amount']
-                    amount_in_100m = thstrm_amount / 100_000_000
-                    info_parts.append(f"  - {account_nm}: {amount_in_100m:,.0f}억원")
+        # 재무제표 구분별 행 수
+        if profile.statements:
+            info_parts.append("\n재무제표 구분별 행 수: " + ", ".join(
+                f"{sj_div} {count}개" for sj_div, count in profile.statements.items()))
+        
+        # 주요 계정 항목
+        if profile.top_accounts:
+            info_parts.append(f"\n주요 계정 항목 (상위 {len(profile.top_accounts)}개):")
+            for account_nm, amount in profile.top_accounts:
+                info_parts.append(f"  - {account_nm}: {amount / 100_000_000:,.0f}억원")
         
         # 상위 5개 행
-        info_parts.append(f"\n상위 5개 행:")
-        info_parts.append(df.head().to_string())
+        info_parts.append("")
+        info_parts.append(profile.head)
         
         return "\n".join(info_parts)
         
@@ -109,8 +121,21 @@ def execute_python_on_dataframes(code: str) -> Dict[str, Any]:
     코드 내에서 'data' 딕셔너리를 통해 모든 DataFrame에 접근할 수 있습니다.
     예: data['samsung_fs_2023_consolidated']
     
+    여러 회사/연도 비교는 'facts'(재무 팩트 테이블)를 사용하면 DataFrame을 합치지 않고 바로 조회할 수 있습니다.
+    - facts.select(corp_names=[...], years=[...], accounts=[...]): 조건에 맞는 팩트 행
+      (컬럼: corp_code, corp_name, fiscal_year, sj_div, account_id, account_nm, period, amount 등)
+    - facts.company_year('매출액'): 회사 × 회계연도 표
+    - facts.company_account(['매출액', '영업이익'], year=2023): 회사 × 계정 표
+    
     추가로 pandas(pd)와 numpy(np)가 미리 import되어 있습니다.
     
+    코드는 서버와 분리된 작업 프로세스에서 실행되며 CPU 시간, 실행 시간, 메모리 사용량 제한이 있습니다.
+    제한을 넘으면 실행이 중단되고 에러가 반환되므로, 전체 데이터를 반복하는 무거운 루프 대신
+    벡터 연산이나 facts 조회를 사용하세요. 'data'의 DataFrame은 읽기용 사본이므로 수정해도 저장소에 반영되지 않습니다.
+    
+    DataFrame 결과는 CSV 형식으로 최대 30행까지 표시되며(금액은 억원/조원 단위), 나머지 행은
+    결과에 안내된 핸들로 get_result_page를 호출하여 나누어 조회할 수 있습니다.
+    
     Args:
         code (str): 실행할 파이썬 코드. 반드시 'result' 변수에 최종 결과를 할당해야 합니다.
         
@@ -130,55 +155,139 @@ def execute_python_on_dataframes(code: str) -> Dict[str, Any]:
         growth_rate = (revenue_2024 - revenue_2023) / revenue_2023 * 100
         result = f"매출액 성장률: {growth_rate:.1f}%"
         ```
+        
+        ```python
+        # 여러 회사의 연도별 매출액 비교
+        result = facts.company_year('매출액', fs_div='CFS')
+        ```
     """
     if _global_data_store is None:
         return {"error": "데이터 저장소가 초기화되지 않았습니다."}
     
-    try:
-        # 실행 환경 준비
+    if not SANDBOX_ENABLED:
+        # 샌드박스를 끈 경우 (DART_SANDBOX=0) 서버 프로세스에서 직접 실행.
+        # 코드가 저장소의 DataFrame/팩트를 직접 수정하지 않도록 사용하는 것만 사본으로 전달
+        uses_facts = re.search(r"\bfacts\b", code) is not None
         namespace = {
-            'data': _global_data_store._data,
+            'data': _global_data_store.frames(copy=True),
+            'facts': FactTable.from_frame(_global_data_store.facts.frame.copy()) if uses_facts else FactTable(),
             'pd': pd,
             'np': np,
-            'result': None
         }
+        outcome = run_code(code, namespace)
+    else:
+        try:
+            outcome = get_sandbox_pool().run(code, _global_data_store)
+        except Exception as e:
+            return {"error": f"샌드박스 실행 중 오류 발생: {str(e)}"}
+    
+    if "error" in outcome:
+        return outcome
+    try:
+        return {"result": render_value(outcome["value"], _global_data_store.results)}
+    except Exception as e:
+        return {"error": f"결과 변환 중 오류 발생: {str(e)}"}
+
+
+
+@tool
+def get_result_page(handle: str, offset: int = 0, limit: int = 30,
+                    columns: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    결과가 길어 일부만 표시된 표의 나머지 행을 나누어 조회합니다.
+    
+    execute_python_on_dataframes 등의 결과에 "get_result_page(handle=..., offset=...)" 안내가 있을 때
+    그 인자를 그대로 사용하세요. handle에 저장된 DataFrame의 키를 넣으면 원본 데이터를 조회합니다.
+    
+    Args:
+        handle (str): 결과 핸들 (예: 'result_3') 또는 DataFrame 키
+        offset (int): 시작 행 위치 (0부터)
+        limit (int): 조회할 최대 행 수 (최대 100)
+        columns (List[str], optional): 표시할 컬럼 목록 (기본값: 앞쪽 컬럼)
         
-        # 코드 실행
-        exec(code, namespace)
-        
-        # 결과 확인
-        result = namespace.get('result')
-        if result is None:
-            return {"error": "코드 실행은 성공했지만 'result' 변수가 설정되지 않았습니다."}
+    Returns:
+        Dict[str, Any]: 해당 범위의 CSV 형식 표 또는 에러 메시지
         
-        # 결과를 문자열로 변환
-        if isinstance(result, pd.DataFrame):
-            result_str = f"DataFrame 결과 (shape: {result.shape}):\n{result.to_string()}"
-        elif isinstance(result, pd.Series):
-            result_str = f"Series 결과:\n{result.to_string()}"
+    Examples:
+        - get_result_page("result_3", offset=30)
+        - get_result_page("삼성전자_fs_2023_consolidated", offset=0, columns=["account_nm", "thstrm_amount"])
+    """
+    if _global_data_store is None:
+        return {"error": "데이터 저장소가 초기화되지 않았습니다."}
+    
+    try:
+        if handle in _global_data_store.list_keys():
+            df, amount_columns = _global_data_store.get(handle), None
         else:
-            result_str = str(result)
-            
-        return {"result": result_str}
+            df, amount_columns = _global_data_store.results.get(handle)
         
+        page = render_frame(df, title=handle, offset=offset, handle=handle, columns=columns,
+                            amount_columns=amount_columns, max_rows=max(1, min(int(limit), 100)))
+        return {"result": page}
+        
+    except KeyError as e:
+        return {"error": e.args[0] if e.args else str(e)}
     except Exception as e:
-        import traceback
-        error_detail = traceback.format_exc()
-        return {"error": f"코드 실행 중 오류 발생:\n{str(e)}\n\n상세 정보:\n{error_detail}"}
-
+        return {"error": f"조회 중 오류 발생: {str(e)}"}
 
-# 계정명 매핑 테이블 (유사한 의미의 계정명들)
-ACCOUNT_NAME_MAPPINGS = {
-    '매출액': ['매출액', '영업수익', '순매출액', '총매출액', '매출'],
-    '매출원가': ['매출원가', '영업비용', '판매원가'],
-    '매출총이익': ['매출총이익', '매출총손익', '영업총이익'],
-    '영업이익': ['영업이익', '영업손익', '영업이익(손실)'],
-    '당기순이익': ['당기순이익', '당기순손익', '순이익', '당기순이익(손실)'],
-    '자산총계': ['자산총계', '총자산', '자산합계'],
-    '부채총계': ['부채총계', '총부채', '부채합계', '부채와자본총계'],
-    '자본총계': ['자본총계', '총자본', '자본합계', '순자산'],
-}
 
+@tool
+def execute_sql_on_dataframes(query: str) -> Dict[str, Any]:
+    """
+    SessionDataStore의 모든 데이터를 테이블로 사용하여 SQL(DuckDB 문법) 조회를 실행합니다.
+    
+    여러 재무제표에 걸친 조인, 필터, 그룹별 집계는 파이썬 코드 대신 이 도구를 우선 사용하세요.
+    SELECT(WITH ... SELECT 포함) 문 하나만 실행할 수 있습니다.
+    
+    사용할 수 있는 테이블:
+    - 저장된 DataFrame: list_available_dataframes의 키를 큰따옴표로 감싸 사용 (예: "삼성전자_fs_2023_consolidated")
+      컬럼은 get_dataframe_info로 확인 (account_nm, sj_div, thstrm_amount, frmtrm_amount 등)
+    - facts: 재무 팩트 테이블 (corp_code, corp_name, bsns_year, reprt_code, fs_div, sj_div,
+      account_id, account_nm, period, fiscal_year, amount). period='thstrm'이 당기 금액
+    - ratios: 저장소 키(key)별 표준 재무비율 (corp_name, bsns_year, fs_div, 부채비율, ROE, 영업이익률 등, 단위 %)
+    - screening: 스크리닝 테이블 (corp_code, corp_name, bsns_year, fs_div, 매출액, 영업이익 등 지표와 비율)
+    
+    Args:
+        query (str): 실행할 SQL 문 (한글 컬럼명은 큰따옴표로 감쌈)
+        
+    Returns:
+        Dict[str, Any]: CSV 형식의 결과 표(금액은 억원/조원) 또는 에러 메시지와 사용 가능한 테이블 목록
+        
+    Examples:
+        ```sql
+        -- 회사별 연도별 매출액
+        SELECT corp_name, fiscal_year, amount FROM facts
+        WHERE account_nm = '매출액' AND period = 'thstrm' AND fs_div = 'CFS'
+        ORDER BY corp_name, fiscal_year
+        ```
+        
+        ```sql
+        -- 영업이익률 상위 회사
+        SELECT corp_name, bsns_year, "영업이익률" FROM ratios ORDER BY "영업이익률" DESC LIMIT 10
+        ```
+    """
+    global _sql_engine
+    
+    if _global_data_store is None:
+        return {"error": "데이터 저장소가 초기화되지 않았습니다."}
+    if not HAS_DUCKDB:
+        return {"error": "duckdb가 설치되어 있지 않아 SQL을 실행할 수 없습니다. execute_python_on_dataframes를 사용하세요."}
+    
+    try:
+        if _sql_engine is None:
+            _sql_engine = SqlEngine(_global_data_store)
+        df, truncated = _sql_engine.query(query)
+        
+        result = {"result": render_frame(df, _global_data_store.results, title="SQL 결과")}
+        if truncated:
+            result["truncated"] = f"결과가 {SQL_MAX_ROWS:,}행을 넘어 앞의 {SQL_MAX_ROWS:,}행만 보관했습니다. 조건이나 집계를 추가하세요."
+        return result
+        
+    except (ValueError, TimeoutError) as e:
+        return {"error": str(e)}
+    except Exception as e:
+        tables = _sql_engine.table_names() if _sql_engine is not None else []
+        return {"error": f"SQL 실행 중 오류 발생: {str(e)}", "tables": tables}
 
 def find_similar_account_name(df: pd.DataFrame, target_metric: str) -> Optional[tuple]:
     """
@@ -191,33 +300,61 @@ def find_similar_account_name(df: pd.DataFrame, target_metric: str) -> Optional[
     Returns:
         Optional[tuple]: (찾은 계정명, 원래 요청한 계정명) 또는 None
     """
-    # 먼저 정확히 일치하는 것을 찾기
-    if not df[df['account_nm'].str.contains(target_metric, na=False)].empty:
-        return (target_metric, target_metric)
+    match = AccountIndex(df).lookup(target_metric)
+    if match is None:
+        return None
+    return (match.actual_name, match.requested_name)
+
+
+def _locate_metrics(data_store: SessionDataStore, df_key: str,
+                    metrics: List[str]) -> Dict[str, Optional[Tuple[int, str, bool, Optional[str]]]]:
+    """
+    저장된 DataFrame 하나에서 지표별 행 위치를 찾습니다.
+    표준 지표는 account_id 기반 분류표로, 그 밖의 계정명은 계정 인덱스의 유사 계정명 검색으로 찾습니다.
+    
+    Returns:
+        Dict: 지표 → (행 위치, 실제 계정명, 대체 여부, account_id) 또는 None (찾지 못한 경우)
+    """
+    df = data_store.get(df_key)
+    account_index = data_store.account_index(df_key)
     
-    # 매핑 테이블에서 유사 계정명 찾기
-    for key, similar_names in ACCOUNT_NAME_MAPPINGS.items():
-        if target_metric in similar_names:
-            # 같은 그룹의 다른 계정명들을 확인
-            for similar_name in similar_names:
-                if similar_name != target_metric:
-                    matching_rows = df[df['account_nm'].str.contains(similar_name, na=False)]
-                    if not matching_rows.empty:
-                        return (similar_name, target_metric)
+    # 표준 지표(매출액, 자산총계 등)는 account_id 기반 분류표로 한 번에 조회
+    standard_metrics = [metric for metric in metrics if canonical_metric(metric) is not None]
+    resolved = resolve(df, standard_metrics, standard=data_store.standard_accounts(df_key))
+    located = {}
     
-    # 부분 매칭 시도 (예: "매출" -> "매출액")
-    for account_nm in df['account_nm'].dropna().unique():
-        if target_metric in account_nm or account_nm in target_metric:
-            return (account_nm, target_metric)
+    for metric in metrics:
+        account_id = None
+        if metric in resolved.index:
+            # 분류표에 있는 지표: 계정 ID로 찾고, 없으면 계정명이 정확히 같은 행만 사용
+            row = resolved.loc[metric]
+            if pd.notna(row['position']):
+                position, actual_account_name, account_id = int(row['position']), row['account_nm'], row['account_id']
+            else:
+                positions = account_index.positions(metric)
+                if not positions:
+                    located[metric] = None
+                    continue
+                position, actual_account_name = positions[0], metric
+            substituted = normalize_account_name(actual_account_name) != normalize_account_name(metric)
+        else:
+            # 분류표에 없는 지표: 계정명 인덱스로 유사 계정명 찾기
+            match = account_index.lookup(metric)
+            if not match:
+                located[metric] = None
+                continue
+            position, actual_account_name, substituted = match.position, match.actual_name, match.substituted
+        located[metric] = (position, actual_account_name, substituted, account_id)
     
-    return None
+    return located
 
 
 @tool
 def analyze_financial_metrics(df_key: str, metrics: List[str]) -> Dict[str, Any]:
     """
     지정된 DataFrame에서 특정 재무 지표들을 추출하여 분석합니다.
-    요청한 계정명이 없을 경우 유사한 계정명을 찾아서 대체합니다.
+    매출액, 영업이익, 자산총계 등 표준 지표는 IFRS 계정 ID(account_id)로 정확히 찾고,
+    그 밖의 계정명은 없을 경우 유사한 계정명을 찾아서 대체합니다.
     
     Args:
         df_key (str): 분석할 DataFrame의 키
@@ -234,52 +371,329 @@ def analyze_financial_metrics(df_key: str, metrics: List[str]) -> Dict[str, Any]
     
     try:
         df = _global_data_store.get(df_key)
+        located = _locate_metrics(_global_data_store, df_key, metrics)
         results = {}
         
         for metric in metrics:
-            # 유사한 계정명 찾기
-            found_account = find_similar_account_name(df, metric)
+            if located[metric] is None:
+                results[metric] = {"error": f"'{metric}' 또는 유사한 항목을 찾을 수 없음"}
+                continue
+            position, actual_account_name, substituted, account_id = located[metric]
             
-            if found_account:
-                actual_account_name, requested_account_name = found_account
-                
-                # 해당 계정명을 포함하는 행 찾기
-                metric_rows = df[df['account_nm'].str.contains(actual_account_name, na=False)]
-                
-                if not metric_rows.empty and 'thstrm_amount' in metric_rows.columns:
-                    # 가장 첫 번째 매칭되는 값 사용
-                    amount = metric_rows['thstrm_amount'].iloc[0]
-                    if pd.notna(amount):
-                        amount_in_100m = amount / 100_000_000  # 억원 단위
-                        if amount_in_100m >= 10000:
-                            amount_in_t = amount_in_100m / 10000  # 조원 단위
-                            results[metric] = {
-                                "value": float(amount),
-                                "formatted": f"{amount_in_t:,.1f}조원",
-                                "unit": "조원",
-                                "actual_account_name": actual_account_name,
-                                "requested_account_name": requested_account_name,
-                                "substituted": actual_account_name != requested_account_name
-                            }
-                        else:
-                            results[metric] = {
-                                "value": float(amount),
-                                "formatted": f"{amount_in_100m:,.0f}억원",
-                                "unit": "억원",
-                                "actual_account_name": actual_account_name,
-                                "requested_account_name": requested_account_name,
-                                "substituted": actual_account_name != requested_account_name
-                            }
-                    else:
-                        results[metric] = {"error": "값이 없음 (NaN)"}
-                else:
-                    results[metric] = {"error": f"'{actual_account_name}' 항목의 금액 정보를 찾을 수 없음"}
+            if 'thstrm_amount' not in df.columns:
+                results[metric] = {"error": f"'{actual_account_name}' 항목의 금액 정보를 찾을 수 없음"}
+                continue
+            
+            amount = df['thstrm_amount'].iloc[position]
+            if pd.isna(amount):
+                results[metric] = {"error": "값이 없음 (NaN)"}
+                continue
+            
+            amount_in_100m = amount / 100_000_000  # 억원 단위
+            if amount_in_100m >= 10000:
+                amount_in_t = amount_in_100m / 10000  # 조원 단위
+                formatted, unit = f"{amount_in_t:,.1f}조원", "조원"
             else:
-                results[metric] = {"error": f"'{metric}' 또는 유사한 항목을 찾을 수 없음"}
+                formatted, unit = f"{amount_in_100m:,.0f}억원", "억원"
+            results[metric] = {
+                "value": float(amount),
+                "formatted": formatted,
+                "unit": unit,
+                "actual_account_name": actual_account_name,
+                "requested_account_name": metric,
+                "substituted": substituted
+            }
+            if account_id:
+                results[metric]["account_id"] = account_id
         
         return results
         
     except KeyError:
         return {"error": f"'{df_key}' 키를 가진 DataFrame을 찾을 수 없습니다."}
     except Exception as e:
-        return {"error": f"분석 중 오류 발생: {str(e)}"} 
+        return {"error": f"분석 중 오류 발생: {str(e)}"}
+
+
+def expand_keys(data_store: SessionDataStore, patterns: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    키 목록과 glob 패턴('*_fs_*_consolidated' 등)을 저장소의 실제 키 목록으로 펼칩니다.
+    
+    Returns:
+        Tuple[List[str], List[str]]: (찾은 키 목록 - 중복 없이 입력 순서 유지, 찾지 못한 키/패턴 목록)
+    """
+    available = data_store.list_keys()
+    keys: Dict[str, None] = {}
+    unmatched = []
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            matched = [key for key in available if fnmatchcase(key, pattern)]
+        else:
+            matched = [pattern] if pattern in available else []
+        if not matched:
+            unmatched.append(pattern)
+        keys.update(dict.fromkeys(matched))
+    return list(keys), unmatched
+
+
+def build_metric_matrix(data_store: SessionDataStore, keys: List[str], metrics: List[str],
+                        amount_column: str = "thstrm_amount") -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    여러 DataFrame에서 여러 지표를 한 번에 추출하여 (회사, 사업연도, 연결/개별) × 지표 행렬을 만듭니다.
+    
+    DataFrame마다 캐시된 계정 인덱스/표준 지표 위치로 행 위치만 찾고,
+    금액 컬럼에서 해당 위치들을 한 번에 꺼내 정확한 정수(Int64) 행렬로 합칩니다.
+    
+    Args:
+        data_store (SessionDataStore): 데이터 저장소
+        keys (List[str]): DataFrame 키 목록 (expand_keys로 펼친 값)
+        metrics (List[str]): 지표 목록
+        amount_column (str): 금액 컬럼 (기본값: 당기 금액)
+        
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: (행렬, 상세 정보)
+            상세 정보의 substituted는 "요청 지표 → 실제 계정명" → 키 목록,
+            missing은 지표 → 값을 찾지 못한 키 목록입니다.
+    """
+    rows = []
+    values = []
+    substituted: Dict[str, List[str]] = {}
+    missing: Dict[str, List[str]] = {}
+    
+    for key in keys:
+        df = data_store.get(key)
+        rows.append(data_store.label(key))
+        
+        row = [None] * len(metrics)
+        if amount_column in df.columns:
+            located = _locate_metrics(data_store, key, metrics)
+            found = [(i, located[metric]) for i, metric in enumerate(metrics) if located[metric] is not None]
+            amounts = df[amount_column].iloc[[match[0] for _, match in found]].astype("Int64").tolist()
+            for (i, match), amount in zip(found, amounts):
+                row[i] = None if pd.isna(amount) else int(amount)
+                if match[2]:
+                    substituted.setdefault(f"{metrics[i]} → {match[1]}", []).append(key)
+        for metric, value in zip(metrics, row):
+            if value is None:
+                missing.setdefault(metric, []).append(key)
+        values.append(row)
+    
+    index = pd.MultiIndex.from_tuples(rows, names=["corp_name", "bsns_year", "fs_div"])
+    matrix = pd.DataFrame(values, index=index, columns=list(metrics), dtype="Int64")
+    if matrix.index.get_level_values("fs_div").isin(["", None]).all():
+        matrix = matrix.droplevel("fs_div")
+    return matrix.sort_index(), {"substituted": substituted, "missing": missing}
+
+
+@tool
+def analyze_financial_metrics_batch(df_keys: List[str], metrics: List[str]) -> Dict[str, Any]:
+    """
+    여러 DataFrame(회사 × 연도)에서 여러 재무 지표를 한 번의 호출로 추출하여 표로 반환합니다.
+    여러 회사/연도를 비교할 때 analyze_financial_metrics를 반복 호출하는 대신 사용하세요.
+    키 대신 glob 패턴(*, ?)을 사용할 수 있습니다.
+    
+    Args:
+        df_keys (List[str]): DataFrame 키 또는 glob 패턴 목록 (예: ['*_fs_*_consolidated'])
+        metrics (List[str]): 추출할 재무 지표 목록 (예: ['매출액', '영업이익', '자산총계'])
+        
+    Returns:
+        Dict[str, Any]: 회사/연도 × 지표 표(억원/조원 단위, 주당 지표는 원 단위), 대체 계정명, 찾지 못한 항목
+        
+    Examples:
+        - analyze_financial_metrics_batch(["*_fs_*_consolidated"], ["매출액", "영업이익", "당기순이익"])
+        - analyze_financial_metrics_batch(["삼성전자_fs_2023_consolidated", "SK하이닉스_fs_2023_consolidated"], ["자산총계", "부채총계"])
+    """
+    if _global_data_store is None:
+        return {"error": "데이터 저장소가 초기화되지 않았습니다."}
+    
+    try:
+        keys, unmatched = expand_keys(_global_data_store, df_keys)
+        if not keys:
+            return {"error": f"일치하는 DataFrame이 없습니다: {unmatched}"}
+        
+        matrix, details = build_metric_matrix(_global_data_store, keys, metrics)
+        amount_columns = [metric for metric in matrix.columns if canonical_metric(metric) not in PER_SHARE_METRICS]
+        
+        result = {
+            "table": render_frame(matrix, _global_data_store.results, title="지표 표",
+                                  amount_columns=amount_columns),
+            "unit": "억원/조원 (주당 지표는 원)",
+            "rows": len(matrix),
+            "keys": keys,
+        }
+        if details["substituted"]:
+            result["substituted"] = details["substituted"]
+        if details["missing"]:
+            result["missing"] = details["missing"]
+        if unmatched:
+            result["unmatched_keys"] = unmatched
+        return result
+        
+    except Exception as e:
+        return {"error": f"분석 중 오류 발생: {str(e)}"}
+
+
+@tool
+def get_financial_ratios(df_keys: List[str], ratios: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    저장된 재무제표의 표준 재무비율을 반환합니다. 비율은 데이터가 저장될 때 미리 계산되어 있습니다.
+    부채비율, 자기자본비율, 유동비율, ROE, ROA, 매출총이익률, 영업이익률, 순이익률과
+    전기 대비 증가율(매출액증가율, 영업이익증가율, 당기순이익증가율, 자산총계증가율)을 제공합니다.
+    키 대신 glob 패턴(*, ?)을 사용할 수 있습니다.
+    
+    Args:
+        df_keys (List[str]): DataFrame 키 또는 glob 패턴 목록 (예: ['*_fs_*_consolidated'])
+        ratios (List[str], optional): 비율명 목록 (기본값: 전체)
+        
+    Returns:
+        Dict[str, Any]: 회사/연도 × 비율 표(단위: %), 비율별 계산식
+        
+    Examples:
+        - get_financial_ratios(["*_fs_2023_consolidated"], ["부채비율", "ROE", "영업이익률"])
+        - get_financial_ratios(["삼성전자_fs_*_consolidated"], ["매출액증가율"])
+    """
+    if _global_data_store is None:
+        return {"error": "데이터 저장소가 초기화되지 않았습니다."}
+    
+    try:
+        keys, unmatched = expand_keys(_global_data_store, df_keys)
+        if not keys:
+            return {"error": f"일치하는 DataFrame이 없습니다: {unmatched}"}
+        
+        unknown = [name for name in ratios or [] if canonical_ratio(name) is None]
+        if ratios and len(unknown) == len(ratios):
+            return {"error": f"지원하지 않는 비율입니다: {unknown}. 지원 비율: {RATIO_NAMES}"}
+        
+        table = _global_data_store.ratios.table(keys, ratios)
+        if table.empty:
+            return {"error": "재무비율을 계산할 수 있는 재무제표가 없습니다."}
+        
+        result = {
+            "table": render_frame(table, _global_data_store.results, title="재무비율 표", amount_columns=[]),
+            "unit": "%",
+            "definitions": {name: describe_ratio(name) for name in table.columns},
+        }
+        skipped = [key for key in keys if key not in _global_data_store.ratios.keys()]
+        if skipped:
+            result["skipped_keys"] = skipped
+        if unknown:
+            result["unknown_ratios"] = unknown
+        if unmatched:
+            result["unmatched_keys"] = unmatched
+        return result
+        
+    except Exception as e:
+        return {"error": f"분석 중 오류 발생: {str(e)}"}
+
+
+@tool
+def analyze_multi_year_trend(metrics: List[str],
+                             company_names: Optional[List[str]] = None,
+                             fs_type: Optional[str] = "consolidated") -> Dict[str, Any]:
+    """
+    저장된 사업보고서들로 회사별 다년도 추이, 전년 대비 증가율(YoY), 연평균 성장률(CAGR)을 계산합니다.
+    사업보고서 한 건의 당기/전기/전전기 금액을 모두 사용하며, 여러 보고서에 같은 연도가 있으면
+    가장 최근 보고서의 (재작성된) 값을 사용합니다.
+    
+    Args:
+        metrics (List[str]): 지표 목록 (예: ['매출액', '영업이익'])
+        company_names (List[str], optional): 회사명 목록 (기본값: 저장된 모든 회사)
+        fs_type (str, optional): "consolidated"(연결, 기본값) 또는 "separate"(별도)
+        
+    Returns:
+        Dict[str, Any]: 연도별 금액 표(억원/조원), 증가율 표(%), CAGR 표(%)
+        
+    Examples:
+        - analyze_multi_year_trend(["매출액", "영업이익"], ["삼성전자"])
+    """
+    if _global_data_store is None:
+        return {"error": "데이터 저장소가 초기화되지 않았습니다."}
+    
+    try:
+        fs_div = {"consolidated": "CFS", "separate": "OFS"}.get((fs_type or "consolidated").lower(), "CFS")
+        panel = build_panel(_global_data_store.facts, metrics, corp_names=company_names, fs_div=fs_div)
+        if panel.empty:
+            return {"error": "조건에 맞는 사업보고서 데이터가 없습니다. 먼저 재무제표를 조회하세요."}
+        
+        growth = yoy_growth(panel).iloc[:, 1:]
+        summary = cagr(panel)
+        pager = _global_data_store.results
+        
+        result = {
+            "years": [int(year) for year in panel.columns],
+            "amounts": render_frame(panel, pager, title="연도별 금액", amount_columns=list(panel.columns)),
+            "amount_unit": "억원/조원 (1억 미만과 주당 지표는 원)",
+            "yoy_growth": render_frame(growth, pager, title="전년 대비 증가율", amount_columns=[]),
+            "cagr": render_frame(summary, pager, title="연평균 성장률", amount_columns=[]),
+            "growth_unit": "%",
+        }
+        found = set(panel.index.get_level_values("account"))
+        not_found = [metric for metric in metrics if metric not in found]
+        if not_found:
+            result["not_found"] = not_found
+        return result
+        
+    except Exception as e:
+        return {"error": f"분석 중 오류 발생: {str(e)}"}
+
+
+@tool
+def screen_companies(conditions: List[str],
+                     year: Optional[str] = None,
+                     sort_by: Optional[str] = None,
+                     ascending: bool = False,
+                     top_k: int = 20,
+                     fs_type: Optional[str] = "consolidated") -> Dict[str, Any]:
+    """
+    스크리닝 테이블(load_screening_universe로 조회한 주요계정과 저장된 재무제표)에서
+    모든 조건을 만족하는 회사를 찾아 정렬합니다.
+    조건에는 재무비율(%)과 금액 지표를 사용할 수 있으며, 금액은 '1조', '500억' 같은 단위를 붙일 수 있습니다.
+    - 비율: 부채비율, 자기자본비율, 유동비율, ROE, ROA, 영업이익률, 순이익률, 매출액증가율, 영업이익증가율 등
+    - 금액: 자산총계, 부채총계, 자본총계, 매출액, 영업이익, 당기순이익 등
+    
+    Args:
+        conditions (List[str]): 조건식 목록, 모두 만족해야 함 (예: ['영업이익률 > 15', '부채비율 < 100'])
+        year (str, optional): 사업연도 (기본값: 가장 최근 연도)
+        sort_by (str, optional): 정렬 기준 지표 (기본값: 첫 번째 조건의 지표)
+        ascending (bool): 오름차순 정렬 여부 (기본값: 내림차순)
+        top_k (int): 반환할 최대 회사 수 (기본값: 20)
+        fs_type (str, optional): "consolidated"(연결, 기본값) 또는 "separate"(별도).
+                                 해당 재무제표가 없는 회사는 다른 재무제표 값을 사용합니다.
+        
+    Returns:
+        Dict[str, Any]: 조건을 만족한 회사 수와 상위 회사 표 (비율은 %, 금액은 억원/조원)
+        
+    Examples:
+        - screen_companies(["영업이익률 > 15", "부채비율 < 100"], year="2023", sort_by="ROE")
+        - screen_companies(["매출액 >= 1조"], sort_by="매출액증가율", top_k=10)
+    """
+    if _global_data_store is None:
+        return {"error": "데이터 저장소가 초기화되지 않았습니다."}
+    
+    screening = _global_data_store.screening
+    if len(screening) == 0:
+        return {"error": "스크리닝 테이블이 비어 있습니다. 먼저 load_screening_universe로 주요계정을 조회하세요."}
+    
+    try:
+        fs_div = {"consolidated": "CFS", "separate": "OFS"}.get((fs_type or "consolidated").lower(), "CFS")
+        year = str(year) if year else None
+        if year is not None and year not in screening.years():
+            return {"error": f"{year}년 데이터가 없습니다. 사용 가능한 연도: {screening.years()}"}
+        result, matched = screening.screen(conditions, year=year, fs_div=fs_div, sort_by=sort_by,
+                                           ascending=ascending, top_k=top_k)
+        
+        amount_columns = [column for column in result.columns[3:] if not is_ratio(column)]
+        table = render_frame(result, _global_data_store.results, title="스크리닝 결과",
+                             amount_columns=amount_columns)
+        
+        return {
+            "year": year or screening.years()[0],
+            "matched": matched,
+            "universe": int(screening.frame["corp_code"].nunique()),
+            "table": table if len(result) else "(조건을 만족하는 회사 없음)",
+            "unit": "비율은 %, 금액은 억원/조원",
+        }
+        
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        return {"error": f"스크리닝 중 오류 발생: {str(e)}"}
@@ -12,12 +12,45 @@ from .get_corp_code import (
     get_corp_code_interactive
 )
 
+from .client import (
+    OpenDartClient,
+    get_client
+)
+
+from .corp_index import (
+    CorpIndex,
+    CorpRecord,
+    get_corp_index,
+    refresh_corp_index,
+    refresh_corp_index_on_miss
+)
+
+from .corp_search import (
+    CorpSearchEngine,
+    CorpMatch,
+    get_corp_search,
+    search_corp
+)
+
+from .response_cache import (
+    ResponseCache,
+    get_response_cache
+)
+
+from .key_accounts import (
+    get_key_accounts_body,
+    fetch_key_accounts
+)
+
 from .get_financial_statement import (
+    get_financial_statement_body,
     get_single_financial_statement,
     convert_to_dataframe,
     analyze_financial_statements,
     print_dataframe_info,
     get_financial_statement_for_company,
+    fetch_statement_dataframe,
+    fetch_financial_statements_bulk,
     main,
     test_samsung
 )
@@ -26,7 +59,9 @@ from .get_financial_statement import (
 from .langchain_tools import (
     search_corp_code,
     search_financial_statements,
-    search_financial_statements_dataframe
+    search_financial_statements_dataframe,
+    search_financial_statements_bulk,
+    load_screening_universe
 )
 
 __all__ = [
@@ -35,17 +70,37 @@ __all__ = [
     'find_corp_code_by_name',
     'find_samsung_corp_code',
     'get_corp_code_interactive',
+    'OpenDartClient',
+    'get_client',
+    'ResponseCache',
+    'get_response_cache',
+    'CorpIndex',
+    'CorpRecord',
+    'get_corp_index',
+    'refresh_corp_index',
+    'refresh_corp_index_on_miss',
+    'CorpSearchEngine',
+    'CorpMatch',
+    'get_corp_search',
+    'search_corp',
+    'get_key_accounts_body',
+    'fetch_key_accounts',
+    'get_financial_statement_body',
     'get_single_financial_statement',
     'convert_to_dataframe',
     'analyze_financial_statements',
     'print_dataframe_info',
     'get_financial_statement_for_company',
+    'fetch_statement_dataframe',
+    'fetch_financial_statements_bulk',
     'main',
     'test_samsung',
     # LangChain 도구들
     'search_corp_code',
     'search_financial_statements',
-    'search_financial_statements_dataframe'
+    'search_financial_statements_dataframe',
+    'search_financial_statements_bulk',
+    'load_screening_universe'
 ]
 
 __version__ = "1.0.0"
@@ -0,0 +1,120 @@
+"""
+Arrow 기반 재무제표 응답 변환 모듈 (선택 사항)
+
+pyarrow가 설치되어 있으면 응답 본문(JSON bytes)을 Python 딕셔너리로 파싱하지 않고
+Arrow 컬럼으로 바로 읽어 타입을 변환한 뒤 pandas DataFrame으로 만듭니다.
+딕셔너리 목록을 거치지 않아 대량 조회 시 메모리와 시간이 줄어듭니다.
+
+컬럼 타입은 JSON 경로(statement_schema.apply_statement_schema)와 같습니다.
+- category 컬럼: pandas category
+- 금액/ord 컬럼: pandas nullable 정수 (Int64, Int16)
+- 나머지 문자열 컬럼: pandas 기본 문자열 타입
+
+DART_ARROW_INGEST=0으로 끌 수 있으며, 끄거나 pyarrow가 없으면 기존 JSON 경로를 사용합니다.
+"""
+
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from .statement_schema import AMOUNT_PATTERN, STATEMENT_SCHEMA
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.json as pa_json
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+ARROW_INGEST_ENABLED = HAS_ARROW and os.getenv("DART_ARROW_INGEST", "1") != "0"
+
+# 스키마 타입 → Arrow 정수 타입
+_ARROW_INT_TYPES = {
+    "Int16": "int16",
+    "Int32": "int32",
+    "Int64": "int64",
+}
+
+# Arrow 정수 타입 → pandas nullable 정수 타입 (JSON 경로와 같은 타입)
+_PANDAS_INT_TYPES = {
+    "int16": pd.Int16Dtype(),
+    "int32": pd.Int32Dtype(),
+    "int64": pd.Int64Dtype(),
+}
+
+
+def _arrow_amounts(column: "pa.ChunkedArray") -> "pa.ChunkedArray":
+    """금액 문자열 컬럼을 int64로 정확하게 변환합니다 (정수가 아닌 값은 null)."""
+    if not pa.types.is_string(column.type):
+        return pc.cast(column, pa.int64())
+    if pc.any(pc.match_substring(column, ",")).as_py():
+        column = pc.replace_substring(column, ",", "")
+    valid = pc.match_substring_regex(column, f"^{AMOUNT_PATTERN}$")
+    cleaned = pc.if_else(valid, pc.utf8_trim_whitespace(column), pa.scalar(None, pa.string()))
+    return pc.cast(cleaned, pa.int64())
+
+
+def _arrow_ints(column: "pa.ChunkedArray", arrow_type: str) -> "pa.ChunkedArray":
+    """정수 문자열 컬럼을 지정한 Arrow 정수 타입으로 변환합니다 (정수가 아닌 값은 null)."""
+    if pa.types.is_string(column.type):
+        valid = pc.match_substring_regex(column, f"^{AMOUNT_PATTERN}$")
+        column = pc.if_else(valid, pc.utf8_trim_whitespace(column), pa.scalar(None, pa.string()))
+    return pc.cast(column, arrow_type)
+
+
+def _types_mapper(arrow_type: "pa.DataType"):
+    """to_pandas 타입 매핑: 정수는 pandas nullable 정수로, 나머지(dictionary, 문자열)는 pandas 기본 변환으로"""
+    return _PANDAS_INT_TYPES.get(str(arrow_type))
+
+
+def read_statement_body(body: bytes) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
+    """
+    재무제표 응답 본문을 Arrow로 읽어 DataFrame으로 변환합니다.
+
+    Args:
+        body (bytes): fnlttSinglAcntAll.json 응답 본문
+
+    Returns:
+        tuple: (DataFrame 또는 None, {"status", "message"} 응답 요약)
+               정상 응답(000)이 아니면 DataFrame은 None입니다.
+
+    Raises:
+        pyarrow.ArrowException: 본문을 Arrow로 읽거나 변환할 수 없는 경우
+    """
+    # 응답 전체가 JSON 객체 하나이므로 블록 하나로 읽어야 함 (기본 블록 크기보다 크면 읽기 실패)
+    table = pa_json.read_json(
+        pa.BufferReader(body),
+        read_options=pa_json.ReadOptions(block_size=len(body) + 1),
+        parse_options=pa_json.ParseOptions(newlines_in_values=True),
+    )
+    envelope = {
+        name: table.column(name)[0].as_py()
+        for name in ("status", "message")
+        if name in table.column_names
+    }
+    if envelope.get("status") != "000" or "list" not in table.column_names:
+        return None, envelope
+
+    rows = pc.list_flatten(table.column("list"))
+    statement = pa.Table.from_struct_array(rows)
+
+    columns = {}
+    for name in statement.column_names:
+        column = statement.column(name)
+        dtype = STATEMENT_SCHEMA.get(name)
+        if dtype == "amount":
+            column = _arrow_amounts(column)
+        elif dtype == "category":
+            column = pc.dictionary_encode(column)
+        elif dtype in _ARROW_INT_TYPES:
+            column = _arrow_ints(column, _ARROW_INT_TYPES[dtype])
+        columns[name] = column
+
+    df = pa.table(columns).to_pandas(types_mapper=_types_mapper)
+    # dictionary는 등장 순서로 범주를 만들므로, JSON 경로(astype("category"))처럼 정렬된 순서로 맞춤
+    for name in df.columns:
+        if isinstance(df[name].dtype, pd.CategoricalDtype):
+            df[name] = df[name].cat.reorder_categories(df[name].cat.categories.sort_values())
+    return df, envelope
@@ -0,0 +1,232 @@
+"""
+OpenDart API HTTP 클라이언트 모듈
+
+모든 OpenDart API 호출이 공유하는 keep-alive 세션을 관리합니다.
+연결 풀 크기를 제한하고, 요청별 타임아웃과 지터가 적용된 지수 백오프 재시도를 제공합니다.
+모든 요청은 API 키별 속도 제한기(rate_limiter)를 거칩니다.
+"""
+
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limiter import get_rate_limiter, STATUS_RATE_EXCEEDED
+from utils.singleflight import SingleFlight
+
+# OpenDart API 기본 URL
+BASE_URL = "https://opendart.fss.or.kr/api"
+
+# 연결 풀 / 타임아웃 / 재시도 설정 (환경 변수로 재정의 가능)
+POOL_CONNECTIONS = int(os.getenv("DART_HTTP_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("DART_HTTP_POOL_MAXSIZE", "16"))
+CONNECT_TIMEOUT = float(os.getenv("DART_HTTP_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("DART_HTTP_READ_TIMEOUT", "20"))
+MAX_RETRIES = int(os.getenv("DART_HTTP_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("DART_HTTP_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("DART_HTTP_BACKOFF_MAX", "8"))
+
+# 응답 본문 앞부분에서 status 값을 찾는 패턴
+_STATUS_PATTERN = re.compile(rb'"status"\s*:\s*"([^"]*)"')
+
+
+def response_status(body: bytes) -> Optional[str]:
+    """JSON 응답 본문 전체를 파싱하지 않고 status 값만 읽습니다."""
+    match = _STATUS_PATTERN.search(body, 0, 512)
+    return match.group(1).decode("ascii", "replace") if match else None
+
+
+class OpenDartClient:
+    """
+    OpenDart API 호출을 위한 공유 HTTP 클라이언트.
+
+    하나의 requests.Session을 재사용하여 TCP/TLS 핸드셰이크 비용을 줄이고,
+    5xx 응답과 네트워크 오류에 대해서는 지터가 적용된 지수 백오프로 재시도합니다.
+    요청 인자에 crtfc_key가 있으면 해당 키의 속도 제한기와 일일 호출 한도를 적용합니다.
+    같은 엔드포인트/인자로 동시에 들어온 JSON 요청은 하나의 네트워크 호출로 병합됩니다.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE,
+        timeout: tuple = (CONNECT_TIMEOUT, READ_TIMEOUT),
+        max_retries: int = MAX_RETRIES,
+        backoff_base: float = BACKOFF_BASE,
+        backoff_max: float = BACKOFF_MAX,
+    ):
+        """
+        Args:
+            base_url (str): OpenDart API 기본 URL
+            pool_connections (int): 호스트별로 유지할 연결 풀 개수
+            pool_maxsize (int): 연결 풀당 최대 연결 수
+            timeout (tuple): (연결 타임아웃, 읽기 타임아웃) 초 단위
+            max_retries (int): 5xx/네트워크 오류 시 최대 재시도 횟수
+            backoff_base (float): 백오프 기본 대기 시간 (초)
+            backoff_max (float): 백오프 최대 대기 시간 (초)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._flight = SingleFlight()
+
+        self.session = requests.Session()
+        # 재시도는 직접 처리하므로 어댑터 레벨 재시도는 끕니다.
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,
+            pool_block=True,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff(self, attempt: int) -> float:
+        """attempt번째 재시도 전 대기 시간을 계산합니다 (full jitter)."""
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    def request(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                timeout: Optional[tuple] = None) -> requests.Response:
+        """
+        OpenDart API에 GET 요청을 보내고 응답 객체를 반환합니다.
+
+        Args:
+            endpoint (str): API 엔드포인트 (예: "fnlttSinglAcntAll.json")
+            params (dict, optional): 요청 인자
+            timeout (tuple, optional): 이 요청에만 적용할 타임아웃
+
+        Returns:
+            requests.Response: 성공한 HTTP 응답
+
+        Raises:
+            requests.exceptions.RequestException: 재시도 후에도 실패한 경우
+            QuotaExceededError: 일일 호출 한도를 모두 사용한 경우
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        limiter = self._limiter(params)
+        attempt = 0
+
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=timeout or self.timeout)
+                if response.status_code >= 500 and attempt < self.max_retries:
+                    response.close()
+                    time.sleep(self._backoff(attempt))
+                    attempt += 1
+                    continue
+                response.raise_for_status()
+                return response
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+
+    def _limiter(self, params: Optional[Dict[str, Any]]):
+        """요청 인자의 API 키에 해당하는 속도 제한기를 반환합니다."""
+        api_key = (params or {}).get("crtfc_key")
+        return get_rate_limiter(api_key) if api_key else None
+
+    def get_json(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                 timeout: Optional[tuple] = None) -> Dict[str, Any]:
+        """
+        JSON 엔드포인트를 호출하고 파싱된 결과를 반환합니다.
+
+        사용한도 초과(status 020) 응답을 받으면 속도 제한기에 알려 호출 속도를 낮추고,
+        백오프 후 최대 max_retries번까지 다시 요청합니다.
+        진행 중인 동일 요청이 있으면 새로 요청하지 않고 그 결과를 함께 받습니다.
+        """
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        return self._flight.do(key, self._get_json, endpoint, params, timeout)
+
+    def _get_json(self, endpoint: str, params: Optional[Dict[str, Any]],
+                  timeout: Optional[tuple]) -> Dict[str, Any]:
+        """get_json의 실제 요청 처리 (singleflight 안에서 실행)."""
+        def decode(response):
+            data = response.json()
+            return data, data.get("status") if isinstance(data, dict) else None
+        return self._get_with_status_retry(endpoint, params, timeout, decode)
+
+    def get_json_body(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                      timeout: Optional[tuple] = None) -> bytes:
+        """
+        JSON 엔드포인트를 호출하고 파싱하지 않은 응답 본문(bytes)을 반환합니다.
+
+        사용한도 초과 재시도와 동일 요청 병합은 get_json과 같습니다.
+        """
+        key = ("body", endpoint, tuple(sorted((params or {}).items())))
+        return self._flight.do(key, self._get_json_body, endpoint, params, timeout)
+
+    def _get_json_body(self, endpoint: str, params: Optional[Dict[str, Any]],
+                       timeout: Optional[tuple]) -> bytes:
+        """get_json_body의 실제 요청 처리 (singleflight 안에서 실행)."""
+        def decode(response):
+            body = response.content
+            return body, response_status(body)
+        return self._get_with_status_retry(endpoint, params, timeout, decode)
+
+    def _get_with_status_retry(self, endpoint: str, params: Optional[Dict[str, Any]],
+                               timeout: Optional[tuple], decode):
+        """
+        요청 후 decode(response) → (결과, status)로 응답 상태를 확인합니다.
+
+        사용한도 초과(status 020) 응답을 받으면 속도 제한기에 알려 호출 속도를 낮추고,
+        백오프 후 최대 max_retries번까지 다시 요청합니다.
+        """
+        limiter = self._limiter(params)
+        attempt = 0
+
+        while True:
+            result, status = decode(self.request(endpoint, params=params, timeout=timeout))
+            if limiter is not None:
+                limiter.report(status)
+            if status != STATUS_RATE_EXCEEDED or attempt >= self.max_retries:
+                return result
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def get_bytes(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                  timeout: Optional[tuple] = None) -> bytes:
+        """바이너리(예: ZIP) 엔드포인트를 호출하고 응답 본문을 반환합니다."""
+        return self.request(endpoint, params=params, timeout=timeout).content
+
+    def warm_up(self):
+        """
+        OpenDart 서버와 미리 연결(TCP/TLS)을 맺어 연결 풀에 넣어 둡니다.
+
+        API 엔드포인트를 호출하지 않으므로 호출 한도를 사용하지 않습니다.
+        """
+        try:
+            self.session.head(self.base_url.rsplit("/api", 1)[0], timeout=self.timeout).close()
+        except requests.exceptions.RequestException:
+            pass
+
+    def close(self):
+        """세션과 연결 풀을 닫습니다."""
+        self.session.close()
+
+
+# 프로세스 전역 클라이언트 (최초 사용 시 생성)
+_client: Optional[OpenDartClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> OpenDartClient:
+    """프로세스 전역에서 공유하는 OpenDartClient를 반환합니다."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenDartClient()
+    return _client
@@ -0,0 +1,265 @@
+"""
+로컬 회사 고유번호(corp_code) 인덱스 모듈
+
+OpenDart의 고유번호 파일(corpCode.xml ZIP)을 한 번 내려받아 SQLite 파일로 저장하고,
+메모리에 올린 딕셔너리로 회사명/종목코드/고유번호 정확 일치 검색을 O(1)로 처리합니다.
+
+인덱스는 생성 시각을 SQLite에 함께 저장하며, DART_CORP_INDEX_TTL_HOURS(기본 168시간)보다
+오래되었거나 검색에서 회사를 찾지 못하면 고유번호 파일을 다시 내려받아 갱신합니다.
+
+인덱스 직접 갱신:
+    python -m tools.opendart.corp_index --refresh
+"""
+
+import io
+import os
+import sqlite3
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, List, NamedTuple, Optional
+
+from resources.config import get_cache_dir
+from .client import get_client
+
+# 인덱스 유효 기간 (이보다 오래되면 다음 사용 시 갱신)
+CORP_INDEX_TTL_HOURS = float(os.getenv("DART_CORP_INDEX_TTL_HOURS", "168"))
+# 검색 실패 시 갱신을 시도하는 최소 간격 (같은 실패가 반복되어도 고유번호 파일을 계속 내려받지 않도록)
+CORP_INDEX_MISS_REFRESH_MINUTES = float(os.getenv("DART_CORP_INDEX_MISS_REFRESH_MINUTES", "60"))
+
+
+class CorpRecord(NamedTuple):
+    """회사 고유번호 파일의 한 항목"""
+    corp_code: str
+    corp_name: str
+    stock_code: str
+    modify_date: str
+
+    @property
+    def is_listed(self) -> bool:
+        """상장 회사(종목코드 보유) 여부"""
+        return bool(self.stock_code)
+
+
+def download_corp_codes(api_key: str) -> List[CorpRecord]:
+    """
+    OpenDart에서 고유번호 파일을 내려받아 파싱합니다.
+
+    Raises:
+        ValueError: 응답이 ZIP 파일이 아닌 경우 (잘못된 API 키, 한도 초과 등)
+    """
+    payload = get_client().get_bytes("corpCode.xml", params={"crtfc_key": api_key})
+    if not zipfile.is_zipfile(io.BytesIO(payload)):
+        raise ValueError(f"고유번호 파일을 받을 수 없습니다: {payload[:200].decode('utf-8', 'replace')}")
+
+    records = []
+    with zipfile.ZipFile(io.BytesIO(payload)) as archive:
+        with archive.open(archive.namelist()[0]) as xml_file:
+            for _, elem in ET.iterparse(xml_file):
+                if elem.tag != "list":
+                    continue
+                records.append(CorpRecord(
+                    corp_code=(elem.findtext("corp_code") or "").strip(),
+                    corp_name=(elem.findtext("corp_name") or "").strip(),
+                    stock_code=(elem.findtext("stock_code") or "").strip(),
+                    modify_date=(elem.findtext("modify_date") or "").strip(),
+                ))
+                elem.clear()
+    return records
+
+
+class CorpIndex:
+    """
+    회사 고유번호 로컬 인덱스.
+
+    디스크에는 SQLite 파일로 저장하고, 조회는 메모리의 딕셔너리로 처리합니다.
+    같은 이름의 회사가 여러 개일 수 있으므로 이름 검색은 목록을 반환하며, 상장 회사가 먼저 옵니다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str, optional): SQLite 파일 경로
+        """
+        self.path = path or os.path.join(get_cache_dir(), "corp_index.sqlite")
+        self.records: List[CorpRecord] = []
+        self.built_at: Optional[float] = None
+        self._by_code: Dict[str, CorpRecord] = {}
+        self._by_stock: Dict[str, CorpRecord] = {}
+        self._by_name: Dict[str, List[CorpRecord]] = {}
+
+    def exists(self) -> bool:
+        """디스크에 인덱스 파일이 있는지 확인합니다."""
+        return os.path.exists(self.path)
+
+    def age(self) -> float:
+        """인덱스를 만든 뒤 지난 시간(초). 생성 시각이 없으면 무한대"""
+        if self.built_at is None:
+            return float("inf")
+        return time.time() - self.built_at
+
+    def build(self, records: List[CorpRecord]):
+        """레코드 목록으로 SQLite 파일을 새로 만들고 메모리 인덱스를 갱신합니다."""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute(
+                "CREATE TABLE corps ("
+                "corp_code TEXT PRIMARY KEY, corp_name TEXT NOT NULL, "
+                "stock_code TEXT NOT NULL, modify_date TEXT)"
+            )
+            conn.execute("CREATE INDEX idx_corps_name ON corps(corp_name)")
+            conn.execute("CREATE INDEX idx_corps_stock ON corps(stock_code)")
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.executemany("INSERT OR REPLACE INTO corps VALUES (?, ?, ?, ?)", records)
+            built_at = time.time()
+            conn.execute("INSERT INTO meta VALUES ('built_at', ?)", (str(built_at),))
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, self.path)
+        self._load_records(records, built_at)
+
+    def load(self):
+        """SQLite 파일에서 메모리 인덱스를 불러옵니다."""
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT corp_code, corp_name, stock_code, modify_date FROM corps"
+            ).fetchall()
+            built_at = conn.execute("SELECT value FROM meta WHERE key = 'built_at'").fetchone()
+        finally:
+            conn.close()
+        self._load_records([CorpRecord(*row) for row in rows], float(built_at[0]) if built_at else None)
+
+    def _load_records(self, records: List[CorpRecord], built_at: Optional[float]):
+        """메모리 딕셔너리를 구성합니다."""
+        by_code, by_stock, by_name = {}, {}, {}
+        for record in records:
+            by_code[record.corp_code] = record
+            if record.stock_code:
+                by_stock[record.stock_code] = record
+            by_name.setdefault(record.corp_name, []).append(record)
+        for same_name in by_name.values():
+            if len(same_name) > 1:
+                same_name.sort(key=lambda r: not r.is_listed)
+
+        self.records = records
+        self.built_at = built_at
+        self._by_code, self._by_stock, self._by_name = by_code, by_stock, by_name
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def find_by_corp_code(self, corp_code: str) -> Optional[CorpRecord]:
+        """고유번호로 회사를 찾습니다."""
+        return self._by_code.get(corp_code.strip())
+
+    def find_by_stock_code(self, stock_code: str) -> Optional[CorpRecord]:
+        """종목코드로 회사를 찾습니다."""
+        return self._by_stock.get(stock_code.strip())
+
+    def find_by_name(self, corp_name: str) -> List[CorpRecord]:
+        """회사명이 정확히 일치하는 회사 목록을 반환합니다 (상장 회사 우선)."""
+        return list(self._by_name.get(corp_name.strip(), []))
+
+
+# 프로세스 전역 인덱스 (최초 사용 시 로딩)
+_index: Optional[CorpIndex] = None
+_index_lock = threading.Lock()
+# 마지막으로 자동 갱신을 시도한 시각 (실패해도 기록하여 재시도 간격을 지킴)
+_last_refresh_attempt = 0.0
+
+
+def _try_refresh(index: CorpIndex, api_key: str) -> CorpIndex:
+    """
+    고유번호 파일을 다시 내려받아 새 인덱스를 만듭니다 (_index_lock을 잡은 상태에서 호출).
+    내려받기에 실패하면 경고를 출력하고 기존 인덱스를 그대로 반환합니다.
+    """
+    global _last_refresh_attempt
+    _last_refresh_attempt = time.time()
+    try:
+        fresh = CorpIndex(index.path)
+        fresh.build(download_corp_codes(api_key))
+        return fresh
+    except Exception as e:
+        print(f"경고: 회사 인덱스를 갱신하지 못해 기존 인덱스를 사용합니다: {e}")
+        return index
+
+
+def _refresh_due(index: CorpIndex, min_age: float) -> bool:
+    """인덱스가 min_age초보다 오래되었고 최근에 갱신을 시도하지 않았는지 확인합니다."""
+    retry_interval = CORP_INDEX_MISS_REFRESH_MINUTES * 60
+    return index.age() > min_age and time.time() - _last_refresh_attempt > retry_interval
+
+
+def get_corp_index(api_key: Optional[str] = None) -> CorpIndex:
+    """
+    프로세스 전역 CorpIndex를 반환합니다.
+
+    디스크에 인덱스가 없으면 api_key로 고유번호 파일을 내려받아 새로 만들고,
+    인덱스가 DART_CORP_INDEX_TTL_HOURS보다 오래되었으면 api_key가 있을 때 갱신합니다.
+    """
+    global _index
+    ttl = CORP_INDEX_TTL_HOURS * 3600
+    if _index is None or (api_key and _refresh_due(_index, ttl)):
+        with _index_lock:
+            if _index is None:
+                index = CorpIndex()
+                if index.exists():
+                    index.load()
+                else:
+                    if not api_key:
+                        raise ValueError("회사 인덱스가 없어 생성하려면 DART_API_KEY가 필요합니다.")
+                    index.build(download_corp_codes(api_key))
+                _index = index
+            if api_key and _refresh_due(_index, ttl):
+                _index = _try_refresh(_index, api_key)
+    return _index
+
+
+def refresh_corp_index_on_miss(api_key: Optional[str]) -> bool:
+    """
+    검색에서 회사를 찾지 못했을 때 인덱스를 갱신합니다 (신규 상장, 사명 변경 반영).
+
+    인덱스가 DART_CORP_INDEX_MISS_REFRESH_MINUTES보다 오래되었고 그 간격 안에 갱신을 시도하지 않은 경우에만
+    내려받으며, 새 인덱스로 바뀌었으면 True를 반환합니다.
+    """
+    global _index
+    if not api_key:
+        return False
+    index = get_corp_index(api_key)
+    with _index_lock:
+        if _index is not index or not _refresh_due(index, CORP_INDEX_MISS_REFRESH_MINUTES * 60):
+            return _index is not index
+        _index = _try_refresh(index, api_key)
+        return _index is not index
+
+
+def refresh_corp_index(api_key: str) -> CorpIndex:
+    """고유번호 파일을 다시 내려받아 인덱스를 갱신합니다."""
+    global _index
+    index = CorpIndex()
+    index.build(download_corp_codes(api_key))
+    with _index_lock:
+        _index = index
+    return index
+
+
+if __name__ == "__main__":
+    import argparse
+    from .get_corp_code import get_api_key
+
+    parser = argparse.ArgumentParser(description="OpenDart 회사 고유번호 로컬 인덱스")
+    parser.add_argument("--refresh", action="store_true", help="고유번호 파일을 다시 내려받아 인덱스 갱신")
+    args = parser.parse_args()
+
+    if args.refresh:
+        index = refresh_corp_index(get_api_key())
+        print(f"회사 인덱스를 갱신했습니다: {len(index):,}개 회사 ({index.path})")
+    else:
+        index = get_corp_index(get_api_key())
+        print(f"회사 인덱스: {len(index):,}개 회사 ({index.path})")
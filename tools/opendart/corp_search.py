@@ -0,0 +1,304 @@
+"""
+회사명 퍼지/접두어 검색 모듈
+
+로컬 회사 인덱스(corp_index) 위에 검색용 인덱스를 만들어 회사명을 순위대로 찾습니다.
+- "(주)", "㈜", "주식회사" 등 법인 표기와 공백/대소문자 차이를 무시합니다.
+- 한글을 자모로 분해하여 입력 중인 마지막 글자("삼성ㅈ", "삼성젅")도 접두어로 인식합니다.
+- 글자 단위 역색인으로 포함/약칭("삼전" → "삼성전자") 후보를 빠르게 찾고,
+  후보가 없으면 자모 바이그램 유사도로 오타를 허용합니다.
+- 같은 조건이면 상장 회사, 이름 길이가 비슷한 회사가 먼저 옵니다.
+"""
+
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional
+
+from .corp_index import CorpIndex, CorpRecord, get_corp_index, refresh_corp_index_on_miss
+
+# 법인 형태 표기 (검색 시 무시)
+_CORP_SUFFIX_PATTERN = re.compile(r"\(주\)|㈜|\(유\)|\(합\)|주식회사|유한회사|유한책임회사")
+_NON_WORD_PATTERN = re.compile(r"[\s\.\,\-_&·]+")
+
+# 자주 쓰이는 약칭 → 정식 회사명 (키는 normalize_name 적용 후의 형태)
+COMMON_ALIASES = {
+    "삼전": "삼성전자",
+    "삼바": "삼성바이오로직스",
+    "하이닉스": "SK하이닉스",
+    "현차": "현대자동차",
+    "현대차": "현대자동차",
+    "기아차": "기아",
+    "엘전": "LG전자",
+    "엘화": "LG화학",
+    "엘엔솔": "LG에너지솔루션",
+    "포스코": "POSCO홀딩스",
+    "네이버": "NAVER",
+}
+
+# 매칭 유형 (작을수록 우선)
+MATCH_EXACT = 0
+MATCH_PREFIX = 1
+MATCH_CONTAINS = 2
+MATCH_ABBREVIATION = 3
+MATCH_FUZZY = 4
+
+MATCH_TYPE_NAMES = {
+    MATCH_EXACT: "exact",
+    MATCH_PREFIX: "prefix",
+    MATCH_CONTAINS: "contains",
+    MATCH_ABBREVIATION: "abbreviation",
+    MATCH_FUZZY: "fuzzy",
+}
+# 약칭(COMMON_ALIASES)으로 찾은 정확 일치의 매칭 유형 이름 (순위는 정확 일치와 같음)
+MATCH_ALIAS_NAME = "alias"
+
+# 접두어 검색 시 전체 회사 목록에서 살펴볼 최대 후보 수 (상장 회사 목록은 모두 확인)
+PREFIX_SCAN_LIMIT = 200
+# 퍼지 검색에서 허용할 최소 자모 바이그램 유사도
+FUZZY_MIN_SIMILARITY = 0.5
+
+# 한글 음절 분해용 자모 테이블 (호환 자모)
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+# 겹받침은 두 자음으로 풀어서 입력 중인 글자("젅" → "전ㅈ")도 접두어로 인식되게 합니다.
+_JONGSEONG = ("", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+              "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# 영문 약자의 한글 표기 (검색 시 영문으로 통일)
+_TRANSLITERATIONS = (
+    ("에스케이", "sk"),
+    ("엘지", "lg"),
+    ("케이티", "kt"),
+    ("씨제이", "cj"),
+    ("지에스", "gs"),
+    ("에이치디", "hd"),
+    ("케이비", "kb"),
+)
+
+
+def normalize_name(name: str) -> str:
+    """법인 표기, 공백/구두점을 제거하고 영문 약자를 소문자로 통일한 검색용 회사명을 반환합니다."""
+    name = _CORP_SUFFIX_PATTERN.sub("", name)
+    name = _NON_WORD_PATTERN.sub("", name).lower()
+    for hangul, latin in _TRANSLITERATIONS:
+        if name.startswith(hangul):
+            return latin + name[len(hangul):]
+    return name
+
+
+def decompose_jamo(text: str) -> str:
+    """한글 음절을 자모 단위로 분해합니다 (한글 외 문자는 그대로 둡니다)."""
+    result = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            result.append(_CHOSEONG[code // 588])
+            result.append(_JUNGSEONG[(code % 588) // 28])
+            result.append(_JONGSEONG[code % 28])
+        else:
+            result.append(ch)
+    return "".join(result)
+
+
+def _bigrams(text: str) -> set:
+    """문자열의 바이그램 집합을 반환합니다."""
+    if len(text) < 2:
+        return {text}
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _is_subsequence(query: str, target: str) -> bool:
+    """query의 글자들이 target에 순서대로 모두 나타나는지 확인합니다."""
+    it = iter(target)
+    return all(ch in it for ch in query)
+
+
+class CorpMatch(NamedTuple):
+    """검색 결과 한 건"""
+    record: CorpRecord
+    match_type: str
+    score: float
+
+
+class CorpSearchEngine:
+    """
+    회사명 순위 검색 엔진.
+
+    생성 시 정규화된 이름, 자모 접두어 정렬 목록, 글자 단위 역색인을 한 번 만들어 두고,
+    search()는 이 인덱스만으로 후보를 좁힌 뒤 상위 k개를 반환합니다.
+    """
+
+    def __init__(self, records: List[CorpRecord]):
+        """
+        Args:
+            records (List[CorpRecord]): 검색 대상 회사 목록
+        """
+        self.records = records
+        self._names = [normalize_name(r.corp_name) for r in records]
+        self._jamo = [decompose_jamo(n) for n in self._names]
+        self._listed = [r.is_listed for r in records]
+
+        self._exact: Dict[str, List[int]] = {}
+        self._postings: Dict[str, set] = {}
+        for i, name in enumerate(self._names):
+            self._exact.setdefault(name, []).append(i)
+            for ch in set(name):
+                self._postings.setdefault(ch, set()).add(i)
+
+        self._jamo_sorted = sorted((jamo, i) for i, jamo in enumerate(self._jamo))
+        self._jamo_sorted_listed = [item for item in self._jamo_sorted if self._listed[item[1]]]
+
+    @classmethod
+    def from_index(cls, index: CorpIndex) -> "CorpSearchEngine":
+        """CorpIndex로부터 검색 엔진을 만듭니다."""
+        return cls(index.records)
+
+    def _rank_key(self, i: int, match_type: int, query_len: int, similarity: float = 1.0):
+        """정렬 키: 매칭 유형 → 유사도 → 상장 여부 → 이름 길이 차이 → 종목코드"""
+        record = self.records[i]
+        return (
+            match_type,
+            -round(similarity, 2),
+            not self._listed[i],
+            abs(len(self._names[i]) - query_len),
+            record.stock_code or "999999",
+        )
+
+    def _prefix_candidates(self, jamo_query: str, sorted_list: list, limit: Optional[int]) -> List[int]:
+        """자모 기준으로 접두어가 일치하는 항목의 위치를 반환합니다."""
+        found = []
+        pos = bisect_left(sorted_list, (jamo_query, -1))
+        while pos < len(sorted_list) and sorted_list[pos][0].startswith(jamo_query):
+            found.append(sorted_list[pos][1])
+            if limit is not None and len(found) >= limit:
+                break
+            pos += 1
+        return found
+
+    def search(self, query: str, k: int = 5) -> List[CorpMatch]:
+        """
+        회사명을 검색하여 순위가 높은 순서로 최대 k개를 반환합니다.
+
+        Args:
+            query (str): 검색어 (회사명, 약칭, 종목코드 또는 고유번호)
+            k (int): 반환할 최대 결과 수
+
+        Returns:
+            List[CorpMatch]: 검색 결과 목록
+        """
+        q = normalize_name(query.strip())
+        is_alias = q in COMMON_ALIASES
+        if is_alias:
+            q = normalize_name(COMMON_ALIASES[q])
+        if not q:
+            return []
+
+        ranked: Dict[int, tuple] = {}
+
+        def add(i: int, match_type: int, similarity: float = 1.0):
+            key = self._rank_key(i, match_type, len(q), similarity)
+            if i not in ranked or key < ranked[i]:
+                ranked[i] = key
+
+        # 1. 정확 일치
+        for i in self._exact.get(q, []):
+            add(i, MATCH_EXACT)
+
+        # 2. 자모 접두어 일치 (상장 회사는 모두, 전체 목록은 일부만)
+        jamo_query = decompose_jamo(q)
+        for i in self._prefix_candidates(jamo_query, self._jamo_sorted_listed, None):
+            add(i, MATCH_PREFIX)
+        for i in self._prefix_candidates(jamo_query, self._jamo_sorted, PREFIX_SCAN_LIMIT):
+            add(i, MATCH_PREFIX)
+
+        # 3. 포함/약칭: 검색어의 모든 글자를 가진 회사 (역색인 교집합)
+        #    정확히 일치하는 회사가 있으면 건너뜁니다.
+        if len(ranked) < k and q not in self._exact:
+            postings = [self._postings.get(ch) for ch in set(q)]
+            if all(postings):
+                postings.sort(key=len)
+                candidates = postings[0].intersection(*postings[1:])
+                for i in candidates:
+                    name = self._names[i]
+                    if q in name:
+                        add(i, MATCH_CONTAINS)
+                    elif _is_subsequence(q, name):
+                        add(i, MATCH_ABBREVIATION)
+
+        # 4. 퍼지: 글자를 일부 공유하는 회사 중 자모 바이그램 유사도가 높은 회사
+        if not ranked:
+            counts = Counter()
+            for ch in set(q):
+                counts.update(self._postings.get(ch, ()))
+            min_shared = max(1, len(set(q)) - 1)
+            query_bigrams = _bigrams(jamo_query)
+            for i, shared in counts.items():
+                if shared < min_shared:
+                    continue
+                name_bigrams = _bigrams(self._jamo[i])
+                similarity = 2 * len(query_bigrams & name_bigrams) / (len(query_bigrams) + len(name_bigrams))
+                if similarity >= FUZZY_MIN_SIMILARITY:
+                    add(i, MATCH_FUZZY, similarity)
+
+        best = heapq.nsmallest(k, ranked.items(), key=lambda item: item[1])
+        return [
+            CorpMatch(
+                record=self.records[i],
+                match_type=MATCH_ALIAS_NAME if is_alias and key[0] == MATCH_EXACT else MATCH_TYPE_NAMES[key[0]],
+                score=-key[1],
+            )
+            for i, key in best
+        ]
+
+
+# 프로세스 전역 검색 엔진 (최초 사용 시 생성)
+_engine: Optional[CorpSearchEngine] = None
+_engine_index: Optional[CorpIndex] = None
+_engine_lock = threading.Lock()
+
+
+def get_corp_search(api_key: Optional[str] = None) -> CorpSearchEngine:
+    """
+    프로세스 전역 CorpSearchEngine을 반환합니다.
+
+    회사 인덱스가 갱신되면 다음 호출 시 검색 엔진도 새로 만듭니다.
+    """
+    global _engine, _engine_index
+    index = get_corp_index(api_key)
+    if _engine is None or _engine_index is not index:
+        with _engine_lock:
+            if _engine is None or _engine_index is not index:
+                _engine = CorpSearchEngine.from_index(index)
+                _engine_index = index
+    return _engine
+
+
+def search_corp(query: str, k: int = 5, api_key: Optional[str] = None) -> List[CorpMatch]:
+    """
+    회사명/종목코드/고유번호로 회사를 검색합니다.
+
+    6자리 숫자는 종목코드, 8자리 숫자는 고유번호로 먼저 정확히 찾아봅니다.
+    정확히(또는 약칭으로) 일치하는 회사가 없으면 인덱스를 갱신한 뒤 한 번 더 검색합니다.
+    """
+    query = query.strip()
+    matches = _search_corp(query, k, api_key)
+    if _is_miss(matches) and refresh_corp_index_on_miss(api_key):
+        matches = _search_corp(query, k, api_key)
+    return matches
+
+
+def _search_corp(query: str, k: int, api_key: Optional[str]) -> List[CorpMatch]:
+    """현재 인덱스로 회사를 검색합니다."""
+    if query.isdigit() and len(query) in (6, 8):
+        index = get_corp_index(api_key)
+        record = index.find_by_stock_code(query) if len(query) == 6 else index.find_by_corp_code(query)
+        if record is not None:
+            return [CorpMatch(record=record, match_type=MATCH_TYPE_NAMES[MATCH_EXACT], score=1.0)]
+    return get_corp_search(api_key).search(query, k)
+
+
+def _is_miss(matches: List[CorpMatch]) -> bool:
+    """정확히(또는 약칭으로) 일치하는 회사가 없는지 확인합니다."""
+    return not matches or matches[0].match_type not in (MATCH_TYPE_NAMES[MATCH_EXACT], MATCH_ALIAS_NAME)
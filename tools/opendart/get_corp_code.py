@@ -1,7 +1,9 @@
-import dart_fss as dart
 from dotenv import load_dotenv
 import os
 
+from .corp_index import get_corp_index
+from .corp_search import search_corp
+
 # .env 파일 로드
 load_dotenv()
 
@@ -17,12 +19,13 @@ def get_api_key():
 def find_corp_code_by_name(api_key, company_name, exactly=True):
     """회사 이름으로 corp_code를 찾는 함수"""
     try:
-        # dart_fss 라이브러리에 API 키 설정
-        dart.set_api_key(api_key=api_key)
-        
-        # 회사 검색
-        corp_list = dart.get_corp_list()
-        companies = corp_list.find_by_corp_name(company_name, exactly=exactly)
+        # 회사 검색 (로컬 회사 인덱스 사용)
+        corp_index = get_corp_index(api_key)
+        if exactly:
+            companies = corp_index.find_by_name(company_name)
+        else:
+            # 부분/유사 일치는 순위 검색 결과 상위 10개
+            companies = [match.record for match in search_corp(company_name, k=10, api_key=api_key)]
         
         if companies:
             if len(companies) == 1:
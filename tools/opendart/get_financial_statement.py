@@ -1,14 +1,53 @@
 import requests
 import json
 import pandas as pd
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pprint import pprint
 from .get_corp_code import get_api_key, find_corp_code_by_name, find_samsung_corp_code
+from .arrow_ingest import ARROW_INGEST_ENABLED, read_statement_body
+from .client import get_client, response_status
+from .rate_limiter import QuotaExceededError
+from .response_cache import get_response_cache, make_cache_key, ttl_for
+from .statement_schema import apply_statement_schema
+from utils.singleflight import SingleFlight
 
-def get_single_financial_statement(api_key, corp_code, bsns_year="2023", reprt_code="11011", fs_div="CFS"):
-    """OpenDart API를 통해 단일회사 전체 재무제표 정보를 받아오는 함수"""
+# 재무제표 구분 코드 → 이름
+FS_DIV_NAMES = {
+    "CFS": "연결재무제표",
+    "OFS": "개별재무제표",
+}
+
+# 대량 조회 시 동시에 실행할 최대 요청 수
+BULK_MAX_WORKERS = int(os.getenv("DART_BULK_MAX_WORKERS", "8"))
+
+# 동일한 재무제표의 동시 조회/변환 병합
+_statement_flight = SingleFlight()
+
+def get_financial_statement_body(api_key, corp_code, bsns_year="2023", reprt_code="11011", fs_div="CFS",
+                                 use_cache=True):
+    """OpenDart API를 통해 단일회사 전체 재무제표 응답 본문(JSON bytes)을 받아오는 함수
+    
+    use_cache가 True이면 로컬 응답 캐시를 먼저 확인하고, 새로 받은 응답을 캐시에 저장합니다.
+    응답을 파싱하지 않고 그대로 반환하므로 호출 측에서 JSON 또는 Arrow로 바로 읽을 수 있습니다.
     
-    # API 요청 URL
-    url = "https://opendart.fss.or.kr/api/fnlttSinglAcntAll.json"
+    Returns:
+        bytes: 응답 본문 (요청 실패 시 None)
+    """
+    
+    cache = get_response_cache() if use_cache else None
+    cache_key = make_cache_key(corp_code, bsns_year, reprt_code, fs_div)
+    if cache is not None:
+        try:
+            cached = cache.get_payload(cache_key)
+            if cached is not None:
+                return cached
+        except sqlite3.Error as e:
+            print(f"캐시 조회 중 오류 발생: {e}")
+    
+    # API 엔드포인트
+    endpoint = "fnlttSinglAcntAll.json"
     
     # 요청 인자 설정
     params = {
@@ -20,24 +59,89 @@ def get_single_financial_statement(api_key, corp_code, bsns_year="2023", reprt_c
     }
     
     try:
-        # API 요청
-        response = requests.get(url, params=params)
-        response.raise_for_status()  # HTTP 에러 체크
+        # API 요청 (공유 세션 사용, 타임아웃/재시도 포함)
+        body = get_client().get_json_body(endpoint, params=params)
         
-        # JSON 응답 파싱
-        data = response.json()
+        # 캐시 저장 (정상 응답과 "데이터 없음" 응답만)
+        if cache is not None:
+            status = response_status(body)
+            ttl = ttl_for(bsns_year, reprt_code, status)
+            if ttl is not None:
+                try:
+                    cache.put_payload(cache_key, body, status, ttl)
+                except sqlite3.Error as e:
+                    print(f"캐시 저장 중 오류 발생: {e}")
         
-        return data
+        return body
         
     except requests.exceptions.RequestException as e:
         print(f"API 요청 중 오류 발생: {e}")
         return None
-    except json.JSONDecodeError as e:
+    except QuotaExceededError as e:
+        print(f"API 호출 한도 초과: {e}")
+        return None
+
+def _decode_body(body):
+    """응답 본문을 JSON으로 파싱합니다 (실패 시 None)."""
+    try:
+        return json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         print(f"JSON 파싱 오류: {e}")
         return None
 
+def get_single_financial_statement(api_key, corp_code, bsns_year="2023", reprt_code="11011", fs_div="CFS",
+                                   use_cache=True):
+    """OpenDart API를 통해 단일회사 전체 재무제표 정보를 받아오는 함수
+    
+    use_cache가 True이면 로컬 응답 캐시를 먼저 확인하고, 새로 받은 응답을 캐시에 저장합니다.
+    """
+    body = get_financial_statement_body(api_key, corp_code, bsns_year, reprt_code, fs_div, use_cache)
+    if body is None:
+        return None
+    return _decode_body(body)
+
+def _fetch_statement_dataframe(api_key, corp_code, bsns_year, reprt_code, fs_div):
+    """재무제표를 조회하여 (DataFrame, 원본 응답)을 반환합니다.
+    
+    pyarrow를 사용할 수 있으면 응답 본문을 Arrow로 바로 읽고, 이때 원본 응답 대신
+    {"status", "message"} 요약을 반환합니다. Arrow 변환에 실패하면 JSON 경로로 처리합니다.
+    """
+    body = get_financial_statement_body(api_key, corp_code, bsns_year, reprt_code, fs_div)
+    if body is None:
+        return None, None
+    
+    if ARROW_INGEST_ENABLED:
+        try:
+            return read_statement_body(body)
+        except Exception as e:
+            print(f"Arrow 변환 중 오류 발생, JSON으로 다시 변환합니다: {e}")
+    
+    financial_data = _decode_body(body)
+    if not financial_data:
+        return None, None
+    if financial_data.get('status') != '000':
+        return None, financial_data
+    return convert_to_dataframe(financial_data), financial_data
+
+def fetch_statement_dataframe(api_key, corp_code, bsns_year="2023", reprt_code="11011", fs_div="CFS"):
+    """재무제표를 조회하고 DataFrame으로 변환하는 함수
+    
+    같은 재무제표에 대한 조회가 이미 진행 중이면 새로 요청/변환하지 않고
+    그 결과(DataFrame, 원본 응답)를 함께 받습니다. 결과는 호출자마다 복사하여
+    한 세션에서 DataFrame을 수정해도 다른 세션의 데이터에 영향이 없습니다.
+    
+    Returns:
+        tuple: (DataFrame 또는 None, 원본 응답 딕셔너리 또는 None)
+    """
+    key = (api_key, make_cache_key(corp_code, bsns_year, reprt_code, fs_div))
+    df, data = _statement_flight.do(key, _fetch_statement_dataframe, api_key, corp_code, bsns_year, reprt_code, fs_div)
+    return (df.copy() if df is not None else None), (dict(data) if data is not None else None)
+
 def convert_to_dataframe(data):
-    """API 응답 데이터를 DataFrame으로 변환하는 함수"""
+    """API 응답 데이터를 DataFrame으로 변환하는 함수
+    
+    반복되는 구분 값은 category, 금액은 nullable Int64, ord는 Int16으로 변환합니다 (STATEMENT_SCHEMA).
+    """
     
     if not data or 'list' not in data:
         print("변환할 데이터가 없습니다.")
@@ -46,20 +150,7 @@ def convert_to_dataframe(data):
     try:
         # 리스트 데이터를 DataFrame으로 변환
         df = pd.DataFrame(data['list'])
-        
-        # 금액 컬럼들을 숫자 타입으로 변환
-        amount_columns = ['thstrm_amount', 'thstrm_add_amount', 'frmtrm_amount', 
-                         'frmtrm_q_amount', 'frmtrm_add_amount', 'bfefrmtrm_amount']
-        
-        for col in amount_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col].astype(str).str.replace(',', ''), errors='coerce')
-        
-        # ord 컬럼을 숫자 타입으로 변환
-        if 'ord' in df.columns:
-            df['ord'] = pd.to_numeric(df['ord'], errors='coerce')
-        
-        return df
+        return apply_statement_schema(df)
         
     except Exception as e:
         print(f"DataFrame 변환 중 오류 발생: {e}")
@@ -80,13 +171,13 @@ def analyze_financial_statements(df, verbose=True):
         
         # 기본 정보
         print(f"총 데이터 건수: {len(df)}")
-        print(f"재무제표 구분: {df['sj_div'].unique()}")
-        print(f"재무제표명: {df['sj_nm'].unique()}")
+        print(f"재무제표 구분: {df['sj_div'].unique().tolist()}")
+        print(f"재무제표명: {df['sj_nm'].unique().tolist()}")
         print()
         
         # 재무제표별 데이터 수
         print("재무제표별 계정 수:")
-        statement_counts = df.groupby(['sj_div', 'sj_nm']).size()
+        statement_counts = df.groupby(['sj_div', 'sj_nm'], observed=True).size()
         for (div, name), count in statement_counts.items():
             print(f"  {div} ({name}): {count}개 계정")
         print()
@@ -247,8 +338,12 @@ def print_json_output(df, title):
         print("JSON 변환에 실패했습니다.")
 
 def get_financial_statement_for_company(api_key, corp_code, company_name, output_format="dataframe", 
-                                        bsns_year="2023", reprt_code="11011", verbose=True):
-    """특정 회사의 단일회사 전체 재무제표 데이터를 조회하는 함수"""
+                                        bsns_year="2023", reprt_code="11011", verbose=True, fs_div="both"):
+    """특정 회사의 단일회사 전체 재무제표 데이터를 조회하는 함수
+    
+    fs_div가 "CFS" 또는 "OFS"이면 해당 재무제표만 요청/파싱하고,
+    "both"(기본값)이면 연결재무제표와 개별재무제표를 모두 조회합니다.
+    """
     
     if verbose:
         print(f"OpenDart API를 활용한 {company_name} 전체 재무제표 조회")
@@ -256,40 +351,53 @@ def get_financial_statement_for_company(api_key, corp_code, company_name, output
         
         print("\n1. 재무제표 정보 조회 중...")
     
-    # 연결재무제표와 개별재무제표 모두 조회
+    # 요청한 재무제표 구분만 조회 ("both"이면 연결/개별 모두)
     results = {}
-    fs_types = [
-        ("CFS", "연결재무제표"),
-        ("OFS", "개별재무제표")
-    ]
-    
-    for fs_div, fs_name in fs_types:
+    if fs_div == "both":
+        fs_types = list(FS_DIV_NAMES.items())
+    elif fs_div in FS_DIV_NAMES:
+        fs_types = [(fs_div, FS_DIV_NAMES[fs_div])]
+    else:
         if verbose:
+            print(f"알 수 없는 재무제표 구분입니다: {fs_div} (CFS/OFS/both)")
+        return None
+    
+    if verbose:
+        for div, fs_name in fs_types:
             print(f"  - {fs_name} 조회 중...")
             print(f"    요청 인자:")
             print(f"      corp_code: {corp_code}")
             print(f"      bsns_year: {bsns_year}")
             print(f"      reprt_code: {reprt_code} (사업보고서)")
-            print(f"      fs_div: {fs_div} ({fs_name})")
-        
-        financial_data = get_single_financial_statement(api_key, corp_code, bsns_year, reprt_code, fs_div)
+            print(f"      fs_div: {div} ({fs_name})")
+        print()
+    
+    def fetch(div):
+        """단일 재무제표를 조회하고 DataFrame으로 변환합니다 (스레드에서 실행)."""
+        return fetch_statement_dataframe(api_key, corp_code, bsns_year, reprt_code, div)
+    
+    # 여러 재무제표를 요청하는 경우 동시에 요청 (공유 세션의 연결 풀 사용)
+    with ThreadPoolExecutor(max_workers=len(fs_types)) as executor:
+        futures = [(fs_name, executor.submit(fetch, div)) for div, fs_name in fs_types]
+    
+    # 결과는 요청 순서(연결 → 개별)대로 정리
+    for fs_name, future in futures:
+        df, financial_data = future.result()
         
         if financial_data:
-            # DataFrame으로 변환
-            df = convert_to_dataframe(financial_data)
             if df is not None:
                 results[fs_name] = (df, financial_data)
                 if verbose:
-                    print(f"    성공: {len(df)}건의 데이터 조회")
+                    print(f"  - {fs_name} 성공: {len(df)}건의 데이터 조회")
             else:
                 if verbose:
-                    print(f"    실패: DataFrame 변환 오류")
+                    print(f"  - {fs_name} 실패: DataFrame 변환 오류")
         else:
             if verbose:
-                print(f"    실패: API 호출 오류")
-        
-        if verbose:
-            print()
+                print(f"  - {fs_name} 실패: API 호출 오류")
+    
+    if verbose:
+        print()
     
     if not results:
         if verbose:
@@ -342,6 +450,88 @@ def get_financial_statement_for_company(api_key, corp_code, company_name, output
     
     return results
 
+def fetch_financial_statements_bulk(api_key, corp_codes, years, reprt_codes=("11011",), fs_div="CFS",
+                                    max_workers=BULK_MAX_WORKERS, on_result=None, exclude=None):
+    """여러 회사 × 연도 × 보고서 유형의 재무제표를 제한된 워커 풀로 동시에 조회하는 함수
+    
+    Args:
+        api_key (str): OpenDart API 키
+        corp_codes (list): 조회할 corp_code 목록
+        years (list): 조회할 사업연도 목록
+        reprt_codes (list): 조회할 보고서 코드 목록
+        fs_div (str): 재무제표 구분 (CFS/OFS)
+        max_workers (int): 동시에 실행할 최대 요청 수
+        on_result (callable, optional): 항목이 완료될 때마다 호출자 스레드에서 호출되는 콜백
+        exclude (set, optional): 조회하지 않을 (corp_code, bsns_year, reprt_code) 조합
+    
+    Returns:
+        list: 완료 순서대로 정렬된 항목별 결과 딕셔너리 목록
+              {'corp_code', 'bsns_year', 'reprt_code', 'fs_div', 'status', 'df', 'message'}
+    """
+    
+    def fetch(corp_code, bsns_year, reprt_code):
+        """단일 항목을 조회하고 결과 딕셔너리를 만듭니다 (스레드에서 실행)."""
+        item = {
+            'corp_code': corp_code,
+            'bsns_year': bsns_year,
+            'reprt_code': reprt_code,
+            'fs_div': fs_div,
+            'status': 'error',
+            'df': None,
+            'message': '',
+        }
+        df, data = fetch_statement_dataframe(api_key, corp_code, bsns_year, reprt_code, fs_div)
+        if not data:
+            item['message'] = "API 호출 오류"
+        elif data.get('status') != '000':
+            item['message'] = f"{data.get('status')}: {data.get('message', 'N/A')}"
+        else:
+            if df is None:
+                item['message'] = "DataFrame 변환 오류"
+            else:
+                item['status'] = 'success'
+                item['df'] = df
+                item['message'] = f"{len(df)}건"
+        return item
+    
+    exclude = exclude or set()
+    tasks = [(corp_code, str(year), reprt_code)
+             for corp_code in corp_codes
+             for year in years
+             for reprt_code in reprt_codes
+             if (corp_code, str(year), reprt_code) not in exclude]
+    
+    results = []
+    if not tasks:
+        return results
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as executor:
+        futures = {executor.submit(fetch, *task): task for task in tasks}
+        for future in as_completed(futures):
+            try:
+                item = future.result()
+            except Exception as e:
+                corp_code, bsns_year, reprt_code = futures[future]
+                item = {
+                    'corp_code': corp_code,
+                    'bsns_year': bsns_year,
+                    'reprt_code': reprt_code,
+                    'fs_div': fs_div,
+                    'status': 'error',
+                    'df': None,
+                    'message': str(e),
+                }
+            results.append(item)
+            if on_result is not None:
+                # 콜백 오류는 해당 항목의 실패로 기록하고 나머지 항목은 계속 처리
+                try:
+                    on_result(item)
+                except Exception as e:
+                    item['status'] = 'error'
+                    item['message'] = f"결과 처리 오류: {e}"
+    
+    return results
+
 def main(company_name=None, output_format="dataframe", bsns_year="2023", reprt_code="11011", verbose=True):
     """메인 실행 함수"""
     
@@ -0,0 +1,152 @@
+"""
+다중회사 주요계정 조회 모듈 (fnlttMultiAcnt)
+
+한 번의 요청으로 최대 100개 회사의 주요계정(자산총계, 부채총계, 자본총계, 매출액, 영업이익,
+당기순이익 등)을 연결/별도 재무제표 모두 받아옵니다. 시장 전체 스크리닝처럼 많은 회사의
+핵심 지표만 필요할 때 단일회사 전체 재무제표를 회사마다 조회하는 대신 사용합니다.
+"""
+
+import hashlib
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import requests
+
+from .client import get_client, response_status
+from .get_financial_statement import BULK_MAX_WORKERS
+from .rate_limiter import QuotaExceededError
+from .response_cache import get_response_cache, make_cache_key, ttl_for
+from .statement_schema import apply_statement_schema
+
+# fnlttMultiAcnt 한 번에 조회할 수 있는 최대 회사 수
+MULTI_ACCOUNT_BATCH_SIZE = 100
+
+
+def _batch_cache_key(corp_codes: List[str], bsns_year: str, reprt_code: str) -> str:
+    """회사 묶음에 대한 캐시 키를 생성합니다 (회사 순서와 무관)."""
+    digest = hashlib.sha1(",".join(sorted(corp_codes)).encode("ascii")).hexdigest()[:16]
+    return make_cache_key(f"multi:{digest}", bsns_year, reprt_code, "ALL")
+
+
+def get_key_accounts_body(api_key: str, corp_codes: List[str], bsns_year: str = "2023",
+                          reprt_code: str = "11011", use_cache: bool = True) -> Optional[bytes]:
+    """
+    최대 100개 회사의 주요계정 응답 본문(JSON bytes)을 받아옵니다.
+    캐시 정책은 단일회사 전체 재무제표(get_financial_statement_body)와 같습니다.
+
+    Returns:
+        Optional[bytes]: 응답 본문 (요청 실패 시 None)
+    """
+    if len(corp_codes) > MULTI_ACCOUNT_BATCH_SIZE:
+        raise ValueError(f"한 번에 최대 {MULTI_ACCOUNT_BATCH_SIZE}개 회사까지 조회할 수 있습니다.")
+
+    cache = get_response_cache() if use_cache else None
+    cache_key = _batch_cache_key(corp_codes, bsns_year, reprt_code)
+    if cache is not None:
+        try:
+            cached = cache.get_payload(cache_key)
+            if cached is not None:
+                return cached
+        except sqlite3.Error as e:
+            print(f"캐시 조회 중 오류 발생: {e}")
+
+    params = {
+        "crtfc_key": api_key,
+        "corp_code": ",".join(corp_codes),
+        "bsns_year": bsns_year,
+        "reprt_code": reprt_code,
+    }
+    try:
+        body = get_client().get_json_body("fnlttMultiAcnt.json", params=params)
+        if cache is not None:
+            status = response_status(body)
+            ttl = ttl_for(bsns_year, reprt_code, status)
+            if ttl is not None:
+                try:
+                    cache.put_payload(cache_key, body, status, ttl)
+                except sqlite3.Error as e:
+                    print(f"캐시 저장 중 오류 발생: {e}")
+        return body
+
+    except requests.exceptions.RequestException as e:
+        print(f"API 요청 중 오류 발생: {e}")
+        return None
+    except QuotaExceededError as e:
+        print(f"API 호출 한도 초과: {e}")
+        return None
+
+
+def _key_accounts_dataframe(body: bytes, corp_codes: List[str],
+                            stock_to_corp: Dict[str, str]) -> Tuple[Optional[pd.DataFrame], str]:
+    """응답 본문을 주요계정 DataFrame으로 변환합니다. 응답에 corp_code가 없으면 종목코드로 채웁니다."""
+    try:
+        data = json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return None, f"JSON 파싱 오류: {e}"
+    if data.get("status") != "000" or not data.get("list"):
+        return None, f"{data.get('status')}: {data.get('message', 'N/A')}"
+
+    df = apply_statement_schema(pd.DataFrame(data["list"]))
+    if "corp_code" not in df.columns:
+        if "stock_code" not in df.columns:
+            return None, "응답에 회사 식별 정보가 없습니다."
+        df["corp_code"] = df["stock_code"].astype(str).str.strip().map(stock_to_corp)
+    df = df[df["corp_code"].isin(corp_codes)]
+    return df, f"{len(df)}건"
+
+
+def fetch_key_accounts(api_key: str, corp_codes: List[str], bsns_year: str = "2023",
+                       reprt_code: str = "11011", stock_codes: Optional[Dict[str, str]] = None,
+                       max_workers: int = BULK_MAX_WORKERS, on_batch=None) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    여러 회사의 주요계정을 100개씩 묶어 제한된 워커 풀로 동시에 조회합니다.
+
+    Args:
+        api_key (str): OpenDart API 키
+        corp_codes (List[str]): 조회할 corp_code 목록
+        bsns_year (str): 사업연도
+        reprt_code (str): 보고서 코드 (11011: 사업보고서)
+        stock_codes (dict, optional): corp_code → 종목코드 (응답에 corp_code가 없을 때 사용)
+        max_workers (int): 동시에 실행할 최대 요청 수
+        on_batch (callable, optional): 묶음 하나가 끝날 때마다 (DataFrame 또는 None, 결과 딕셔너리)로 호출
+
+    Returns:
+        tuple: (모든 묶음의 주요계정 DataFrame, 묶음별 결과 목록 {'corp_codes', 'status', 'message'})
+    """
+    corp_codes = list(dict.fromkeys(corp_codes))
+    stock_to_corp = {stock: corp for corp, stock in (stock_codes or {}).items() if stock}
+    batches = [corp_codes[i:i + MULTI_ACCOUNT_BATCH_SIZE]
+               for i in range(0, len(corp_codes), MULTI_ACCOUNT_BATCH_SIZE)]
+
+    def fetch(batch):
+        """묶음 하나를 조회하고 변환합니다 (스레드에서 실행)."""
+        body = get_key_accounts_body(api_key, batch, str(bsns_year), reprt_code)
+        if body is None:
+            return None, "API 호출 오류"
+        return _key_accounts_dataframe(body, batch, stock_to_corp)
+
+    frames, results = [], []
+    if not batches:
+        return pd.DataFrame(), results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+        futures = {executor.submit(fetch, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                df, message = future.result()
+            except Exception as e:
+                df, message = None, str(e)
+            result = {'corp_codes': batch, 'status': 'success' if df is not None else 'error', 'message': message}
+            results.append(result)
+            if df is not None:
+                frames.append(df)
+            if on_batch is not None:
+                on_batch(df, result)
+
+    if not frames:
+        return pd.DataFrame(), results
+    return pd.concat(frames, ignore_index=True), results
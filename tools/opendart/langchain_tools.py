@@ -3,15 +3,24 @@ LangChain 도구로 변환된 OpenDart API 함수들 - DataFrame 반환 버전
 """
 
 from langchain.tools import tool
-from typing import Optional, Dict, Any, Tuple
-import dart_fss as dart
+from typing import Optional, Dict, Any, Tuple, List
 from dotenv import load_dotenv
 import os
 import pandas as pd
 
 from .get_corp_code import find_corp_code_by_name
-from .get_financial_statement import get_financial_statement_for_company
+from .corp_index import get_corp_index
+from .corp_search import search_corp
+from .get_financial_statement import (
+    get_financial_statement_for_company,
+    fetch_financial_statements_bulk,
+    FS_DIV_NAMES,
+)
+from .key_accounts import fetch_key_accounts
+from utils.panel import YEARS_PER_REPORT, covering_years
 from utils.data_store import SessionDataStore
+from utils.singleflight import SingleFlight
+from utils.statement_profile import extract_key_items
 
 # .env 파일 로드
 load_dotenv()
@@ -19,6 +28,33 @@ load_dotenv()
 # 전역 데이터 저장소 (OpendartAgent 생성 시 설정됨)
 _global_data_store: Optional[SessionDataStore] = None
 
+# 동일 회사명에 대한 동시 corp_code 검색 병합
+_corp_flight = SingleFlight()
+
+# 보고서 유형 → 보고서 코드
+REPORT_CODE_MAP = {
+    "annual": "11011",
+    "half": "11012",
+    "quarter": "11014",
+    "q1": "11013",
+}
+
+# 재무제표 유형 → 재무제표 구분
+FS_DIV_MAP = {
+    "consolidated": "CFS",
+    "separate": "OFS",
+}
+
+
+def _report_code(report_type: Optional[str]) -> Optional[str]:
+    """보고서 유형을 보고서 코드로 변환합니다 (None이면 사업보고서, 알 수 없는 유형이면 None)."""
+    return REPORT_CODE_MAP.get((report_type or "annual").lower())
+
+
+def _unknown_report_type(report_type: str) -> str:
+    """알 수 없는 보고서 유형에 대한 오류 메시지"""
+    return f"알 수 없는 보고서 유형입니다: '{report_type}' (사용 가능: {', '.join(REPORT_CODE_MAP)})"
+
 
 def set_data_store(data_store: SessionDataStore):
     """OpendartAgent가 사용할 데이터 저장소를 설정합니다."""
@@ -26,6 +62,53 @@ def set_data_store(data_store: SessionDataStore):
     _global_data_store = data_store
 
 
+def make_storage_key(company_name: str, year: str, fs_type: str, report_type: str = "annual") -> str:
+    """
+    SessionDataStore에 저장할 키를 생성합니다 (예: samsung_fs_2023_consolidated).
+    
+    사업보고서(annual)가 아닌 경우 보고서 유형이 키에 포함됩니다
+    (예: samsung_fs_2023_half_consolidated).
+    """
+    key_parts = [company_name.replace(' ', '_').lower(), 'fs', str(year)]
+    if report_type and report_type.lower() != "annual":
+        key_parts.append(report_type.lower())
+    key_parts.append(fs_type)
+    return '_'.join(key_parts)
+
+
+def _store_dataframe(storage_key: str, df: pd.DataFrame,
+                     data_store: Optional[SessionDataStore] = None,
+                     metadata: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    DataFrame을 데이터 저장소(와 전역 저장소)에 저장합니다.
+    metadata(회사명, 재무제표 구분 등)는 저장소의 재무 팩트 테이블에 함께 기록됩니다.
+    
+    Returns:
+        bool: 새로 저장했으면 True, 이미 같은 키가 있으면 False
+    """
+    # 전역 데이터 저장소 사용
+    if data_store is None:
+        data_store = _global_data_store
+    
+    if data_store is None:
+        # 전역 저장소도 없으면 새로 생성
+        data_store = SessionDataStore()
+    
+    # 이미 존재하는 키인지 확인
+    if storage_key in data_store.list_keys():
+        return False
+    
+    # DataFrame 저장
+    data_store.add(storage_key, df, metadata)
+    
+    # 전역 데이터 저장소에도 추가 (중복 확인)
+    if _global_data_store and data_store != _global_data_store:
+        if storage_key not in _global_data_store.list_keys():
+            _global_data_store.add(storage_key, df, metadata)
+    
+    return True
+
+
 def get_api_key():
     """API 키를 가져오는 함수"""
     api_key = os.getenv('DART_API_KEY')
@@ -34,8 +117,28 @@ def get_api_key():
     return api_key
 
 
+def _lookup_corp_code(api_key: str, company_name: str) -> Optional[Dict[str, Any]]:
+    """회사명 순위 검색으로 corp_code를 찾습니다."""
+    matches = search_corp(company_name, k=5, api_key=api_key)
+    if not matches:
+        return None
+    
+    # 가장 순위가 높은 회사 반환
+    best = matches[0]
+    result = {
+        'corp_code': best.record.corp_code,
+        'corp_name': best.record.corp_name,
+        'stock_code': best.record.stock_code,
+        'match_type': best.match_type
+    }
+    # 정확히 일치하지 않은 경우 다른 후보도 함께 알려줌 (약칭 일치는 정확 일치로 봄)
+    if best.match_type not in ("exact", "alias") and len(matches) > 1:
+        result['other_candidates'] = [match.record.corp_name for match in matches[1:]]
+    return result
+
+
 @tool
-def search_corp_code(company_name: str) -> Optional[Dict[str, str]]:
+def search_corp_code(company_name: str) -> Optional[Dict[str, Any]]:
     """
     회사명으로 DART 시스템의 고유번호(corp_code)를 검색합니다.
     
@@ -45,12 +148,15 @@ def search_corp_code(company_name: str) -> Optional[Dict[str, str]]:
     
     Args:
         company_name (str): 검색할 회사명 (예: '삼성전자', '카카오', 'SK하이닉스')
-                           - 정확한 회사명을 입력하면 더 정확한 결과를 얻을 수 있습니다
-                           - 부분 명칭도 가능하나, 여러 결과가 나올 수 있습니다
+                           - "(주)", "주식회사", 공백, 대소문자 차이는 무시됩니다
+                           - 약칭("삼전"), 부분 명칭, 종목코드(6자리)도 검색할 수 있습니다
     
     Returns:
-        Dict[str, str]: 성공 시 {'corp_code': '00126380', 'corp_name': '삼성전자'} 형태의 딕셔너리
-                       실패 시 None
+        Dict[str, Any]: 성공 시 {'corp_code': '00126380', 'corp_name': '삼성전자', 
+                        'stock_code': '005930', 'match_type': 'exact'} 형태의 딕셔너리
+                        (match_type: exact, alias, prefix, contains, abbreviation, fuzzy)
+                        정확히 일치하지 않으면 'other_candidates'에 다른 후보 회사명이 포함됩니다
+                        실패 시 None
     
     Examples:
         - "삼성전자의 고유번호 찾아줘" → search_corp_code("삼성전자")
@@ -60,26 +166,8 @@ def search_corp_code(company_name: str) -> Optional[Dict[str, str]]:
     try:
         api_key = get_api_key()
         
-        # dart_fss 라이브러리에 API 키 설정
-        dart.set_api_key(api_key=api_key)
-        
-        # 회사 검색
-        corp_list = dart.get_corp_list()
-        companies = corp_list.find_by_corp_name(company_name, exactly=True)
-        
-        if not companies:
-            # 정확한 매칭이 없으면 부분 검색 시도
-            companies = corp_list.find_by_corp_name(company_name, exactly=False)
-        
-        if companies:
-            # 첫 번째 결과 반환 (가장 유사한 매칭)
-            selected_corp = companies[0]
-            return {
-                'corp_code': selected_corp.corp_code,
-                'corp_name': selected_corp.corp_name
-            }
-        else:
-            return None
+        # 같은 회사명에 대한 동시 검색은 하나로 병합
+        return _corp_flight.do(company_name, _lookup_corp_code, api_key, company_name)
             
     except Exception as e:
         # print 대신 오류 정보를 반환
@@ -116,23 +204,11 @@ def search_financial_statements_dataframe(
         fs_type = fs_type or "consolidated"
         year = year or "2023"
         
-        # 보고서 코드 매핑
-        report_code_map = {
-            "annual": "11011",
-            "half": "11012",
-            "quarter": "11014",
-            "q1": "11013",
-        }
-        
-        # 재무제표 구분 매핑
-        fs_div_map = {
-            "consolidated": "CFS",
-            "separate": "OFS",
-        }
-        
         # 입력값 변환
-        reprt_code = report_code_map.get(report_type.lower(), "11011")
-        fs_div = fs_div_map.get(fs_type.lower(), "CFS")
+        reprt_code = _report_code(report_type)
+        if reprt_code is None:
+            return None, _unknown_report_type(report_type)
+        fs_div = FS_DIV_MAP.get(fs_type.lower(), "CFS")
         
         # 1. corp_code 찾기
         corp_info = search_corp_code(company_name)
@@ -156,59 +232,40 @@ def search_financial_statements_dataframe(
             output_format="dataframe",
             bsns_year=year,
             reprt_code=reprt_code,
-            verbose=False  # verbose=False로 설정하여 상세 출력 억제
+            verbose=False,  # verbose=False로 설정하여 상세 출력 억제
+            fs_div=fs_div  # 요청한 재무제표 구분만 조회
         )
         
         if not results:
             return None, f"'{actual_company_name}'의 {year}년 재무제표를 찾을 수 없습니다."
         
-        # 3. 적절한 DataFrame 선택
+        # 3. 요청한 재무제표 구분의 DataFrame 선택
         selected_df = None
-        for fs_name, (df, raw_data) in results.items():
-            if "연결" in fs_name and fs_type == "consolidated":
-                selected_df = df
-                break
-            elif "개별" in fs_name and fs_type == "separate":
-                selected_df = df
-                break
+        if FS_DIV_NAMES[fs_div] in results:
+            selected_df, _ = results[FS_DIV_NAMES[fs_div]]
         
         if selected_df is None:
             return None, f"요청한 재무제표 유형 '{fs_type}'을 찾을 수 없습니다."
         
         # 4. SessionDataStore에 저장
         if save_to_store:
-            # 전역 데이터 저장소 사용
-            if data_store is None:
-                data_store = _global_data_store
-            
-            if data_store is None:
-                # 전역 저장소도 없으면 새로 생성
-                data_store = SessionDataStore()
-            
             # 키 생성 (예: samsung_fs_2023_consolidated)
-            key_parts = [
-                actual_company_name.replace(' ', '_').lower(),
-                'fs',
-                year,
-                fs_type
-            ]
-            storage_key = '_'.join(key_parts)
+            storage_key = make_storage_key(actual_company_name, year, fs_type, report_type)
             
-            # 이미 존재하는 키인지 확인
-            existing_keys = data_store.list_keys()
-            if storage_key not in existing_keys:
-                # DataFrame 저장
-                data_store.add(storage_key, selected_df)
-                
-                # 전역 데이터 저장소에도 추가 (중복 확인)
-                if _global_data_store and data_store != _global_data_store:
-                    global_keys = _global_data_store.list_keys()
-                    if storage_key not in global_keys:
-                        _global_data_store.add(storage_key, selected_df)
-                
+            metadata = {
+                'corp_code': corp_code,
+                'corp_name': actual_company_name,
+                'bsns_year': year,
+                'reprt_code': reprt_code,
+                'fs_div': fs_div,
+            }
+            if _store_dataframe(storage_key, selected_df, data_store, metadata):
                 message = f"'{actual_company_name}'의 {year}년 {fs_type} 재무제표를 조회하여 '{storage_key}' 키로 저장했습니다."
             else:
                 message = f"'{actual_company_name}'의 {year}년 {fs_type} 재무제표가 이미 '{storage_key}' 키로 저장되어 있습니다."
+                store = data_store if data_store is not None else _global_data_store
+                if store is not None and storage_key in store.list_keys():
+                    selected_df = store.get(storage_key)
         else:
             message = f"'{actual_company_name}'의 {year}년 {fs_type} 재무제표를 조회했습니다."
         
@@ -291,8 +348,12 @@ def search_financial_statements(
             }
         }
     else:
-        # 기본: 주요 항목 요약 반환
-        key_items = extract_key_financial_items(df)
+        # 기본: 주요 항목 요약 반환 (저장된 DataFrame이면 저장 시점에 계산된 요약 사용)
+        storage_key = _global_data_store.find_key(df) if _global_data_store is not None else None
+        if storage_key is not None:
+            key_items = _global_data_store.profile(storage_key).key_items
+        else:
+            key_items = extract_key_financial_items(df)
         
         # 금액을 억원 단위로 변환
         formatted_items = {}
@@ -315,35 +376,240 @@ def search_financial_statements(
         }
 
 
-def extract_key_financial_items(df):
-    """DataFrame에서 주요 재무 항목을 추출하는 헬퍼 함수"""
-    key_items = {}
+@tool
+def search_financial_statements_bulk(
+    company_names: List[str],
+    years: List[str],
+    report_types: Optional[List[str]] = None,
+    fs_type: Optional[str] = "consolidated",
+    use_prior_periods: Optional[bool] = False
+) -> Dict[str, Any]:
+    """
+    여러 회사 × 여러 연도 × 여러 보고서 유형의 재무제표를 한 번에 조회하여 저장합니다.
     
-    if df is None or df.empty:
-        return key_items
+    "이 30개 회사의 최근 5년" 같은 요청을 search_financial_statements를 반복 호출하지 않고
+    한 번의 도구 호출로 처리합니다. 요청들은 제한된 워커 풀에서 동시에 실행되며,
+    조회가 끝나는 대로 SessionDataStore에 저장됩니다. 이미 저장된 데이터는 다시 조회하지 않습니다.
     
-    # 재무상태표 항목
-    bs_items = ['자산총계', '부채총계', '자본총계', '유동자산', '비유동자산']
+    Args:
+        company_names (List[str]): 조회할 회사명 목록 (예: ['삼성전자', 'SK하이닉스'])
+        years (List[str]): 조회할 사업연도 목록 (예: ['2022', '2023', '2024'])
+        report_types (List[str], optional): 보고서 유형 목록. 기본값은 ['annual']
+                                            - "annual", "half", "quarter", "q1"
+        fs_type (str, optional): 재무제표 유형. 기본값은 "consolidated"
+                               - "consolidated": 연결재무제표
+                               - "separate": 별도재무제표
+        use_prior_periods (bool, optional): 다년도 추세 분석용. True이면 사업보고서의 당기/전기/전전기 금액을
+                                            활용하여 3년마다 한 건만 조회합니다 (5년 추세도 2건으로 조회).
+                                            보고서 유형이 사업보고서(annual)뿐일 때만 적용됩니다.
     
-    # 손익계산서 항목  
-    is_items = ['매출액', '매출총이익', '영업이익', '당기순이익']
+    Returns:
+        Dict[str, Any]: 전체 요약과 항목별 성공/실패 결과
+                        (use_prior_periods이면 항목별로 포함하는 회계연도 'covers'가 추가됩니다)
     
-    # 재무상태표 데이터 추출
-    bs_data = df[df['sj_div'] == 'BS']
-    for item in bs_items:
-        item_data = bs_data[bs_data['account_nm'].str.contains(item, na=False)]
-        if not item_data.empty and 'thstrm_amount' in item_data.columns:
-            amount = item_data['thstrm_amount'].iloc[0]
-            if pd.notna(amount):
-                key_items[item] = int(amount)
+    Examples:
+        - "삼성전자, LG전자 최근 3년 재무제표 가져와줘"
+          → search_financial_statements_bulk(["삼성전자", "LG전자"], ["2022", "2023", "2024"])
+        - "삼성전자 최근 5년 매출 추세 알려줘"
+          → search_financial_statements_bulk(["삼성전자"], ["2020", "2021", "2022", "2023", "2024"], use_prior_periods=True)
+    """
+    try:
+        api_key = get_api_key()
+        
+        report_types = report_types or ["annual"]
+        fs_type = fs_type or "consolidated"
+        fs_div = FS_DIV_MAP.get(fs_type.lower(), "CFS")
+        unknown = [rt for rt in report_types if _report_code(rt) is None]
+        if unknown:
+            return {
+                'status': 'error',
+                'message': _unknown_report_type(unknown[0])
+            }
+        code_to_report_type = {_report_code(rt): rt.lower() for rt in report_types}
+        years = [str(year) for year in years]
+        
+        # 사업보고서 한 건이 3개 회계연도(당기/전기/전전기)를 포함하므로 필요한 사업연도만 조회
+        covers = {}
+        if use_prior_periods and set(code_to_report_type) == {"11011"}:
+            requested_years = set(years)
+            years = covering_years(years)
+            covers = {
+                year: [str(y) for y in range(int(year) - YEARS_PER_REPORT + 1, int(year) + 1) if str(y) in requested_years]
+                for year in years
+            }
+        
+        items = []
+        
+        # 1. corp_code 찾기
+        corp_names = {}
+        for company_name in company_names:
+            corp_info = search_corp_code(company_name)
+            if not corp_info:
+                items.append({
+                    'company_name': company_name,
+                    'status': 'error',
+                    'message': "기업 코드를 찾을 수 없습니다."
+                })
+                continue
+            corp_names[corp_info['corp_code']] = corp_info['corp_name']
+        
+        # 2. 이미 저장된 항목은 제외
+        store = _global_data_store
+        existing_keys = set(store.list_keys()) if store is not None else set()
+        cached = set()
+        for corp_code, corp_name in corp_names.items():
+            for year in years:
+                for reprt_code, report_type in code_to_report_type.items():
+                    storage_key = make_storage_key(corp_name, year, fs_type, report_type)
+                    if storage_key in existing_keys:
+                        items.append({
+                            'company_name': corp_name,
+                            'year': year,
+                            'report_type': report_type,
+                            'status': 'cached',
+                            'key': storage_key
+                        })
+                        if year in covers:
+                            items[-1]['covers'] = covers[year]
+                        cached.add((corp_code, year, reprt_code))
+        
+        # 3. 조회가 끝나는 대로 저장
+        def on_result(item):
+            corp_name = corp_names[item['corp_code']]
+            report_type = code_to_report_type[item['reprt_code']]
+            entry = {
+                'company_name': corp_name,
+                'year': item['bsns_year'],
+                'report_type': report_type,
+                'status': item['status'],
+            }
+            if item['status'] == 'success':
+                storage_key = make_storage_key(corp_name, item['bsns_year'], fs_type, report_type)
+                metadata = {
+                    'corp_code': item['corp_code'],
+                    'corp_name': corp_name,
+                    'bsns_year': item['bsns_year'],
+                    'reprt_code': item['reprt_code'],
+                    'fs_div': item['fs_div'],
+                }
+                # 한 항목의 저장 실패가 나머지 항목의 저장을 막지 않도록 항목별로 오류를 기록
+                try:
+                    _store_dataframe(storage_key, item['df'], metadata=metadata)
+                except Exception as e:
+                    entry['status'] = 'error'
+                    entry['message'] = f"저장 중 오류 발생: {e}"
+                else:
+                    entry['key'] = storage_key
+                    if item['bsns_year'] in covers:
+                        entry['covers'] = covers[item['bsns_year']]
+            else:
+                entry['message'] = item['message']
+            items.append(entry)
+        
+        fetch_financial_statements_bulk(
+            api_key,
+            list(corp_names),
+            years,
+            list(code_to_report_type),
+            fs_div=fs_div,
+            on_result=on_result,
+            exclude=cached
+        )
+        
+        succeeded = sum(1 for item in items if item['status'] in ('success', 'cached'))
+        return {
+            'status': 'success' if succeeded else 'error',
+            'message': f"총 {len(items)}건 중 {succeeded}건 조회 완료, {len(items) - succeeded}건 실패",
+            'results': items
+        }
+        
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': f"대량 재무제표 조회 중 오류 발생: {e}"
+        }
+
+
+@tool
+def load_screening_universe(
+    year: Optional[str] = "2023",
+    company_names: Optional[List[str]] = None,
+    report_type: Optional[str] = "annual"
+) -> Dict[str, Any]:
+    """
+    여러 회사(기본값: 모든 상장회사)의 주요계정을 다중회사 주요계정 API로 한 번에 조회하여
+    스크리닝 테이블에 저장합니다. "영업이익률 15% 이상인 회사 찾아줘"처럼 시장 전체나 많은 회사를
+    조건으로 거르는 요청에 사용합니다. 100개 회사를 한 번의 API 요청으로 조회합니다.
     
-    # 손익계산서 데이터 추출
-    is_data = df[df['sj_div'] == 'IS']
-    for item in is_items:
-        item_data = is_data[is_data['account_nm'].str.contains(item, na=False)]
-        if not item_data.empty and 'thstrm_amount' in item_data.columns:
-            amount = item_data['thstrm_amount'].iloc[0]
-            if pd.notna(amount):
-                key_items[item] = int(amount)
+    주요계정: 자산총계, 유동자산, 부채총계, 유동부채, 자본총계, 매출액, 영업이익, 당기순이익 등
+    (KOSPI/KOSDAQ 시장 구분 정보는 없으므로 상장회사 전체를 대상으로 합니다.)
     
-    return key_items 
+    Args:
+        year (str, optional): 사업연도. 기본값은 "2023"
+        company_names (List[str], optional): 대상 회사명 목록. 없으면 모든 상장회사
+        report_type (str, optional): 보고서 유형 ("annual", "half", "quarter", "q1"). 기본값은 "annual"
+    
+    Returns:
+        Dict[str, Any]: 조회한 회사 수, 저장된 행 수, 실패한 묶음 수
+    
+    Examples:
+        - "2023년 영업이익률 15% 이상, 부채비율 100% 미만인 상장사 찾아줘"
+          → load_screening_universe(year="2023")
+    """
+    try:
+        api_key = get_api_key()
+        year = str(year or "2023")
+        reprt_code = _report_code(report_type)
+        if reprt_code is None:
+            return {'status': 'error', 'message': _unknown_report_type(report_type)}
+        
+        # 1. 대상 회사 목록 (corp_code → 회사명, 종목코드)
+        if company_names:
+            records = {}
+            for company_name in company_names:
+                corp_info = search_corp_code(company_name)
+                if corp_info:
+                    records[corp_info['corp_code']] = (corp_info['corp_name'], corp_info.get('stock_code', ''))
+        else:
+            records = {
+                record.corp_code: (record.corp_name, record.stock_code)
+                for record in get_corp_index(api_key).records
+                if record.is_listed
+            }
+        if not records:
+            return {'status': 'error', 'message': "조회할 회사를 찾을 수 없습니다."}
+        
+        corp_names = {code: name for code, (name, _) in records.items()}
+        stock_codes = {code: stock for code, (_, stock) in records.items()}
+        
+        # 2. 묶음이 끝나는 대로 스크리닝 테이블에 저장
+        store = _global_data_store
+        loaded = []
+        
+        def on_batch(df, result):
+            if df is not None and store is not None:
+                loaded.append(store.screening.load_key_accounts(df, corp_names, stock_codes))
+        
+        _, results = fetch_key_accounts(api_key, list(records), year, reprt_code,
+                                        stock_codes=stock_codes, on_batch=on_batch)
+        failed = [result['message'] for result in results if result['status'] != 'success']
+        
+        return {
+            'status': 'success' if loaded else 'error',
+            'message': f"{len(records)}개 회사의 {year}년 주요계정을 조회하여 스크리닝 테이블에 {sum(loaded)}행을 저장했습니다.",
+            'companies': len(records),
+            'rows': sum(loaded),
+            'failed_batches': len(failed),
+            'errors': failed[:5],
+        }
+        
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': f"주요계정 조회 중 오류 발생: {e}"
+        }
+
+
+def extract_key_financial_items(df):
+    """DataFrame에서 주요 재무 항목을 추출하는 헬퍼 함수"""
+    return extract_key_items(df)
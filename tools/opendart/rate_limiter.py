@@ -0,0 +1,277 @@
+"""
+OpenDart API 호출 속도 제한 모듈
+
+API 키별로 토큰 버킷 속도 제한과 일일 호출 횟수 집계를 제공합니다.
+OpenDart가 사용한도 초과(status 020)를 반환하면 호출 속도를 자동으로 낮추고,
+이후 정상 응답이 이어지면 점차 원래 속도로 회복합니다.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date
+from typing import Dict, Optional
+
+from resources.config import get_cache_dir
+
+try:
+    import fcntl  # 여러 프로세스의 호출 횟수를 합칠 때 파일 잠금 (Windows에는 없음)
+except ImportError:
+    fcntl = None
+
+# 속도 제한 설정 (환경 변수로 재정의 가능)
+RATE_PER_SEC = float(os.getenv("DART_RATE_PER_SEC", "10"))
+RATE_BURST = int(os.getenv("DART_RATE_BURST", "10"))
+RATE_MIN_PER_SEC = float(os.getenv("DART_RATE_MIN_PER_SEC", "0.5"))
+DAILY_LIMIT = int(os.getenv("DART_DAILY_LIMIT", "20000"))
+
+# 일일 호출 횟수를 파일에 기록하는 주기 (호출 수 또는 초 중 먼저 도달하는 쪽)
+QUOTA_FLUSH_CALLS = int(os.getenv("DART_QUOTA_FLUSH_CALLS", "50"))
+QUOTA_FLUSH_SECONDS = float(os.getenv("DART_QUOTA_FLUSH_SECONDS", "5"))
+# 남은 호출이 이보다 적으면 매 호출마다 기록하여 다른 프로세스의 사용량을 바로 반영
+QUOTA_SYNC_MARGIN = int(os.getenv("DART_QUOTA_SYNC_MARGIN", "500"))
+
+# 사용한도 초과 시 속도를 줄이는 비율과 회복 설정
+BACKOFF_FACTOR = 0.5
+RECOVERY_STEP = 0.1  # 회복 시 최대 속도 대비 증가 비율
+RECOVERY_AFTER = 20  # 연속 정상 응답이 이 횟수만큼 쌓이면 한 단계 회복
+
+# OpenDart 사용한도 초과 상태 코드
+STATUS_RATE_EXCEEDED = "020"
+# 정상 응답으로 보는 상태 코드 (000: 정상, 013: 조회된 데이터 없음)
+STATUS_OK = ("000", "013")
+
+
+class QuotaExceededError(RuntimeError):
+    """일일 호출 한도를 모두 사용한 경우 발생하는 예외"""
+
+
+class TokenBucket:
+    """스레드 안전한 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate (float): 초당 채워지는 토큰 수
+            burst (int): 버킷의 최대 토큰 수
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """경과 시간만큼 토큰을 채웁니다 (락을 잡은 상태에서 호출)."""
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰을 얻을 때까지 대기합니다."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def set_rate(self, rate: float):
+        """채워지는 속도를 변경합니다."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def drain(self):
+        """남은 토큰을 모두 비웁니다 (사용한도 초과 직후 버스트 방지)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = 0.0
+
+
+class DailyQuota:
+    """
+    API 키별 일일 호출 횟수를 파일에 기록하는 카운터.
+
+    API 키는 해시로만 저장되며, 날짜가 바뀌면 카운트가 초기화됩니다.
+    호출마다 파일을 다시 쓰지 않고 QUOTA_FLUSH_CALLS회 또는 QUOTA_FLUSH_SECONDS초마다
+    아직 기록하지 않은 호출 수를 파일 잠금 아래에서 파일의 카운트에 더하므로,
+    같은 API 키를 사용하는 여러 프로세스의 호출 횟수가 합쳐집니다.
+    """
+
+    def __init__(self, api_key: str, limit: int = DAILY_LIMIT, path: Optional[str] = None):
+        """
+        Args:
+            api_key (str): OpenDart API 키
+            limit (int): 일일 최대 호출 횟수
+            path (str, optional): 카운터를 저장할 파일 경로
+        """
+        self.key_id = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        self.limit = limit
+        self.path = path or os.path.join(get_cache_dir(), "dart_quota.json")
+        self._lock = threading.Lock()
+        self._day, self._count = self._load()
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        atexit.register(self.flush)
+
+    def _read_all(self) -> Dict[str, Dict]:
+        """카운터 파일 전체를 읽습니다."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load(self):
+        """이 API 키의 오늘 카운트를 읽어옵니다."""
+        entry = self._read_all().get(self.key_id, {})
+        today = date.today().isoformat()
+        if entry.get("date") != today:
+            return today, 0
+        return today, int(entry.get("count", 0))
+
+    def _sync(self):
+        """
+        기록하지 않은 호출 수를 파일의 카운트에 더하고, 다른 프로세스의 호출까지 합친
+        카운트를 다시 읽어옵니다 (락을 잡은 상태에서 호출).
+        """
+        self._synced_at = time.monotonic()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(f"{self.path}.lock", "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                data = self._read_all()
+                entry = data.get(self.key_id, {})
+                count = int(entry.get("count", 0)) if entry.get("date") == self._day else 0
+                count += self._unsynced
+                data[self.key_id] = {"date": self._day, "count": count}
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+        except OSError:
+            # 기록 실패는 호출 자체를 막지 않습니다 (다음 기록 때 다시 더함).
+            return
+        self._count = count
+        self._unsynced = 0
+
+    def flush(self):
+        """기록하지 않은 호출 수를 파일에 기록합니다 (프로세스 종료 시 자동으로 호출)."""
+        with self._lock:
+            if self._unsynced:
+                self._sync()
+
+    def consume(self):
+        """
+        호출 1회를 기록합니다.
+
+        Raises:
+            QuotaExceededError: 오늘의 호출 한도를 이미 모두 사용한 경우
+        """
+        with self._lock:
+            today = date.today().isoformat()
+            if today != self._day:
+                if self._unsynced:
+                    self._sync()
+                self._day, self._count, self._unsynced = today, 0, 0
+            if self._count >= self.limit:
+                raise QuotaExceededError(
+                    f"OpenDart 일일 호출 한도({self.limit:,}회)를 모두 사용했습니다."
+                )
+            self._count += 1
+            self._unsynced += 1
+            if (self._unsynced >= QUOTA_FLUSH_CALLS
+                    or self.limit - self._count < QUOTA_SYNC_MARGIN
+                    or time.monotonic() - self._synced_at >= QUOTA_FLUSH_SECONDS):
+                self._sync()
+
+    @property
+    def used(self) -> int:
+        """오늘 사용한 호출 횟수"""
+        return self._count
+
+    @property
+    def remaining(self) -> int:
+        """오늘 남은 호출 횟수"""
+        return max(0, self.limit - self._count)
+
+
+class RateLimiter:
+    """
+    API 키 하나에 대한 적응형 속도 제한기.
+
+    모든 OpenDart 호출 전에 acquire()를, 응답을 받은 후 report()를 호출합니다.
+    """
+
+    def __init__(self, api_key: str, rate: float = RATE_PER_SEC, burst: int = RATE_BURST,
+                 daily_limit: int = DAILY_LIMIT, min_rate: float = RATE_MIN_PER_SEC):
+        """
+        Args:
+            api_key (str): OpenDart API 키
+            rate (float): 최대 초당 호출 수
+            burst (int): 순간적으로 허용할 최대 호출 수
+            daily_limit (int): 일일 최대 호출 횟수
+            min_rate (float): 사용한도 초과 시 낮출 수 있는 최저 초당 호출 수
+        """
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.bucket = TokenBucket(rate, burst)
+        self.quota = DailyQuota(api_key, daily_limit)
+        self._lock = threading.Lock()
+        self._successes = 0
+
+    @property
+    def rate(self) -> float:
+        """현재 적용 중인 초당 호출 수"""
+        return self.bucket.rate
+
+    def acquire(self):
+        """호출 가능할 때까지 대기한 뒤 일일 호출 횟수를 1 증가시킵니다."""
+        self.bucket.acquire()
+        self.quota.consume()
+
+    def report(self, status: Optional[str]):
+        """
+        응답 상태 코드를 받아 호출 속도를 조정합니다.
+        정상 응답(000, 013)만 회복 횟수에 포함하며, 그 밖의 오류 응답은 연속 정상 응답을 끊습니다.
+        """
+        with self._lock:
+            if status == STATUS_RATE_EXCEEDED:
+                self._successes = 0
+                self.bucket.set_rate(max(self.min_rate, self.bucket.rate * BACKOFF_FACTOR))
+                self.bucket.drain()
+                return
+            if status not in STATUS_OK:
+                self._successes = 0
+                return
+
+            if self.bucket.rate >= self.max_rate:
+                return
+            self._successes += 1
+            if self._successes >= RECOVERY_AFTER:
+                self._successes = 0
+                self.bucket.set_rate(min(self.max_rate, self.bucket.rate + self.max_rate * RECOVERY_STEP))
+
+
+# API 키별 프로세스 전역 속도 제한기
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(api_key: str) -> RateLimiter:
+    """API 키에 해당하는 프로세스 전역 RateLimiter를 반환합니다."""
+    limiter = _limiters.get(api_key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(api_key)
+            if limiter is None:
+                limiter = RateLimiter(api_key)
+                _limiters[api_key] = limiter
+    return limiter
@@ -0,0 +1,187 @@
+"""
+OpenDart 재무제표 응답 영구 캐시 모듈
+
+(corp_code, bsns_year, reprt_code, fs_div) 단위로 API 응답을 압축하여 SQLite 파일에 저장합니다.
+종료된 사업연도의 보고서는 오래, 당해 연도 보고서는 짧게 보관하며,
+"조회된 데이터 없음"(status 013) 응답도 짧은 기간 동안 캐시합니다.
+전체 크기가 한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date
+from typing import Any, Dict, Optional
+
+from resources.config import get_cache_dir
+
+# 캐시 설정 (환경 변수로 재정의 가능)
+CACHE_ENABLED = os.getenv("DART_RESPONSE_CACHE", "1") != "0"
+CACHE_MAX_BYTES = int(os.getenv("DART_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+DAY = 24 * 60 * 60
+
+# 종료된 사업연도의 보고서 유형별 보관 기간 (정정공시 가능성을 고려)
+CLOSED_YEAR_TTL = {
+    "11011": 365 * DAY,  # 사업보고서
+    "11012": 180 * DAY,  # 반기보고서
+    "11013": 180 * DAY,  # 1분기보고서
+    "11014": 180 * DAY,  # 3분기보고서
+}
+# 당해 연도(아직 공시가 진행 중인) 보고서 보관 기간
+CURRENT_YEAR_TTL = 6 * 60 * 60
+# 조회된 데이터가 없는 경우(status 013) 보관 기간
+NO_DATA_TTL = DAY
+
+STATUS_OK = "000"
+STATUS_NO_DATA = "013"
+
+
+def make_cache_key(corp_code: str, bsns_year: str, reprt_code: str, fs_div: str) -> str:
+    """캐시 키를 생성합니다."""
+    return f"{corp_code}:{bsns_year}:{reprt_code}:{fs_div}"
+
+
+def ttl_for(bsns_year: str, reprt_code: str, status: Optional[str]) -> Optional[int]:
+    """
+    응답의 보관 기간(초)을 계산합니다.
+
+    Returns:
+        Optional[int]: 보관 기간. 캐시하지 않아야 하는 응답이면 None
+    """
+    if status == STATUS_NO_DATA:
+        return NO_DATA_TTL
+    if status != STATUS_OK:
+        return None
+    try:
+        year = int(bsns_year)
+    except (TypeError, ValueError):
+        return CURRENT_YEAR_TTL
+    if year < date.today().year:
+        return CLOSED_YEAR_TTL.get(reprt_code, 180 * DAY)
+    return CURRENT_YEAR_TTL
+
+
+class ResponseCache:
+    """
+    압축된 API 응답을 저장하는 SQLite 기반 캐시.
+
+    여러 스레드에서 동시에 사용할 수 있도록 하나의 연결을 락으로 보호합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = CACHE_MAX_BYTES):
+        """
+        Args:
+            path (str, optional): SQLite 파일 경로
+            max_bytes (int): 압축된 응답의 최대 총 크기
+        """
+        self.path = path or os.path.join(get_cache_dir(), "dart_responses.sqlite")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status TEXT,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._conn.commit()
+
+    def get_payload(self, key: str) -> Optional[bytes]:
+        """만료되지 않은 응답 본문(JSON 바이트)을 반환합니다."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            payload, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return zlib.decompress(payload)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """만료되지 않은 응답을 파싱하여 반환합니다."""
+        payload = self.get_payload(key)
+        return json.loads(payload) if payload is not None else None
+
+    def put_payload(self, key: str, payload: bytes, status: Optional[str], ttl: int):
+        """응답 본문(JSON 바이트)을 압축하여 저장합니다."""
+        compressed = zlib.compress(payload, 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, status, payload, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, status, compressed, len(compressed), now + ttl, now),
+            )
+            self._conn.commit()
+            self._evict()
+
+    def put(self, key: str, data: Dict[str, Any], ttl: int):
+        """파싱된 응답을 저장합니다."""
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.put_payload(key, payload, data.get("status"), ttl)
+
+    def _evict(self):
+        """만료 항목을 지우고, 총 크기가 한도를 넘으면 오래 사용하지 않은 항목부터 제거합니다."""
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_bytes:
+            # 한도의 90%까지 줄여서 매번 제거가 반복되지 않도록 합니다.
+            target = int(self.max_bytes * 0.9)
+            for key, size in self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at"
+            ).fetchall():
+                if total <= target:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+        self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 항목 수와 압축된 총 크기를 반환합니다."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        """모든 캐시 항목을 삭제합니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+# 프로세스 전역 캐시 (최초 사용 시 생성)
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """프로세스 전역 ResponseCache를 반환합니다 (비활성화된 경우 None)."""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
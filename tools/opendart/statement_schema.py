@@ -0,0 +1,65 @@
+"""
+단일회사 전체 재무제표(fnlttSinglAcntAll) 응답의 컬럼 타입 정의 모듈
+
+- category: 행마다 반복되는 구분/기간명 값 (메모리 절약, 비교 필터링 가속)
+- amount: 콤마를 제거하고 정확한 정수로 파싱 (nullable Int64)
+- 그 외: pandas nullable 정수 타입
+"""
+
+import numpy as np
+import pandas as pd
+
+AMOUNT_COLUMNS = ['thstrm_amount', 'thstrm_add_amount', 'frmtrm_amount',
+                  'frmtrm_q_amount', 'frmtrm_add_amount', 'bfefrmtrm_amount']
+
+STATEMENT_SCHEMA = {
+    'rcept_no': 'category',
+    'reprt_code': 'category',
+    'bsns_year': 'category',
+    'corp_code': 'category',
+    'sj_div': 'category',
+    'sj_nm': 'category',
+    'account_id': 'category',
+    'account_detail': 'category',
+    'thstrm_nm': 'category',
+    'frmtrm_nm': 'category',
+    'frmtrm_q_nm': 'category',
+    'bfefrmtrm_nm': 'category',
+    'currency': 'category',
+    'ord': 'Int16',
+    **{col: 'amount' for col in AMOUNT_COLUMNS},
+}
+
+# 금액으로 인정하는 문자열 (콤마 제거 후)
+AMOUNT_PATTERN = r'\s*-?\d+\s*'
+
+
+def parse_amounts(values: pd.Series) -> pd.arrays.IntegerArray:
+    """
+    금액 문자열 컬럼을 nullable Int64로 정확하게 변환합니다.
+
+    float64를 거치지 않고 정수로 바로 파싱하므로 2^53원을 넘는 금액도 손실 없이 유지됩니다.
+    빈 값, "-" 등 정수가 아닌 값은 결측(<NA>)으로 처리합니다.
+    """
+    values = values.astype(object)
+    if values.str.contains(',', regex=False, na=False).any():
+        values = values.str.replace(',', '', regex=False)
+    valid = values.str.fullmatch(AMOUNT_PATTERN).fillna(False).to_numpy(dtype=bool)
+    parsed = np.zeros(len(values), dtype=np.int64)
+    if valid.any():
+        parsed[valid] = values[valid].astype(np.int64).to_numpy()
+    return pd.arrays.IntegerArray(parsed, ~valid)
+
+
+def apply_statement_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """STATEMENT_SCHEMA에 따라 재무제표 DataFrame의 컬럼 타입을 지정합니다."""
+    for col, dtype in STATEMENT_SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if dtype == "amount":
+            df[col] = parse_amounts(df[col])
+        elif dtype == "category":
+            df[col] = df[col].astype("category")
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
+    return df
@@ -0,0 +1,167 @@
+"""
+재무제표 DataFrame별 계정 조회 인덱스 모듈
+
+계정명(정규화)과 account_id를 행 위치로 매핑하는 역색인을 DataFrame마다 한 번 만들어 두고,
+지표 조회를 문자열 검색(str.contains) 반복 대신 딕셔너리 조회로 처리합니다.
+유사 계정명(ACCOUNT_NAME_MAPPINGS) 대체 결과도 인덱스 생성 시 미리 계산합니다.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+# 계정명 매핑 테이블 (유사한 의미의 계정명들)
+ACCOUNT_NAME_MAPPINGS = {
+    '매출액': ['매출액', '영업수익', '순매출액', '총매출액', '매출'],
+    '매출원가': ['매출원가', '영업비용', '판매원가'],
+    '매출총이익': ['매출총이익', '매출총손익', '영업총이익'],
+    '영업이익': ['영업이익', '영업손익', '영업이익(손실)'],
+    '당기순이익': ['당기순이익', '당기순손익', '순이익', '당기순이익(손실)'],
+    '자산총계': ['자산총계', '총자산', '자산합계'],
+    '부채총계': ['부채총계', '총부채', '부채합계'],
+    '자본총계': ['자본총계', '총자본', '자본합계', '순자산'],
+}
+
+# 계정명 앞의 번호 표기 ("Ⅰ.", "1.", "(1)", "가." 등)
+_ENUMERATION_PATTERN = re.compile(r"^\s*(?:[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ]+|[IVX]+|\d+|[가-하])\s*[\.\)]\s*|^\s*\(\d+\)\s*")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_account_name(name: str) -> str:
+    """번호 표기와 공백을 제거한 비교용 계정명을 반환합니다."""
+    return _WHITESPACE_PATTERN.sub("", _ENUMERATION_PATTERN.sub("", str(name)))
+
+
+class AccountMatch(NamedTuple):
+    """계정 조회 결과"""
+    actual_name: str       # 실제로 찾은 계정명 (요청한 이름 또는 대체한 유사 계정명)
+    requested_name: str    # 요청한 계정명
+    position: int          # DataFrame 내 행 위치 (iloc)
+
+    @property
+    def substituted(self) -> bool:
+        """유사 계정명으로 대체했는지 여부"""
+        return self.actual_name != self.requested_name
+
+
+class AccountIndex:
+    """
+    재무제표 DataFrame 하나에 대한 계정 역색인.
+
+    조회 순서는 기존 유사 계정명 검색과 같습니다.
+    1. 요청한 계정명 (정확히 일치하는 계정 우선, 없으면 이름을 포함하는 첫 계정)
+    2. 같은 그룹의 유사 계정명
+    3. 부분 일치 (계정명이 요청 이름을 포함하거나 그 반대)
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Args:
+            df (pd.DataFrame): account_nm 컬럼을 가진 재무제표 DataFrame
+        """
+        self.size = len(df)
+        names = df['account_nm'].tolist() if 'account_nm' in df.columns else []
+        self._sj_div = df['sj_div'].astype(str).tolist() if 'sj_div' in df.columns else [None] * len(names)
+
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_id: Dict[str, List[int]] = {}
+        self._raw_names: Dict[str, str] = {}
+        for position, name in enumerate(names):
+            if not isinstance(name, str):
+                continue
+            key = normalize_account_name(name)
+            self._by_name.setdefault(key, []).append(position)
+            self._raw_names.setdefault(key, name)
+        if 'account_id' in df.columns:
+            for position, account_id in enumerate(df['account_id'].tolist()):
+                if isinstance(account_id, str) and not account_id.startswith('-'):
+                    self._by_id.setdefault(account_id, []).append(position)
+
+        # 조회 결과 메모 (유사 계정명 그룹은 미리 계산)
+        self._resolved: Dict[Tuple[str, Optional[str]], Optional[AccountMatch]] = {}
+        for similar_names in ACCOUNT_NAME_MAPPINGS.values():
+            for name in similar_names:
+                self.lookup(name)
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def _first(self, positions: List[int], sj_div: Optional[str]) -> Optional[int]:
+        """행 위치 목록에서 재무제표 구분 조건을 만족하는 첫 위치를 반환합니다."""
+        for position in positions:
+            if sj_div is None or self._sj_div[position] == sj_div:
+                return position
+        return None
+
+    def _containing(self, key: str, sj_div: Optional[str]) -> Optional[int]:
+        """이름에 key를 포함하는 계정 중 DataFrame에서 가장 먼저 나오는 행 위치를 반환합니다."""
+        best = None
+        for name_key, positions in self._by_name.items():
+            if key in name_key:
+                position = self._first(positions, sj_div)
+                if position is not None and (best is None or position < best):
+                    best = position
+        return best
+
+    def positions(self, name: str) -> List[int]:
+        """계정명(정규화 후 정확히 일치) 또는 account_id에 해당하는 모든 행 위치를 반환합니다."""
+        if name in self._by_id:
+            return list(self._by_id[name])
+        return list(self._by_name.get(normalize_account_name(name), []))
+
+    def _find_exact_or_contained(self, name: str, sj_div: Optional[str]) -> Optional[int]:
+        """정확히 일치하는 계정, 없으면 이름을 포함하는 첫 계정의 행 위치"""
+        key = normalize_account_name(name)
+        position = self._first(self._by_id.get(name, []), sj_div)
+        if position is None:
+            position = self._first(self._by_name.get(key, []), sj_div)
+        if position is None and key:
+            position = self._containing(key, sj_div)
+        return position
+
+    def lookup(self, metric: str, sj_div: Optional[str] = None) -> Optional[AccountMatch]:
+        """
+        지표에 해당하는 계정을 찾습니다. 없으면 유사 계정명, 부분 일치 순으로 대체합니다.
+
+        Args:
+            metric (str): 찾을 계정명 또는 account_id
+            sj_div (str, optional): 재무제표 구분 (예: "BS", "IS")으로 범위 제한
+
+        Returns:
+            Optional[AccountMatch]: 조회 결과 (찾지 못하면 None)
+        """
+        memo_key = (metric, sj_div)
+        if memo_key in self._resolved:
+            return self._resolved[memo_key]
+
+        match = None
+        position = self._find_exact_or_contained(metric, sj_div)
+        if position is not None:
+            match = AccountMatch(metric, metric, position)
+
+        if match is None:
+            for similar_names in ACCOUNT_NAME_MAPPINGS.values():
+                if metric not in similar_names:
+                    continue
+                for similar_name in similar_names:
+                    if similar_name == metric:
+                        continue
+                    position = self._find_exact_or_contained(similar_name, sj_div)
+                    if position is not None:
+                        match = AccountMatch(similar_name, metric, position)
+                        break
+                if match is not None:
+                    break
+
+        if match is None:
+            key = normalize_account_name(metric)
+            for name_key, positions in self._by_name.items():
+                if name_key and key and (key in name_key or name_key in key):
+                    position = self._first(positions, sj_div)
+                    if position is not None:
+                        match = AccountMatch(self._raw_names[name_key], metric, position)
+                        break
+
+        self._resolved[memo_key] = match
+        return match
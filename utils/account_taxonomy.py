@@ -0,0 +1,252 @@
+"""
+IFRS account_id 기반 표준 계정 분류(taxonomy) 모듈
+
+DART가 반환하는 표준 계정 ID(ifrs-full_Revenue, dart_OperatingIncomeLoss 등)로
+표준 지표(매출액, 영업이익 등)를 찾습니다. 한글 계정명 부분 일치는 "매출"이 "매출원가"에,
+"부채총계"가 "부채와자본총계"에 걸리는 문제가 있으므로, 계정명은 회사가 자체 정의한
+계정 ID(표준계정코드 미사용 등)에 대해서만, 그리고 정확히 일치하는 경우에만 사용합니다.
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.account_index import normalize_account_name
+
+
+class StandardAccount(NamedTuple):
+    """표준 지표 정의"""
+    metric: str                  # 표준 지표명
+    account_ids: Tuple[str, ...]  # 표준 계정 ID (우선순위 순)
+    sj_divs: Tuple[str, ...]     # 찾을 재무제표 구분 (우선순위 순)
+    names: Tuple[str, ...]       # 자체 정의 계정 ID일 때 사용할 계정명 (정확히 일치)
+
+
+_BS = ("BS",)
+_IS = ("IS", "CIS")
+_CF = ("CF",)
+
+STANDARD_ACCOUNTS: Dict[str, StandardAccount] = {account.metric: account for account in [
+    # 재무상태표
+    StandardAccount("자산총계", ("ifrs-full_Assets",), _BS, ("자산총계",)),
+    StandardAccount("유동자산", ("ifrs-full_CurrentAssets",), _BS, ("유동자산",)),
+    StandardAccount("비유동자산", ("ifrs-full_NoncurrentAssets",), _BS, ("비유동자산",)),
+    StandardAccount("현금및현금성자산", ("ifrs-full_CashAndCashEquivalents",), _BS, ("현금및현금성자산",)),
+    StandardAccount("재고자산", ("ifrs-full_Inventories",), _BS, ("재고자산",)),
+    StandardAccount("부채총계", ("ifrs-full_Liabilities",), _BS, ("부채총계",)),
+    StandardAccount("유동부채", ("ifrs-full_CurrentLiabilities",), _BS, ("유동부채",)),
+    StandardAccount("비유동부채", ("ifrs-full_NoncurrentLiabilities",), _BS, ("비유동부채",)),
+    StandardAccount("자본총계", ("ifrs-full_Equity",), _BS, ("자본총계",)),
+    StandardAccount("지배기업소유주지분", ("ifrs-full_EquityAttributableToOwnersOfParent",), _BS,
+                    ("지배기업소유주지분", "지배기업의소유주에게귀속되는자본")),
+    StandardAccount("부채와자본총계", ("ifrs-full_EquityAndLiabilities",), _BS, ("부채와자본총계", "자본과부채총계")),
+    # 손익계산서 / 포괄손익계산서
+    StandardAccount("매출액", ("ifrs-full_Revenue",), _IS, ("매출액", "영업수익", "수익(매출액)", "매출")),
+    StandardAccount("매출원가", ("ifrs-full_CostOfSales",), _IS, ("매출원가", "영업비용")),
+    StandardAccount("매출총이익", ("ifrs-full_GrossProfit",), _IS, ("매출총이익", "매출총이익(손실)", "매출총손익")),
+    StandardAccount("판매비와관리비", ("dart_TotalSellingGeneralAdministrativeExpenses",), _IS,
+                    ("판매비와관리비", "판매비및관리비")),
+    StandardAccount("영업이익", ("dart_OperatingIncomeLoss", "ifrs-full_ProfitLossFromOperatingActivities"), _IS,
+                    ("영업이익", "영업이익(손실)", "영업손익", "영업손실")),
+    StandardAccount("법인세비용차감전순이익", ("ifrs-full_ProfitLossBeforeTax",), _IS,
+                    ("법인세비용차감전순이익", "법인세비용차감전순이익(손실)", "법인세차감전순이익")),
+    StandardAccount("법인세비용", ("ifrs-full_IncomeTaxExpenseContinuingOperations",), _IS, ("법인세비용",)),
+    StandardAccount("당기순이익", ("ifrs-full_ProfitLoss",), _IS,
+                    ("당기순이익", "당기순이익(손실)", "당기순손익", "연결당기순이익")),
+    StandardAccount("지배기업소유주순이익", ("ifrs-full_ProfitLossAttributableToOwnersOfParent",), _IS,
+                    ("지배기업소유주지분", "지배기업의소유주에게귀속되는당기순이익")),
+    StandardAccount("기본주당이익", ("ifrs-full_BasicEarningsLossPerShare",), _IS,
+                    ("기본주당이익", "기본주당이익(손실)")),
+    # 현금흐름표
+    StandardAccount("영업활동현금흐름", ("ifrs-full_CashFlowsFromUsedInOperatingActivities",), _CF,
+                    ("영업활동현금흐름", "영업활동으로인한현금흐름")),
+    StandardAccount("투자활동현금흐름", ("ifrs-full_CashFlowsFromUsedInInvestingActivities",), _CF,
+                    ("투자활동현금흐름", "투자활동으로인한현금흐름")),
+    StandardAccount("재무활동현금흐름", ("ifrs-full_CashFlowsFromUsedInFinancingActivities",), _CF,
+                    ("재무활동현금흐름", "재무활동으로인한현금흐름")),
+]}
+
+# 사용자가 흔히 쓰는 다른 이름 → 표준 지표명
+METRIC_ALIASES = {
+    "매출": "매출액",
+    "영업수익": "매출액",
+    "순매출액": "매출액",
+    "총매출액": "매출액",
+    "판매원가": "매출원가",
+    "매출총손익": "매출총이익",
+    "영업총이익": "매출총이익",
+    "판관비": "판매비와관리비",
+    "법인세차감전순이익": "법인세비용차감전순이익",
+    "영업손익": "영업이익",
+    "영업이익(손실)": "영업이익",
+    "순이익": "당기순이익",
+    "당기순손익": "당기순이익",
+    "당기순이익(손실)": "당기순이익",
+    "총자산": "자산총계",
+    "자산합계": "자산총계",
+    "총부채": "부채총계",
+    "부채합계": "부채총계",
+    "총자본": "자본총계",
+    "자본합계": "자본총계",
+    "순자산": "자본총계",
+    "현금": "현금및현금성자산",
+    "EPS": "기본주당이익",
+    "주당순이익": "기본주당이익",
+}
+
+# 금액이 아닌 주당 값(원) 지표 (억원/조원 환산 대상에서 제외)
+PER_SHARE_METRICS = {"기본주당이익"}
+
+# 표준 계정 ID 접두어 (이 접두어가 없으면 회사가 자체 정의한 계정으로 보고 계정명으로 찾습니다)
+STANDARD_ID_PATTERN = re.compile(r"^(?:ifrs-full|ifrs|dart)_")
+
+# 미리 계산한 조회 테이블
+# account_id → (표준 지표명, 계정 ID 우선순위)
+_ID_TABLE: Dict[str, Tuple[str, int]] = {
+    account_id: (account.metric, rank)
+    for account in STANDARD_ACCOUNTS.values()
+    for rank, account_id in enumerate(account.account_ids)
+}
+# 정규화된 계정명 → [(표준 지표명, 계정명 우선순위)]
+_NAME_TABLE: Dict[str, List[Tuple[str, int]]] = {}
+for _account in STANDARD_ACCOUNTS.values():
+    for _rank, _name in enumerate(_account.names):
+        _NAME_TABLE.setdefault(normalize_account_name(_name), []).append((_account.metric, _rank))
+# (표준 지표명, 재무제표 구분) → 구분 우선순위
+_SJ_RANK: Dict[Tuple[str, str], int] = {
+    (account.metric, sj_div): rank
+    for account in STANDARD_ACCOUNTS.values()
+    for rank, sj_div in enumerate(account.sj_divs)
+}
+
+def canonical_metric(name: str) -> Optional[str]:
+    """
+    지표 이름(표준 지표명, 별칭 또는 표준 계정 ID)을 표준 지표명으로 바꿉니다.
+    표준 계정 ID 중 분류표에 없는 것은 그 ID 자체를 반환하고, 모르는 이름이면 None을 반환합니다.
+    """
+    name = name.strip()
+    if name in STANDARD_ACCOUNTS:
+        return name
+    if name in METRIC_ALIASES:
+        return METRIC_ALIASES[name]
+    key = normalize_account_name(name)
+    for metric in (key, METRIC_ALIASES.get(key)):
+        if metric in STANDARD_ACCOUNTS:
+            return metric
+    if name in _ID_TABLE:
+        return _ID_TABLE[name][0]
+    if STANDARD_ID_PATTERN.match(name):
+        return name
+    return None
+
+
+def _match_rows(df: pd.DataFrame, wanted: set) -> Dict[str, Tuple[int, str]]:
+    """
+    wanted 지표별로 가장 알맞은 행을 찾아 {지표: (행 위치, matched_by)}를 반환합니다.
+
+    계정 ID 일치 여부와 자체 정의 계정 여부는 컬럼 단위로 한 번에 계산하고,
+    후보 행(대개 수십 개 이하)만 순위를 비교합니다.
+    """
+    if (not wanted or df is None or df.empty
+            or any(col not in df.columns for col in ("account_id", "account_nm", "sj_div"))):
+        return {}
+
+    account_ids = df["account_id"].astype(str)
+    sj_divs = df["sj_div"].astype(str).to_numpy()
+    best: Dict[str, Tuple[tuple, int, str]] = {}
+
+    def consider(position: int, metric: str, match_rank: int, item_rank: int, matched_by: str):
+        sj_rank = _SJ_RANK.get((metric, sj_divs[position]))
+        if sj_rank is None:
+            if metric in STANDARD_ACCOUNTS:
+                return
+            sj_rank = 0
+        rank = (match_rank, item_rank, sj_rank, position)
+        if metric not in best or rank < best[metric][0]:
+            best[metric] = (rank, position, matched_by)
+
+    # 1. 표준 계정 ID로 찾기 (분류표에 없는 표준 ID를 직접 요청한 경우 포함)
+    id_table = {account_id: entry for account_id, entry in _ID_TABLE.items() if entry[0] in wanted}
+    id_table.update({c: (c, 0) for c in wanted if c not in STANDARD_ACCOUNTS})
+    id_matched = account_ids.isin(id_table.keys()).to_numpy()
+    for position in np.flatnonzero(id_matched):
+        metric, item_rank = id_table[account_ids.iat[position]]
+        consider(int(position), metric, 0, item_rank, "account_id")
+
+    # 2. 자체 정의 계정 ID인 행만 계정명으로 찾기
+    custom = ~account_ids.str.match(STANDARD_ID_PATTERN).to_numpy(dtype=bool)
+    if custom.any():
+        names = df["account_nm"].to_numpy()
+        for position in np.flatnonzero(custom):
+            for metric, item_rank in _NAME_TABLE.get(normalize_account_name(names[position]), ()):
+                if metric in wanted:
+                    consider(int(position), metric, 1, item_rank, "name")
+
+    return {metric: (position, matched_by) for metric, (_, position, matched_by) in best.items()}
+
+
+def standard_positions(df: pd.DataFrame) -> Dict[str, Tuple[int, str]]:
+    """
+    모든 표준 지표의 행 위치를 한 번에 계산합니다: {지표: (행 위치, matched_by)}.
+    저장소에 보관된 DataFrame은 이 결과를 캐시해 두고 resolve(..., standard=...)에 넘겨 재사용합니다.
+    """
+    return _match_rows(df, set(STANDARD_ACCOUNTS))
+
+
+def _nullable_dtype(dtype):
+    """찾지 못한 지표를 결측으로 담을 수 있도록 numpy 정수/불리언 타입을 nullable 타입으로 바꿉니다."""
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+        return "Int64"
+    if isinstance(dtype, np.dtype) and dtype.kind == "b":
+        return "boolean"
+    return dtype
+
+
+def resolve(df: pd.DataFrame, metrics: Iterable[str],
+            amount_columns: Sequence[str] = ("thstrm_amount",),
+            standard: Optional[Dict[str, Tuple[int, str]]] = None) -> pd.DataFrame:
+    """
+    재무제표 DataFrame에서 여러 지표를 한 번에 찾습니다.
+
+    계정 ID로 찾은 행을 우선하고, 자체 정의 계정 ID인 행만 계정명(정확히 일치)으로 찾습니다.
+    같은 지표에 여러 행이 맞으면 계정 ID/계정명 우선순위 → 재무제표 구분 우선순위(IS → CIS 등)
+    → 행 순서로 고릅니다.
+
+    Args:
+        df (pd.DataFrame): 단일회사 재무제표 DataFrame (account_id, account_nm, sj_div 컬럼)
+        metrics (Iterable[str]): 지표 목록 (표준 지표명, 별칭 또는 표준 계정 ID)
+        amount_columns (Sequence[str]): 함께 가져올 금액 컬럼
+        standard (dict, optional): 미리 계산한 standard_positions(df) 결과
+
+    Returns:
+        pd.DataFrame: 요청한 지표를 인덱스로 하고 account_id, account_nm, sj_div,
+                      matched_by("account_id"/"name"), position, 금액 컬럼을 가진 DataFrame
+                      (찾지 못한 지표는 결측)
+    """
+    metrics = list(dict.fromkeys(metrics))
+    canonical = {metric: canonical_metric(metric) for metric in metrics}
+    wanted = {c for c in canonical.values() if c is not None}
+
+    if standard is None:
+        matched = _match_rows(df, wanted)
+    else:
+        matched = {c: standard[c] for c in wanted if c in standard}
+        matched.update(_match_rows(df, {c for c in wanted if c not in STANDARD_ACCOUNTS}))
+
+    found = {metric: matched[canonical[metric]] for metric in metrics if canonical[metric] in matched}
+    columns: Dict[str, object] = {}
+    picked = df.iloc[[position for position, _ in found.values()]] if found else None
+    for col in ("account_id", "account_nm", "sj_div"):
+        values = dict(zip(found, picked[col].astype(str).tolist())) if found else {}
+        columns[col] = [values.get(m) for m in metrics]
+    columns["matched_by"] = [found[m][1] if m in found else None for m in metrics]
+    columns["position"] = pd.array([found[m][0] if m in found else None for m in metrics], dtype="Int64")
+    for col in amount_columns:
+        if df is not None and col in df.columns:
+            values = dict(zip(found, picked[col].tolist())) if found else {}
+            columns[col] = pd.array([values.get(m) for m in metrics], dtype=_nullable_dtype(df[col].dtype))
+        else:
+            columns[col] = [None] * len(metrics)
+    return pd.DataFrame(columns, index=pd.Index(metrics, name="metric"))
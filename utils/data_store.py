@@ -1,23 +1,387 @@
-from typing import Dict, Any, List
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 
+try:
+    import fcntl  # 세션 디렉터리 잠금 (Windows에는 없음)
+except ImportError:
+    fcntl = None
+
+try:
+    import pyarrow.feather as feather  # Parquet/Feather 저장에 필요
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+from utils.account_index import AccountIndex
+from utils.account_taxonomy import standard_positions
+from utils.fact_table import FactTable
+from utils.ratio_engine import RatioEngine
+from utils.result_renderer import ResultPager
+from utils.screener import ScreeningTable
+from utils.statement_profile import StatementProfile, build_profile
+
+# 메모리 예산 (MB, 환경 변수로 재정의 가능, 0이면 제한 없음)
+# 예산을 넘으면 가장 오래 사용하지 않은 DataFrame부터 Parquet 파일로 내려놓고 메모리에서 해제합니다.
+SESSION_MEMORY_MB = int(os.getenv("DART_STORE_SESSION_MB", "512"))
+GLOBAL_MEMORY_MB = int(os.getenv("DART_STORE_GLOBAL_MB", "2048"))
+SPILL_DIR = os.getenv("DART_STORE_SPILL_DIR", os.path.join(tempfile.gettempdir(), "dart_agent_spill"))
+
+# 세션 영속화 디렉터리 (설정하면 세션별 DataFrame을 Feather(Arrow IPC) 파일로 저장하여 재시작 후 복원)
+PERSIST_DIR = os.getenv("DART_STORE_PERSIST_DIR")
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = ".lock"
+# 영속화 세션 정리 기준: 마지막 사용 후 보관 기간(시간)과 전체 크기 한도(MB, 0이면 제한 없음)
+PERSIST_TTL_HOURS = float(os.getenv("DART_STORE_PERSIST_TTL_HOURS", "168"))
+PERSIST_MAX_MB = int(os.getenv("DART_STORE_PERSIST_MAX_MB", "10240"))
+SWEEP_INTERVAL_SECONDS = 600
+# 영속화 파일 압축 방식 (Feather: zstd, lz4, uncompressed)
+PERSIST_COMPRESSION = os.getenv("DART_STORE_PERSIST_COMPRESSION", "zstd")
+_SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# 이전 프로세스가 남긴 내려놓기 디렉터리 정리 기준
+STALE_SPILL_GRACE_SECONDS = 60
+DAY_SECONDS = 24 * 60 * 60
+_spill_dir_swept = False
+_sweep_lock = threading.Lock()
+
+# 모든 세션 저장소 (전역 예산 계산용)와 메모리 관리 잠금
+_stores: "weakref.WeakSet[SessionDataStore]" = weakref.WeakSet()
+_memory_lock = threading.RLock()
+# 세션 간 LRU 순서를 비교하기 위한 사용 시각
+_clock = itertools.count()
+
+
+def new_session_id() -> str:
+    """영속화 세션 ID를 새로 만듭니다."""
+    return uuid.uuid4().hex
+
+
+def session_dir_for(session_id: Optional[str]) -> Optional[str]:
+    """
+    세션 ID의 영속화 디렉터리를 반환합니다.
+    DART_STORE_PERSIST_DIR가 설정되지 않았거나, pyarrow가 없거나, 올바른 세션 ID가 아니면 None을 반환합니다.
+    """
+    if not PERSIST_DIR or not HAS_PARQUET or not session_id or not _SESSION_ID_PATTERN.match(session_id):
+        return None
+    return os.path.join(PERSIST_DIR, session_id)
+
+
+def _lock_dir(directory: str) -> Optional[int]:
+    """
+    세션/내려놓기 디렉터리를 배타적으로 잠그고 잠금 파일 디스크립터를 반환합니다.
+    다른 저장소(같은 프로세스의 다른 탭 포함)가 이미 사용 중이면 None을 반환합니다.
+    """
+    fd = os.open(os.path.join(directory, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o600)
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+    return fd
+
+
+def fork_session(source_dir: str, target_dir: str) -> int:
+    """
+    다른 저장소가 사용 중인 세션의 DataFrame을 새 세션 디렉터리로 복사합니다.
+    DataFrame 파일은 저장 후 바뀌지 않으므로 하드 링크로 복사합니다 (불가능하면 파일 복사).
+    
+    Returns:
+        int: 복사한 DataFrame 수
+    """
+    try:
+        with open(os.path.join(source_dir, MANIFEST_FILE), encoding="utf-8") as f:
+            frames = json.load(f).get("frames", {})
+    except (OSError, ValueError) as e:
+        print(f"세션 manifest 읽기 중 오류 발생: {e}")
+        return 0
+    
+    target_frames = os.path.join(target_dir, "frames")
+    os.makedirs(target_frames, exist_ok=True)
+    copied = {}
+    for key, entry in frames.items():
+        name = os.path.basename(entry["file"])
+        source = os.path.join(source_dir, "frames", name)
+        target = os.path.join(target_frames, name)
+        try:
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copyfile(source, target)
+        except OSError:
+            # 원래 세션에서 방금 교체된 파일은 건너뜀
+            continue
+        copied[key] = entry
+    
+    with open(os.path.join(target_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "frames": copied}, f, ensure_ascii=False, default=str)
+    return len(copied)
+
+
+def _dir_usage(directory: str) -> Tuple[float, int]:
+    """세션 디렉터리의 마지막 사용 시각(잠금/manifest 파일 수정 시각)과 전체 크기(bytes)를 반환합니다."""
+    last_used = os.path.getmtime(directory)
+    size = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            size += stat.st_size
+            if name in (LOCK_FILE, MANIFEST_FILE):
+                last_used = max(last_used, stat.st_mtime)
+    return last_used, size
+
+
+_last_session_sweep = 0.0
+
+
+def sweep_sessions(force: bool = False) -> int:
+    """
+    영속화 디렉터리에서 PERSIST_TTL_HOURS 동안 사용하지 않은 세션과, 전체 크기가 PERSIST_MAX_MB를 넘을 때
+    가장 오래 사용하지 않은 세션부터 삭제합니다. 다른 저장소가 사용 중인(잠긴) 세션은 삭제하지 않습니다.
+    새 세션을 만들 때 호출하며, force가 아니면 SWEEP_INTERVAL_SECONDS마다 한 번만 실행합니다.
+    
+    Returns:
+        int: 삭제한 세션 수
+    """
+    global _last_session_sweep
+    now = time.time()
+    if not PERSIST_DIR or (not force and now - _last_session_sweep < SWEEP_INTERVAL_SECONDS):
+        return 0
+    _last_session_sweep = now
+    try:
+        names = [name for name in os.listdir(PERSIST_DIR) if _SESSION_ID_PATTERN.match(name)]
+    except OSError:
+        return 0
+    
+    sessions = []
+    for name in names:
+        try:
+            sessions.append(_dir_usage(os.path.join(PERSIST_DIR, name)) + (os.path.join(PERSIST_DIR, name),))
+        except OSError:
+            continue
+    sessions.sort()
+    total = sum(size for _, size, _ in sessions)
+    max_bytes = PERSIST_MAX_MB * 1024 * 1024
+    removed = 0
+    for last_used, size, path in sessions:
+        expired = now - last_used > PERSIST_TTL_HOURS * 3600
+        if not expired and not (max_bytes and total > max_bytes):
+            continue
+        try:
+            lock_fd = _lock_dir(path)
+        except OSError:
+            continue
+        if lock_fd is None:
+            continue
+        _release_dir(path, lock_fd)
+        total -= size
+        removed += 1
+    return removed
+
+
+def _release_dir(directory: str, lock_fd: int):
+    """내려놓기 디렉터리를 삭제하고 잠금을 해제합니다."""
+    shutil.rmtree(directory, ignore_errors=True)
+    os.close(lock_fd)
+
+
+def _sweep_spill_dir():
+    """
+    비정상 종료된 프로세스가 남긴 내려놓기 디렉터리(session_*)를 삭제합니다.
+    사용 중인 디렉터리는 저장소가 잠그고 있으므로 잠글 수 있는 디렉터리만 삭제하며,
+    잠금을 지원하지 않는 환경에서는 하루 이상 지난 디렉터리만 삭제합니다.
+    """
+    try:
+        names = os.listdir(SPILL_DIR)
+    except OSError:
+        return
+    now = time.time()
+    for name in names:
+        path = os.path.join(SPILL_DIR, name)
+        try:
+            age = now - os.path.getmtime(path)
+        except OSError:
+            continue
+        # 방금 만들어져 아직 잠그기 전인 디렉터리는 건너뜀
+        if not name.startswith("session_") or age < STALE_SPILL_GRACE_SECONDS:
+            continue
+        if fcntl is None:
+            if age > DAY_SECONDS:
+                shutil.rmtree(path, ignore_errors=True)
+            continue
+        try:
+            lock_fd = _lock_dir(path)
+        except OSError:
+            continue
+        if lock_fd is not None:
+            _release_dir(path, lock_fd)
+
+
+def _sweep_once():
+    """프로세스에서 처음 저장소를 만들 때 한 번 이전 프로세스가 남긴 내려놓기 디렉터리를 정리합니다."""
+    global _spill_dir_swept
+    with _sweep_lock:
+        if not _spill_dir_swept:
+            _spill_dir_swept = True
+            _sweep_spill_dir()
+
+
+def _read_file(path: str) -> pd.DataFrame:
+    """디스크의 DataFrame(Parquet 또는 Feather 파일)을 읽습니다."""
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return feather.read_feather(path)
+
+
+def _remove_file(path: str):
+    """파일을 삭제합니다 (이미 없으면 무시)."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """DataFrame의 메모리 사용량(bytes, 문자열 등 객체 포함)을 반환합니다."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class _FrameView(Mapping):
+    """저장소의 DataFrame을 키로 조회하는 읽기 전용 딕셔너리 (조회한 DataFrame만 불러옴)"""
+
+    def __init__(self, store: "SessionDataStore", copy: bool = False):
+        self._store = store
+        self._copy = copy
+
+    def __getitem__(self, key: str) -> pd.DataFrame:
+        if self._copy:
+            return self._store._load(key).copy()
+        return self._store.get(key)
+
+    def __iter__(self):
+        return iter(self._store.list_keys())
+
+    def __len__(self) -> int:
+        return len(self._store.list_keys())
+
+    def __contains__(self, key) -> bool:
+        return key in self._store._metadata
+
+
 class SessionDataStore:
     """
     대화 세션 동안 수집된 모든 데이터를 저장하고 관리하는 클래스.
     주로 DataFrame 형태의 데이터를 저장하며, 고유한 key를 통해 접근합니다.
     """
 
-    def __init__(self):
-        """데이터를 저장할 내부 딕셔너리를 초기화합니다."""
+    def __init__(self, memory_limit_mb: int = SESSION_MEMORY_MB, session_dir: Optional[str] = None):
+        """
+        데이터를 저장할 내부 딕셔너리와 재무 팩트 테이블, 재무비율 테이블, 스크리닝 테이블, 결과 핸들 저장소를 초기화합니다.
+        
+        Args:
+            memory_limit_mb (int): 메모리에 유지할 DataFrame의 최대 크기 (MB, 0이면 제한 없음).
+                                   넘으면 오래 사용하지 않은 DataFrame을 Parquet 파일로 내려놓습니다.
+            session_dir (str, optional): 영속화 디렉터리. 지정하면 추가된 DataFrame을 Feather 파일로 저장하고,
+                                         이미 저장된 세션이면 파일을 읽지 않고 key 목록만 복원합니다
+                                         (DataFrame은 처음 조회할 때 파일에서 불러옴).
+                                         다른 저장소가 이미 사용 중인 디렉터리면 영속화하지 않으며
+                                         session_dir 속성이 None이 됩니다 (fork_session으로 분기 가능).
+        """
         self._data: Dict[str, Any] = {}
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._facts = FactTable()
+        self._ratios = RatioEngine()
+        self._screening = ScreeningTable()
+        self.results = ResultPager()
+        self._account_indexes: Dict[str, AccountIndex] = {}
+        self._standard_accounts: Dict[str, Dict[str, Any]] = {}
+        self._profiles: Dict[str, StatementProfile] = {}
+        
+        # 메모리 관리: 메모리에 있는 key → (bytes, 사용 시각) (오래된 순),
+        # 디스크에 있는 key → 파일 경로 (Parquet으로 내려놓은 파일 또는 영속화한 Feather 파일)
+        self.memory_limit = memory_limit_mb * 1024 * 1024
+        self._lru: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._resident_bytes = 0
+        self._spilled: Dict[str, str] = {}
+        self._unspillable: set = set()
+        # 파일 읽기/쓰기는 전역 잠금 밖에서 하므로, 진행 중인 key를 표시해 둠
+        self._loading: Dict[str, threading.Event] = {}
+        self._spilling: set = set()
+        # get()으로 내준 DataFrame (직접 수정되었을 수 있으므로 해제할 때 파일을 다시 씀)
+        self._dirty: set = set()
+        self._spill_dir: Optional[str] = None
+        self._stats = {"hits": 0, "reloads": 0, "spills": 0, "evictions": 0, "spill_failures": 0, "restored": 0}
+        _stores.add(self)
+        _sweep_once()
+        
+        # 영속화: 복원 후 아직 팩트/비율/스크리닝 테이블에 반영하지 않은 key와,
+        # 그 사이에 추가되어 복원 후 다시 반영해야 하는 key (나중에 추가한 값이 우선하도록)
+        self.session_dir = session_dir if HAS_PARQUET else None
+        self._pending: List[str] = []
+        self._replay: List[str] = []
+        self._restore_lock = threading.Lock()
+        self._release_lock = None
+        if self.session_dir is not None:
+            os.makedirs(self.session_dir, exist_ok=True)
+            lock_fd = _lock_dir(self.session_dir)
+            if lock_fd is None:
+                print(f"다른 저장소가 사용 중인 세션이므로 영속화하지 않습니다: {self.session_dir}")
+                self.session_dir = None
+            else:
+                self._release_lock = weakref.finalize(self, os.close, lock_fd)
+                # 잠금 파일의 수정 시각을 마지막 사용 시각으로 사용 (sweep_sessions)
+                os.utime(os.path.join(self.session_dir, LOCK_FILE))
+                self._spill_dir = os.path.join(self.session_dir, "frames")
+                os.makedirs(self._spill_dir, exist_ok=True)
+                self._resume()
+
+    @property
+    def facts(self) -> FactTable:
+        """재무 팩트 테이블 (복원한 세션이면 처음 조회할 때 복원한 DataFrame을 반영)"""
+        self._restore_derived()
+        return self._facts
+
+    @property
+    def ratios(self) -> RatioEngine:
+        """재무비율 테이블 (복원한 세션이면 처음 조회할 때 복원한 DataFrame을 반영)"""
+        self._restore_derived()
+        return self._ratios
 
-    def add(self, key: str, data: pd.DataFrame):
+    @property
+    def screening(self) -> ScreeningTable:
+        """스크리닝 테이블 (복원한 세션이면 처음 조회할 때 복원한 DataFrame을 반영)"""
+        self._restore_derived()
+        return self._screening
+
+    def add(self, key: str, data: pd.DataFrame, metadata: Optional[Dict[str, Any]] = None):
         """
         주어진 key로 데이터를 저장소에 추가합니다.
+        재무제표 형식의 DataFrame이면 재무 팩트 테이블(facts), 재무비율 테이블(ratios),
+        스크리닝 테이블(screening)에도 추가됩니다. DataFrame 요약(profile)도 이때 한 번 계산합니다.
+        저장 후 메모리 예산을 넘으면 오래 사용하지 않은 다른 DataFrame을 디스크로 내려놓습니다.
+        영속화 디렉터리가 있으면 DataFrame을 Feather 파일로 함께 저장합니다.
         
         Args:
             key (str): 데이터를 식별할 고유한 키.
             data (pd.DataFrame): 저장할 DataFrame 객체.
+            metadata (dict, optional): 회사명(corp_name), 재무제표 구분(fs_div) 등 
+                                       DataFrame에 없는 식별 정보.
         """
         if not isinstance(key, str) or not key:
             raise ValueError("Key는 비어있지 않은 문자열이어야 합니다.")
@@ -25,11 +389,58 @@ class SessionDataStore:
             raise ValueError("Data는 Pandas DataFrame이어야 합니다.")
             
         print(f"데이터 추가됨: {key}")
-        self._data[key] = data
+        with self._restore_lock:
+            if self._pending:
+                # 복원 대기 중인 key는 파일을 읽지 않고 새 데이터로 교체
+                self._pending = [pending for pending in self._pending if pending != key]
+                if key in self._replay:
+                    self._replay.remove(key)
+                if self._pending:
+                    self._replay.append(key)
+        path = self._persist(key, data)
+        with _memory_lock:
+            self._discard(key)
+            self._data[key] = data
+            self._metadata[key] = dict(metadata or {})
+            self._touch(key, frame_bytes(data))
+            if path is not None:
+                self._spilled[key] = path
+            self._write_manifest()
+        self._account_indexes.pop(key, None)
+        self._standard_accounts.pop(key, None)
+        self._profiles.pop(key, None)
+        
+        self._update_derived(key, data)
+        
+        try:
+            self.profile(key)
+        except Exception as e:
+            print(f"DataFrame 요약 계산 중 오류 발생: {e}")
+        
+        self._enforce_budget(protect=key)
+
+    def _update_derived(self, key: str, data: pd.DataFrame):
+        """DataFrame을 재무 팩트 테이블, 재무비율 테이블, 스크리닝 테이블에 반영합니다."""
+        metadata = self._metadata[key]
+        try:
+            self._facts.append(key, data, metadata)
+        except Exception as e:
+            print(f"팩트 테이블 갱신 중 오류 발생: {e}")
+        
+        try:
+            self._ratios.update(key, data, self.label(key), self.standard_accounts(key))
+        except Exception as e:
+            print(f"재무비율 갱신 중 오류 발생: {e}")
+        
+        try:
+            self._screening.add_statement(data, metadata, self.standard_accounts(key))
+        except Exception as e:
+            print(f"스크리닝 테이블 갱신 중 오류 발생: {e}")
 
     def get(self, key: str) -> pd.DataFrame:
         """
         주어진 key에 해당하는 데이터를 반환합니다.
+        디스크로 내려놓은 DataFrame이면 Parquet 파일에서 다시 불러옵니다.
         
         Args:
             key (str): 조회할 데이터의 키.
@@ -40,9 +451,458 @@ class SessionDataStore:
         Raises:
             KeyError: 해당 key의 데이터가 존재하지 않을 경우 발생.
         """
-        if key not in self._data:
+        data = self._load(key, count=True)
+        with _memory_lock:
+            if self._data.get(key) is data:
+                self._dirty.add(key)
+        return data
+
+    def _load(self, key: str, count: bool = False) -> pd.DataFrame:
+        """
+        메모리의 DataFrame을 반환하거나 디스크 파일에서 다시 불러옵니다 (count=False면 hits 통계에서 제외).
+        파일은 전역 잠금 밖에서 읽으므로 다른 세션의 조회를 막지 않으며,
+        같은 key를 동시에 요청하면 먼저 읽기 시작한 쪽의 결과를 기다립니다.
+        """
+        while True:
+            with _memory_lock:
+                if key in self._data:
+                    if count:
+                        self._stats["hits"] += 1
+                    self._touch(key)
+                    return self._data[key]
+                if key not in self._spilled:
+                    raise KeyError(f"'{key}'에 해당하는 데이터를 찾을 수 없습니다.")
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Event()
+                    path = self._spilled[key]
+                    break
+            loading.wait()
+        
+        try:
+            data = _read_file(path)
+            size = frame_bytes(data)
+        except Exception:
+            with _memory_lock:
+                self._loading.pop(key, None)
+                replaced = key in self._data
+            loading.set()
+            if replaced:
+                # 읽는 동안 같은 key로 새 데이터가 저장되어 파일이 삭제된 경우
+                return self._load(key, count)
+            raise
+        
+        with _memory_lock:
+            self._loading.pop(key, None)
+            if key in self._data:
+                # 읽는 동안 같은 key로 새 데이터가 저장된 경우 그 데이터를 사용
+                data = self._data[key]
+                self._touch(key)
+            else:
+                self._stats["reloads"] += 1
+                self._data[key] = data
+                self._touch(key, size)
+        loading.set()
+        self._enforce_budget(protect=key)
+        return data
+
+    def frames(self, copy: bool = False) -> Mapping:
+        """
+        모든 DataFrame을 key로 조회하는 읽기 전용 딕셔너리를 반환합니다 (실제로 조회한 DataFrame만 불러옴).
+        copy가 True면 조회할 때마다 사본을 반환하여, 받은 쪽에서 수정해도 저장소에 영향이 없습니다.
+        """
+        return _FrameView(self, copy)
+
+    def locate(self, key: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """
+        DataFrame을 불러오지 않고 현재 위치를 반환합니다: (메모리의 DataFrame 또는 None, 파일 경로 또는 None).
+        SQL 엔진이나 샌드박스처럼 디스크의 DataFrame을 직접 읽을 수 있는 곳에서 사용합니다.
+        get()으로 내준 뒤 수정되었을 수 있는 DataFrame은 파일이 오래되었을 수 있으므로 경로를 반환하지 않습니다.
+        
+        Raises:
+            KeyError: 해당 key의 데이터가 존재하지 않을 경우 발생.
+        """
+        with _memory_lock:
+            if key not in self._metadata:
+                raise KeyError(f"'{key}'에 해당하는 데이터를 찾을 수 없습니다.")
+            return self._data.get(key), (self._spilled.get(key) if key not in self._dirty else None)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        메모리 관리 통계를 반환합니다.
+        
+        Returns:
+            Dict[str, Any]: hits(메모리 조회), reloads(디스크에서 다시 불러옴), spills(디스크 저장),
+                            evictions(메모리 해제), spill_failures(디스크 저장 실패) 횟수와
+                            메모리/디스크의 key 수, DataFrame/팩트 테이블 메모리 사용량(bytes), 예산(bytes)
+        """
+        with _memory_lock:
+            return dict(
+                self._stats,
+                resident_keys=len(self._data),
+                spilled_keys=len([key for key in self._spilled if key not in self._data]),
+                resident_bytes=self._resident_bytes,
+                facts_bytes=self._facts.memory_bytes(),
+                memory_limit_bytes=self.memory_limit,
+            )
+
+    # 영속화
+
+    def _persist(self, key: str, data: pd.DataFrame) -> Optional[str]:
+        """영속화 디렉터리가 있으면 DataFrame을 Feather 파일로 저장하고 경로를 반환합니다."""
+        if self.session_dir is None:
+            return None
+        path = os.path.join(self._spill_dir, f"{uuid.uuid4().hex}.arrow")
+        try:
+            feather.write_feather(data, path, compression=PERSIST_COMPRESSION)
+            return path
+        except Exception as e:
+            print(f"DataFrame 영속화 중 오류 발생 ({key}): {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _write_manifest(self):
+        """디스크에 있는 key와 metadata 목록을 manifest 파일에 기록합니다."""
+        if self.session_dir is None:
+            return
+        frames = {
+            key: {"file": os.path.basename(self._spilled[key]), "metadata": metadata}
+            for key, metadata in self._metadata.items() if key in self._spilled
+        }
+        path = os.path.join(self.session_dir, MANIFEST_FILE)
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "frames": frames}, f, ensure_ascii=False, default=str)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"세션 manifest 저장 중 오류 발생: {e}")
+
+    def _resume(self):
+        """manifest에 기록된 key를 파일을 읽지 않고 복원합니다."""
+        path = os.path.join(self.session_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                frames = json.load(f).get("frames", {})
+        except (OSError, ValueError) as e:
+            print(f"세션 manifest 읽기 중 오류 발생: {e}")
+            return
+        
+        for key, entry in frames.items():
+            file_path = os.path.join(self._spill_dir, os.path.basename(entry["file"]))
+            if not os.path.exists(file_path):
+                continue
+            self._metadata[key] = entry.get("metadata") or {}
+            self._spilled[key] = file_path
+            self._pending.append(key)
+        self._stats["restored"] = len(self._pending)
+        
+        # 기록은 있지만 manifest에 없는 파일 정리 (저장 중 중단된 경우)
+        known = {os.path.basename(file_path) for file_path in self._spilled.values()}
+        for name in os.listdir(self._spill_dir):
+            if name not in known:
+                try:
+                    os.remove(os.path.join(self._spill_dir, name))
+                except OSError:
+                    pass
+
+    def _restore_derived(self):
+        """
+        복원한 DataFrame을 팩트/비율/스크리닝 테이블에 반영합니다 (처음 필요할 때 한 번).
+        복원 전에 추가된 key는 복원한 값보다 우선하도록 마지막에 다시 반영합니다.
+        """
+        if not self._pending:
+            return
+        with self._restore_lock:
+            while self._pending:
+                key = self._pending.pop(0)
+                if key not in self._metadata:
+                    continue
+                try:
+                    self._update_derived(key, self._load(key))
+                except Exception as e:
+                    print(f"복원한 데이터 반영 중 오류 발생 ({key}): {e}")
+            
+            replay, self._replay = self._replay, []
+            for key in replay:
+                if key not in self._metadata:
+                    continue
+                try:
+                    self._facts.remove(key)
+                    self._update_derived(key, self._load(key))
+                except Exception as e:
+                    print(f"추가한 데이터 반영 중 오류 발생 ({key}): {e}")
+
+    def delete_session_files(self):
+        """영속화 디렉터리를 삭제합니다. 더 이상 사용하지 않을 세션을 정리할 때 호출합니다 (새 대화 시작 등)."""
+        if self.session_dir is not None:
+            shutil.rmtree(self.session_dir, ignore_errors=True)
+            self.session_dir = None
+            self._spill_dir = None
+            self._release_lock()
+
+    # 메모리 관리
+
+    def _touch(self, key: str, size: Optional[int] = None):
+        """key를 가장 최근에 사용한 것으로 표시합니다 (size가 있으면 크기도 갱신)."""
+        old_size = self._lru.pop(key, (0, 0))[0]
+        size = old_size if size is None else size
+        self._resident_bytes += size - old_size
+        self._lru[key] = (size, next(_clock))
+
+    def _discard(self, key: str):
+        """key의 메모리/디스크 데이터를 모두 제거합니다 (같은 key로 다시 저장할 때)."""
+        self._data.pop(key, None)
+        self._resident_bytes -= self._lru.pop(key, (0, 0))[0]
+        self._unspillable.discard(key)
+        self._dirty.discard(key)
+        path = self._spilled.pop(key, None)
+        if path is not None:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _ensure_spill_dir(self) -> str:
+        """내려놓기 디렉터리를 만들고 저장소가 사라질 때까지 잠가 둡니다 (잠금을 잡은 상태에서 호출)."""
+        if self._spill_dir is None:
+            spill_dir = os.path.join(SPILL_DIR, f"session_{uuid.uuid4().hex}")
+            os.makedirs(spill_dir, exist_ok=True)
+            weakref.finalize(self, _release_dir, spill_dir, _lock_dir(spill_dir))
+            self._spill_dir = spill_dir
+        return self._spill_dir
+
+    def _spill(self, key: str, data: pd.DataFrame, spill_dir: str) -> Optional[str]:
+        """DataFrame을 파일로 저장하고 경로를 반환합니다 (영속화 세션은 Feather, 그 밖에는 Parquet)."""
+        if self.session_dir is not None:
+            return self._persist(key, data)
+        path = os.path.join(spill_dir, f"{uuid.uuid4().hex}.parquet")
+        try:
+            data.to_parquet(path)
+            return path
+        except Exception as e:
+            print(f"DataFrame 디스크 저장 중 오류 발생 ({key}): {e}")
+            _remove_file(path)
+            return None
+
+    def _ensure_file(self, key: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """
+        메모리의 DataFrame이 최신 파일로 저장되어 있게 합니다. 파일이 없거나 get()으로 내준 뒤면
+        새로 쓰고 이전 파일은 삭제합니다. 파일은 전역 잠금 밖에서 쓰며, 쓰는 동안 같은 key로
+        새 데이터가 저장되면 쓴 파일을 버립니다.
+        
+        Returns:
+            tuple: (파일에 저장한 DataFrame 객체 또는 None(메모리에 없음), 파일 경로 또는 None(저장할 수 없음))
+        """
+        with _memory_lock:
+            frame = self._data.get(key)
+            old_path = self._spilled.get(key)
+            if frame is None:
+                return None, old_path
+            if key in self._unspillable or key in self._spilling:
+                return frame, None
+            if old_path is not None and key not in self._dirty:
+                return frame, old_path
+            self._spilling.add(key)
+            self._dirty.discard(key)
+            spill_dir = self._ensure_spill_dir()
+        
+        path = self._spill(key, frame, spill_dir)
+        with _memory_lock:
+            self._spilling.discard(key)
+            if path is None:
+                self._stats["spill_failures"] += 1
+                self._unspillable.add(key)
+                return frame, None
+            published = self._data.get(key) is frame
+            if published:
+                self._spilled[key] = path
+                self._stats["spills"] += 1
+                self._write_manifest()
+        if not published:
+            _remove_file(path)
+            return None, None
+        if old_path is not None:
+            _remove_file(old_path)
+        return frame, path
+
+    def file_for(self, key: str) -> Optional[str]:
+        """
+        key의 DataFrame이 저장된 최신 파일 경로를 반환합니다. 메모리에만 있으면 디스크에 먼저 저장합니다
+        (메모리에서 해제하지는 않음). 샌드박스처럼 다른 프로세스에 DataFrame을 넘길 때 사용하며,
+        파일로 저장할 수 없으면 None을 반환합니다.
+        
+        Raises:
+            KeyError: 해당 key의 데이터가 존재하지 않을 경우 발생.
+        """
+        if key not in self._metadata:
             raise KeyError(f"'{key}'에 해당하는 데이터를 찾을 수 없습니다.")
-        return self._data[key]
+        if not HAS_PARQUET:
+            return None
+        return self._ensure_file(key)[1]
+
+    def _evict(self, key: str) -> bool:
+        """
+        DataFrame을 메모리에서 해제합니다. 디스크에 없거나 get()으로 내준 뒤 수정되었을 수 있으면
+        먼저 파일로 다시 저장합니다 (_ensure_file).
+        
+        Returns:
+            bool: 해제했으면 True (파일로 저장할 수 없거나 이미 해제된 경우 False)
+        """
+        if not HAS_PARQUET:
+            return False
+        frame, path = self._ensure_file(key)
+        if frame is None or path is None:
+            return False
+        
+        with _memory_lock:
+            # 파일을 쓰는 동안 다시 get()으로 내준 경우 다음 해제 때 다시 씀
+            if self._data.get(key) is not frame or key in self._dirty:
+                return False
+            del self._data[key]
+            self._resident_bytes -= self._lru.pop(key)[0]
+            self._stats["evictions"] += 1
+            # DataFrame에서 다시 만들 수 있는 계정 인덱스는 함께 해제하고, 팩트는 파일로 내려놓음
+            self._account_indexes.pop(key, None)
+            facts_path = os.path.join(self._ensure_spill_dir(), f"facts_{uuid.uuid4().hex}.parquet")
+        self._facts.spill(key, facts_path)
+        return True
+
+    def _used_bytes(self) -> int:
+        """예산에 포함하는 메모리 사용량: DataFrame과 팩트 테이블 (bytes)"""
+        return self._resident_bytes + self._facts.memory_bytes()
+
+    def _oldest(self, protect: Optional[str] = None) -> Optional[str]:
+        """해제할 수 있는 가장 오래 사용하지 않은 key를 반환합니다 (잠금을 잡은 상태에서 호출)."""
+        for key in self._lru:
+            if key != protect and key not in self._unspillable and key not in self._spilling:
+                return key
+        return None
+
+    def _next_victim(self, protect: Optional[str] = None) -> Optional[Tuple["SessionDataStore", str]]:
+        """
+        세션 예산이나 전역 예산을 넘었으면 해제할 (저장소, key)를 고릅니다 (잠금을 잡은 상태에서 호출).
+        해제할 DataFrame이 없으면 합친 팩트 테이블을 해제하도록 key로 None을 반환합니다.
+        """
+        if self.memory_limit and self._used_bytes() > self.memory_limit:
+            key = self._oldest(protect)
+            if key is not None:
+                return self, key
+            if self._facts.memory_bytes():
+                return self, None
+        
+        global_limit = GLOBAL_MEMORY_MB * 1024 * 1024
+        stores = list(_stores)
+        if not global_limit or sum(store._used_bytes() for store in stores) <= global_limit:
+            return None
+        # 모든 세션에서 가장 오래 사용하지 않은 DataFrame 선택
+        candidates = []
+        for store in stores:
+            key = store._oldest(protect if store is self else None)
+            if key is not None:
+                candidates.append((store._lru[key][1], id(store), store, key))
+        if candidates:
+            _, _, store, key = min(candidates, key=lambda candidate: candidate[:2])
+            return store, key
+        largest = max(stores, key=lambda store: store._facts.memory_bytes())
+        return (largest, None) if largest._facts.memory_bytes() else None
+
+    def _enforce_budget(self, protect: Optional[str] = None):
+        """세션 예산과 전역 예산을 넘지 않도록 오래 사용하지 않은 DataFrame을 해제합니다."""
+        if not HAS_PARQUET:
+            return
+        while True:
+            with _memory_lock:
+                victim = self._next_victim(protect)
+            if victim is None:
+                return
+            store, key = victim
+            if key is not None:
+                store._evict(key)
+            elif not store._facts.release():
+                return
+
+    def get_metadata(self, key: str) -> Dict[str, Any]:
+        """
+        주어진 key로 저장할 때 함께 받은 metadata(회사명, 재무제표 구분 등)를 반환합니다.
+        metadata 없이 저장된 경우 빈 딕셔너리를 반환합니다.
+        """
+        return dict(self._metadata.get(key, {}))
+
+    def label(self, key: str) -> Tuple[str, Optional[int], str]:
+        """
+        주어진 key의 데이터를 표에 표시할 (회사명, 사업연도, 재무제표 구분)을 반환합니다.
+        metadata에 없는 값은 DataFrame의 bsns_year 컬럼이나 key로 대신합니다.
+        
+        Raises:
+            KeyError: 해당 key의 데이터가 존재하지 않을 경우 발생.
+        """
+        if key not in self._metadata:
+            raise KeyError(f"'{key}'에 해당하는 데이터를 찾을 수 없습니다.")
+        metadata = self._metadata[key]
+        bsns_year = metadata.get("bsns_year")
+        if bsns_year is None:
+            df = self._load(key)
+            if "bsns_year" in df.columns and len(df):
+                bsns_year = df["bsns_year"].iloc[0]
+        bsns_year = int(bsns_year) if bsns_year is not None and str(bsns_year).isdigit() else None
+        return str(metadata.get("corp_name") or key), bsns_year, metadata.get("fs_div", "")
+
+    def account_index(self, key: str) -> AccountIndex:
+        """
+        주어진 key의 DataFrame에 대한 계정 조회 인덱스를 반환합니다.
+        처음 요청할 때 만들어 캐시하며, 같은 key로 데이터가 다시 추가되면 새로 만듭니다.
+        
+        Raises:
+            KeyError: 해당 key의 데이터가 존재하지 않을 경우 발생.
+        """
+        index = self._account_indexes.get(key)
+        if index is None:
+            index = AccountIndex(self._load(key))
+            self._account_indexes[key] = index
+        return index
+
+    def standard_accounts(self, key: str) -> Dict[str, Any]:
+        """
+        주어진 key의 DataFrame에서 표준 지표(매출액, 자산총계 등)의 행 위치를 반환합니다.
+        account_taxonomy.resolve()에 standard 인자로 넘겨 재사용하며, 캐시 방식은 account_index와 같습니다.
+        
+        Raises:
+            KeyError: 해당 key의 데이터가 존재하지 않을 경우 발생.
+        """
+        positions = self._standard_accounts.get(key)
+        if positions is None:
+            positions = standard_positions(self._load(key))
+            self._standard_accounts[key] = positions
+        return positions
+
+    def profile(self, key: str) -> StatementProfile:
+        """
+        주어진 key의 DataFrame 요약(크기, 컬럼 타입, 재무제표 구분별 행 수, 금액 상위 계정, 주요 재무 항목)을 반환합니다.
+        저장 시점에 계산되며, 같은 key로 데이터가 다시 추가될 때만 새로 계산합니다.
+        
+        Raises:
+            KeyError: 해당 key의 데이터가 존재하지 않을 경우 발생.
+        """
+        profile = self._profiles.get(key)
+        if profile is None:
+            df = self._load(key)
+            standard = self.standard_accounts(key) if "account_id" in df.columns else None
+            profile = build_profile(df, standard)
+            self._profiles[key] = profile
+        return profile
+
+    def find_key(self, data: pd.DataFrame) -> Optional[str]:
+        """메모리에 있는 DataFrame 객체의 key를 반환합니다 (저장된 객체가 아니면 None)."""
+        for key, value in list(self._data.items()):
+            if value is data:
+                return key
+        return None
 
     def list_keys(self) -> List[str]:
         """
@@ -52,4 +912,4 @@ class SessionDataStore:
         Returns:
             List[str]: 모든 데이터 키의 리스트.
         """
-        return list(self._data.keys()) 
+        return list(self._metadata.keys()) 
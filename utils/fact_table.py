@@ -0,0 +1,350 @@
+"""
+회사 × 연도 × 계정 재무 팩트 테이블 모듈
+
+SessionDataStore에 저장되는 재무제표 DataFrame(넓은 형식)을 한 행이
+(corp_code, bsns_year, reprt_code, fs_div, sj_div, account_id, period) 하나인
+긴 형식으로 펼쳐 누적합니다. 여러 회사/연도 비교를 DataFrame 여러 개를 필터링하고
+합치는 코드 없이, 하나의 테이블에서 선택(select)과 피벗(pivot)으로 처리할 수 있습니다.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# 팩트 한 행을 식별하는 키 (MultiIndex 순서)
+FACT_KEYS = ["corp_code", "bsns_year", "reprt_code", "fs_div", "sj_div", "account_id", "period"]
+
+# 금액 컬럼 → (period 이름, 사업연도 대비 회계연도 차이)
+PERIOD_COLUMNS = {
+    "thstrm_amount": ("thstrm", 0),
+    "thstrm_add_amount": ("thstrm_add", 0),
+    "frmtrm_amount": ("frmtrm", -1),
+    "frmtrm_q_amount": ("frmtrm_q", -1),
+    "frmtrm_add_amount": ("frmtrm_add", -1),
+    "bfefrmtrm_amount": ("bfefrmtrm", -2),
+}
+
+# 팩트로 변환하려면 반드시 있어야 하는 컬럼
+REQUIRED_COLUMNS = ("sj_div", "account_id", "account_nm")
+
+_CATEGORY_COLUMNS = ["corp_code", "corp_name", "reprt_code", "fs_div", "sj_div",
+                     "account_id", "account_nm", "period"]
+
+# 표준계정코드가 없는 계정의 account_id 접두어
+CUSTOM_ACCOUNT_PREFIX = "custom:"
+
+
+def _column_or_default(df: pd.DataFrame, metadata: Dict[str, Any], name: str,
+                       default: Optional[str] = None) -> Optional[pd.Series]:
+    """metadata 값이 있으면 그 값을, 없으면 DataFrame 컬럼을, 둘 다 없으면 default를 사용합니다."""
+    value = metadata.get(name)
+    if value is None and name in df.columns:
+        return df[name].astype(str)
+    if value is None:
+        value = default
+    if value is None:
+        return None
+    return pd.Series(str(value), index=df.index)
+
+
+def _account_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    팩트 키로 쓸 계정 ID를 만듭니다.
+
+    표준계정코드가 없는 계정("-표준계정코드 미사용-")은 계정명으로 구분하고,
+    자본변동표처럼 account_detail로 세분된 계정은 상세 구분을 붙여 행이 겹치지 않게 합니다.
+    """
+    account_id = df["account_id"].astype(str)
+    nonstandard = account_id.str.startswith("-") | account_id.isin(["", "nan", "<NA>"])
+    account_id = account_id.where(~nonstandard, CUSTOM_ACCOUNT_PREFIX + df["account_nm"].astype(str))
+    if "account_detail" in df.columns:
+        detail = df["account_detail"].astype(str)
+        has_detail = ~detail.isin(["-", "", "nan", "<NA>"])
+        account_id = account_id.where(~has_detail, account_id + "|" + detail)
+    return account_id
+
+
+def to_facts(df: pd.DataFrame, metadata: Optional[Dict[str, Any]] = None) -> Optional[pd.DataFrame]:
+    """
+    재무제표 DataFrame을 긴 형식의 팩트로 변환합니다.
+
+    Args:
+        df (pd.DataFrame): 단일회사 전체 재무제표 DataFrame
+        metadata (dict, optional): corp_code, corp_name, bsns_year, reprt_code, fs_div 등
+                                   DataFrame에 없는 식별 정보
+
+    Returns:
+        Optional[pd.DataFrame]: 팩트 DataFrame (재무제표 형식이 아니면 None)
+    """
+    metadata = metadata or {}
+    amount_columns = [col for col in PERIOD_COLUMNS if col in df.columns]
+    if df.empty or not amount_columns or any(col not in df.columns for col in REQUIRED_COLUMNS):
+        return None
+
+    corp_code = _column_or_default(df, metadata, "corp_code")
+    bsns_year = _column_or_default(df, metadata, "bsns_year")
+    if corp_code is None or bsns_year is None:
+        return None
+
+    base = pd.DataFrame({
+        "corp_code": corp_code,
+        "corp_name": _column_or_default(df, metadata, "corp_name", metadata.get("corp_code")),
+        "bsns_year": pd.to_numeric(bsns_year, errors="coerce").astype("Int16"),
+        "reprt_code": _column_or_default(df, metadata, "reprt_code", "11011"),
+        "fs_div": _column_or_default(df, metadata, "fs_div", ""),
+        "sj_div": df["sj_div"].astype(str),
+        "account_id": _account_keys(df),
+        "account_nm": df["account_nm"].astype(str),
+    })
+    if base["corp_name"].isna().all():
+        base["corp_name"] = base["corp_code"]
+
+    parts = []
+    for col in amount_columns:
+        period, offset = PERIOD_COLUMNS[col]
+        amount = df[col].astype("Int64")
+        part = base[amount.notna().to_numpy()].copy()
+        part["period"] = period
+        part["fiscal_year"] = (part["bsns_year"] + offset).astype("Int16")
+        part["amount"] = amount[amount.notna()]
+        parts.append(part)
+
+    facts = pd.concat(parts, ignore_index=True)
+    return facts.drop_duplicates(subset=FACT_KEYS, keep="first")
+
+
+def _remove_part_file(part):
+    """내려놓은 팩트 파일을 삭제합니다 (DataFrame이거나 없으면 무시)."""
+    if isinstance(part, str):
+        try:
+            os.remove(part)
+        except OSError:
+            pass
+
+
+def _as_list(value: Union[None, str, int, Iterable]) -> Optional[List]:
+    """단일 값 또는 목록 인자를 목록으로 통일합니다."""
+    if value is None:
+        return None
+    if isinstance(value, (str, int)):
+        return [value]
+    return list(value)
+
+
+class FactTable:
+    """
+    SessionDataStore와 함께 유지되는 재무 팩트 테이블.
+
+    저장소 키별로 변환된 팩트를 보관하다가 조회 시점에 하나의 테이블로 합쳐
+    FACT_KEYS로 정렬된 MultiIndex를 만듭니다 (추가 후 첫 조회 때만 다시 합칩니다).
+    메모리 예산을 넘으면 저장소 키별 팩트는 Parquet 파일로 내려놓고(spill),
+    합친 테이블은 해제했다가(release) 다음 조회 때 다시 만듭니다.
+    """
+
+    def __init__(self):
+        # 저장소 키 → 팩트 DataFrame 또는 내려놓은 Parquet 파일 경로 (추가 순서 유지)
+        self._parts: Dict[str, Union[pd.DataFrame, str]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._frame: Optional[pd.DataFrame] = None
+        self._frame_bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "FactTable":
+        """
+        이미 만들어진 팩트 테이블(frame 속성 값)로 조회 전용 FactTable을 만듭니다.
+        샌드박스 작업 프로세스처럼 원본 DataFrame 없이 팩트만 전달받는 곳에서 사용합니다.
+        """
+        table = cls()
+        table._frame = frame
+        return table
+
+    def append(self, source_key: str, df: pd.DataFrame, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        저장소 키의 DataFrame을 팩트로 변환하여 추가합니다 (같은 키는 교체).
+
+        Returns:
+            int: 추가된 팩트 행 수 (재무제표 형식이 아니면 0)
+        """
+        facts = to_facts(df, metadata)
+        if facts is None:
+            return 0
+        with self._lock:
+            old = self._parts.get(source_key)
+            self._parts[source_key] = facts
+            self._sizes[source_key] = int(facts.memory_usage(index=True, deep=True).sum())
+            self._invalidate()
+        _remove_part_file(old)
+        return len(facts)
+
+    def remove(self, source_key: str):
+        """저장소 키의 팩트를 제거합니다."""
+        with self._lock:
+            old = self._parts.pop(source_key, None)
+            self._sizes.pop(source_key, None)
+            if old is not None:
+                self._invalidate()
+        _remove_part_file(old)
+
+    def _invalidate(self):
+        """합친 테이블을 버립니다 (잠금을 잡은 상태에서 호출)."""
+        self._frame = None
+        self._frame_bytes = 0
+
+    def spill(self, source_key: str, path: str) -> bool:
+        """
+        저장소 키의 팩트를 Parquet 파일로 내려놓고 메모리에서 해제합니다.
+        파일은 잠금 밖에서 쓰며, 그 사이 같은 키의 팩트가 바뀌면 내려놓지 않습니다.
+        
+        Returns:
+            bool: 내려놓았으면 True
+        """
+        with self._lock:
+            part = self._parts.get(source_key)
+        if not isinstance(part, pd.DataFrame):
+            return False
+        try:
+            part.to_parquet(path)
+        except Exception as e:
+            print(f"팩트 디스크 저장 중 오류 발생 ({source_key}): {e}")
+            _remove_part_file(path)
+            return False
+        with self._lock:
+            if self._parts.get(source_key) is part:
+                self._parts[source_key] = path
+                self._sizes.pop(source_key, None)
+                return True
+        _remove_part_file(path)
+        return False
+
+    def release(self) -> bool:
+        """합친 테이블을 메모리에서 해제합니다 (다음 조회 때 다시 만듦). 해제했으면 True를 반환합니다."""
+        with self._lock:
+            if self._frame is None:
+                return False
+            self._invalidate()
+            return True
+
+    def memory_bytes(self) -> int:
+        """메모리에 있는 저장소 키별 팩트와 합친 테이블의 크기(bytes)를 반환합니다."""
+        with self._lock:
+            return sum(self._sizes.values()) + self._frame_bytes
+
+    def source_keys(self) -> List[str]:
+        """팩트가 있는 저장소 키 목록을 반환합니다."""
+        return list(self._parts)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """전체 팩트 테이블 (FACT_KEYS MultiIndex, 정렬됨)"""
+        with self._lock:
+            if self._frame is None:
+                self._frame = self._build()
+                self._frame_bytes = int(self._frame.memory_usage(index=True, deep=True).sum())
+            return self._frame
+
+    def _build(self) -> pd.DataFrame:
+        """저장소 키별 팩트를 하나의 인덱스 테이블로 합칩니다."""
+        if not self._parts:
+            columns = FACT_KEYS + ["corp_name", "account_nm", "fiscal_year", "amount"]
+            return pd.DataFrame(columns=columns).set_index(FACT_KEYS)
+        parts = [pd.read_parquet(part) if isinstance(part, str) else part for part in self._parts.values()]
+        facts = pd.concat(parts, ignore_index=True)
+        # 같은 재무제표가 여러 키로 저장된 경우 나중에 저장된 값을 사용
+        facts = facts.drop_duplicates(subset=FACT_KEYS, keep="last")
+        for col in _CATEGORY_COLUMNS:
+            facts[col] = facts[col].astype("category")
+        return facts.set_index(FACT_KEYS).sort_index()
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def select(self,
+               corp_codes=None,
+               corp_names=None,
+               years=None,
+               bsns_years=None,
+               reprt_codes=None,
+               fs_div=None,
+               sj_div=None,
+               accounts=None,
+               period: Optional[str] = "thstrm") -> pd.DataFrame:
+        """
+        조건에 맞는 팩트를 반환합니다. 각 조건은 단일 값 또는 목록을 받습니다.
+
+        Args:
+            corp_codes: 회사 고유번호
+            corp_names: 회사명
+            years: 회계연도 (당기/전기/전전기를 실제 연도로 환산한 값)
+            bsns_years: 보고서 사업연도
+            reprt_codes: 보고서 코드 (11011: 사업보고서 등)
+            fs_div: CFS(연결) / OFS(개별)
+            sj_div: BS, IS, CIS, CF, SCE
+            accounts: 계정 ID 또는 계정명 (정확히 일치, 상세 구분이 붙은 계정 ID는 기본 ID로도 일치)
+            period: thstrm(당기, 기본값), frmtrm(전기), bfefrmtrm(전전기) 등. None이면 모든 기간
+
+        Returns:
+            pd.DataFrame: FACT_KEYS를 컬럼으로 가진 팩트 DataFrame
+        """
+        frame = self.frame
+        index = frame.index
+        mask = np.ones(len(frame), dtype=bool)
+
+        for level, value in (("corp_code", corp_codes), ("bsns_year", bsns_years),
+                             ("reprt_code", reprt_codes), ("fs_div", fs_div),
+                             ("sj_div", sj_div), ("period", period)):
+            values = _as_list(value)
+            if values is not None:
+                if level == "bsns_year":
+                    values = [int(v) for v in values]
+                mask &= index.get_level_values(level).isin(values)
+
+        names = _as_list(corp_names)
+        if names is not None:
+            mask &= frame["corp_name"].isin(names).to_numpy()
+        fiscal_years = _as_list(years)
+        if fiscal_years is not None:
+            mask &= frame["fiscal_year"].isin([int(y) for y in fiscal_years]).to_numpy()
+        account_list = _as_list(accounts)
+        if account_list is not None:
+            account_ids = index.get_level_values("account_id")
+            base_ids = account_ids.str.split("|", n=1).str[0]
+            mask &= (account_ids.isin(account_list) | base_ids.isin(account_list)
+                     | frame["account_nm"].isin(account_list).to_numpy())
+
+        return frame[mask].reset_index()
+
+    def pivot(self, index: Union[str, List[str]] = "corp_name",
+              columns: Union[str, List[str]] = "fiscal_year",
+              values: str = "amount", **filters) -> pd.DataFrame:
+        """
+        조건에 맞는 팩트를 피벗합니다. 같은 칸에 여러 값이 있으면 첫 번째 값을 사용합니다.
+
+        Args:
+            index: 행으로 쓸 컬럼 (기본값: 회사명)
+            columns: 열로 쓸 컬럼 (기본값: 회계연도)
+            values: 값 컬럼 (기본값: amount)
+            **filters: select()의 조건
+
+        Examples:
+            facts.pivot(columns="fiscal_year", accounts="매출액")
+            facts.pivot(index=["corp_name", "fiscal_year"], columns="account_nm",
+                        accounts=["매출액", "영업이익"])
+        """
+        selected = self.select(**filters)
+        if selected.empty:
+            return pd.DataFrame()
+        return selected.pivot_table(index=index, columns=columns, values=values,
+                                    aggfunc="first", observed=True)
+
+    def company_year(self, account: str, **filters) -> pd.DataFrame:
+        """계정 하나에 대한 회사 × 회계연도 표를 반환합니다."""
+        return self.pivot(index="corp_name", columns="fiscal_year", accounts=account, **filters)
+
+    def company_account(self, accounts: Union[str, List[str]], year=None, **filters) -> pd.DataFrame:
+        """회계연도 하나(또는 전체)에 대한 회사 × 계정 표를 반환합니다."""
+        index = "corp_name" if year is not None else ["corp_name", "fiscal_year"]
+        return self.pivot(index=index, columns="account_nm", accounts=accounts, years=year, **filters)
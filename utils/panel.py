@@ -0,0 +1,180 @@
+"""
+다년도 재무 패널 모듈
+
+사업보고서(fnlttSinglAcntAll) 한 건에는 당기/전기/전전기(thstrm/frmtrm/bfefrmtrm) 금액이 함께 있으므로
+3개 회계연도를 담고 있습니다. 재무 팩트 테이블(FactTable)의 팩트를 회계연도 기준으로 모아
+(회사, 계정) × 회계연도 패널을 만들고, 여러 보고서에 같은 연도가 있으면 가장 최근 보고서
+(재작성된 값)를 사용합니다. 전년 대비 증가율과 CAGR은 패널 전체에 대해 한 번에 계산합니다.
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.account_taxonomy import STANDARD_ACCOUNTS, canonical_metric
+from utils.fact_table import CUSTOM_ACCOUNT_PREFIX, FactTable
+
+# 사업보고서 한 건으로 조회되는 회계연도 수 (당기, 전기, 전전기)
+PANEL_PERIODS = ["thstrm", "frmtrm", "bfefrmtrm"]
+YEARS_PER_REPORT = len(PANEL_PERIODS)
+
+# 같은 보고서 안에서 같은 지표에 여러 행이 맞을 때의 순위 기본값
+_UNRANKED = 99
+
+
+def covering_years(years: List[Union[str, int]]) -> List[str]:
+    """
+    주어진 회계연도를 모두 포함하는 데 필요한 최소한의 사업보고서 사업연도를 반환합니다.
+    가장 최근 연도부터 3년 간격으로 고르므로 2019~2023년은 2023, 2020년 보고서 두 건이면 됩니다.
+
+    Returns:
+        List[str]: 조회할 사업연도 목록 (최근 연도 순)
+    """
+    remaining = sorted({int(year) for year in years}, reverse=True)
+    selected = []
+    while remaining:
+        latest = remaining[0]
+        selected.append(str(latest))
+        remaining = [year for year in remaining if year <= latest - YEARS_PER_REPORT]
+    return selected
+
+
+def _metric_table(metrics: List[str]) -> Tuple[Dict[str, Tuple[str, int]], Dict[str, Dict[str, int]]]:
+    """
+    요청한 지표를 찾을 팩트 account_id → (지표, 순위) 테이블과 지표별 재무제표 구분 순위를 만듭니다.
+    표준 지표는 IFRS 계정 ID와 자체 정의 계정의 표준 계정명으로, 그 밖의 지표는 이름 그대로 찾습니다.
+    """
+    wanted: Dict[str, Tuple[str, int]] = {}
+    sj_ranks: Dict[str, Dict[str, int]] = {}
+    for metric in metrics:
+        canonical = canonical_metric(metric)
+        if canonical is None:
+            identifiers = [metric, CUSTOM_ACCOUNT_PREFIX + metric]
+        else:
+            account = STANDARD_ACCOUNTS[canonical]
+            identifiers = list(account.account_ids) + [CUSTOM_ACCOUNT_PREFIX + name for name in account.names]
+            sj_ranks[metric] = {sj_div: rank for rank, sj_div in enumerate(account.sj_divs)}
+        for rank, identifier in enumerate(identifiers):
+            wanted.setdefault(identifier, (metric, rank))
+    return wanted, sj_ranks
+
+
+def build_panel(facts: FactTable,
+                metrics: Optional[List[str]] = None,
+                corp_names=None,
+                fs_div=None,
+                reprt_code: str = "11011") -> pd.DataFrame:
+    """
+    팩트 테이블에서 (회사, 계정) × 회계연도 패널을 만듭니다.
+
+    Args:
+        facts (FactTable): 재무 팩트 테이블
+        metrics (List[str], optional): 지표 목록 (표준 지표명, 별칭, 계정 ID 또는 계정명).
+                                       없으면 모든 계정을 (재무제표 구분, 계정명)별로 포함합니다.
+        corp_names: 회사명 (단일 값 또는 목록)
+        fs_div: CFS(연결) / OFS(개별)
+        reprt_code (str): 보고서 코드 (기본값: 사업보고서 11011)
+
+    Returns:
+        pd.DataFrame: 인덱스 (corp_name, [fs_div], account) 또는 (corp_name, [fs_div], sj_div, account),
+                      컬럼은 연속된 회계연도 (값은 원 단위 float, 없는 연도는 NaN).
+                      fs_div 레벨은 두 가지 이상 섞여 있을 때만 포함됩니다.
+    """
+    selected = facts.select(corp_names=corp_names, fs_div=fs_div, reprt_codes=reprt_code, period=PANEL_PERIODS)
+    if selected.empty:
+        return pd.DataFrame()
+
+    account_ids = selected["account_id"].astype(str)
+    selected["has_detail"] = account_ids.str.contains("|", regex=False)
+    keys = ["corp_code", "fs_div"]
+    if metrics is None:
+        selected["account"] = selected["account_nm"].astype(str)
+        selected["rank"] = 0
+        selected["sj_rank"] = 0
+        keys.append("sj_div")
+    else:
+        wanted, sj_ranks = _metric_table(list(dict.fromkeys(metrics)))
+        base_ids = account_ids.str.split("|", n=1).str[0]
+        matched = base_ids.map(wanted)
+        by_name = selected["account_nm"].astype(str).map(
+            {metric: (metric, len(wanted)) for metric in metrics if canonical_metric(metric) is None})
+        matched = matched.where(matched.notna(), by_name)
+        selected = selected[matched.notna()].copy()
+        if selected.empty:
+            return pd.DataFrame()
+        matched = matched[matched.notna()]
+        selected["account"] = [metric for metric, _ in matched]
+        selected["rank"] = [rank for _, rank in matched]
+        selected["sj_rank"] = [sj_ranks.get(metric, {}).get(str(sj_div), _UNRANKED)
+                               for metric, sj_div in zip(selected["account"], selected["sj_div"])]
+    keys += ["account", "fiscal_year"]
+
+    # 최근 보고서 우선, 같은 보고서 안에서는 계정 ID 순위 → 재무제표 구분 순위 → 상세 구분 없는 행
+    selected = selected.sort_values(["bsns_year", "rank", "sj_rank", "has_detail"],
+                                    ascending=[False, True, True, True], kind="stable")
+    selected = selected.drop_duplicates(subset=keys, keep="first")
+
+    index = ["corp_name"] + keys[1:-1]
+    if selected["fs_div"].nunique() <= 1:
+        index.remove("fs_div")
+    selected["corp_name"] = selected["corp_name"].astype(str)
+    selected["fiscal_year"] = selected["fiscal_year"].astype(int)
+    panel = (selected.set_index(index + ["fiscal_year"])["amount"]
+             .astype("float64")
+             .unstack("fiscal_year"))
+    # 중간에 빠진 연도도 컬럼으로 두어 증가율이 항상 인접한 연도끼리 계산되게 함
+    years = range(int(panel.columns.min()), int(panel.columns.max()) + 1)
+    panel = panel.reindex(columns=list(years))
+    panel.columns.name = "fiscal_year"
+    if metrics is not None:
+        # 회사명 순, 같은 회사 안에서는 요청한 지표 순
+        order = {metric: i for i, metric in enumerate(dict.fromkeys(metrics))}
+        positions = pd.DataFrame({
+            "corp_name": panel.index.get_level_values("corp_name"),
+            "account": panel.index.get_level_values("account").map(order),
+        }).sort_values(["corp_name", "account"], kind="stable").index
+        panel = panel.iloc[positions]
+    return panel
+
+
+def yoy_growth(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    전년 대비 증가율(%)을 계산합니다: (당해 - 전년) / |전년| × 100.
+    전년 값이 없거나 0이면 NaN입니다.
+    """
+    previous = panel.shift(1, axis=1)
+    base = previous.abs()
+    return (panel - previous) / base.where(base != 0) * 100
+
+
+def cagr(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    행별로 값이 있는 첫 연도부터 마지막 연도까지의 연평균 성장률(CAGR, %)을 계산합니다.
+    시작 값과 끝 값이 모두 양수이고 기간이 1년 이상일 때만 계산합니다.
+
+    Returns:
+        pd.DataFrame: start_year, end_year, cagr 컬럼 (패널과 같은 인덱스)
+    """
+    if panel.empty:
+        return pd.DataFrame(columns=["start_year", "end_year", "cagr"], index=panel.index)
+
+    values = panel.to_numpy(dtype="float64")
+    years = np.asarray(panel.columns, dtype="float64")
+    valid = ~np.isnan(values)
+    has_value = valid.any(axis=1)
+    first = valid.argmax(axis=1)
+    last = values.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+
+    rows = np.arange(len(values))
+    start, end = values[rows, first], values[rows, last]
+    periods = years[last] - years[first]
+    computable = has_value & (start > 0) & (end > 0) & (periods > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (np.power(end / start, 1 / np.where(computable, periods, 1)) - 1) * 100
+
+    return pd.DataFrame({
+        "start_year": pd.array(np.where(has_value, years[first], np.nan), dtype="Int64"),
+        "end_year": pd.array(np.where(has_value, years[last], np.nan), dtype="Int64"),
+        "cagr": np.where(computable, growth, np.nan),
+    }, index=panel.index)
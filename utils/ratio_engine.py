@@ -0,0 +1,220 @@
+"""
+재무비율 엔진 모듈
+
+SessionDataStore에 재무제표가 추가될 때마다 비율 계산에 필요한 표준 지표(자산총계, 매출액 등)의
+당기/전기 금액만 뽑아 저장소 키별 한 행으로 보관합니다. 비율은 조회 시점에 모든 행에 대해
+컬럼 단위 산술로 한 번에 계산하고, 새 데이터가 추가되기 전까지 결과를 재사용합니다.
+"""
+
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.account_taxonomy import resolve
+
+
+class Ratio(NamedTuple):
+    """분자/분모 지표로 정의되는 재무비율 (단위: %)"""
+    name: str
+    numerator: str
+    denominator: str
+    description: str
+
+
+# 표준 재무비율 (분자/분모는 account_taxonomy의 표준 지표명)
+RATIOS: Dict[str, Ratio] = {ratio.name: ratio for ratio in [
+    # 안정성
+    Ratio("부채비율", "부채총계", "자본총계", "부채총계 / 자본총계 × 100"),
+    Ratio("자기자본비율", "자본총계", "자산총계", "자본총계 / 자산총계 × 100"),
+    Ratio("유동비율", "유동자산", "유동부채", "유동자산 / 유동부채 × 100"),
+    # 수익성
+    Ratio("ROE", "당기순이익", "자본총계", "당기순이익 / 기말 자본총계 × 100"),
+    Ratio("ROA", "당기순이익", "자산총계", "당기순이익 / 기말 자산총계 × 100"),
+    Ratio("매출총이익률", "매출총이익", "매출액", "매출총이익 / 매출액 × 100"),
+    Ratio("영업이익률", "영업이익", "매출액", "영업이익 / 매출액 × 100"),
+    Ratio("순이익률", "당기순이익", "매출액", "당기순이익 / 매출액 × 100"),
+]}
+
+# 전기 대비 증가율: 비율명 → 지표 ((당기 - 전기) / |전기| × 100)
+GROWTH_RATIOS: Dict[str, str] = {
+    "매출액증가율": "매출액",
+    "영업이익증가율": "영업이익",
+    "당기순이익증가율": "당기순이익",
+    "자산총계증가율": "자산총계",
+}
+
+# 사용자가 흔히 쓰는 다른 이름 → 비율명
+RATIO_ALIASES = {
+    "자기자본이익률": "ROE",
+    "총자산이익률": "ROA",
+    "영업이익율": "영업이익률",
+    "순이익율": "순이익률",
+    "매출성장률": "매출액증가율",
+    "매출액성장률": "매출액증가율",
+    "매출 YoY": "매출액증가율",
+    "영업이익성장률": "영업이익증가율",
+    "순이익증가율": "당기순이익증가율",
+}
+
+RATIO_NAMES: List[str] = list(RATIOS) + list(GROWTH_RATIOS)
+
+# 비율 계산에 필요한 표준 지표
+BASE_METRICS: List[str] = list(dict.fromkeys(
+    [metric for ratio in RATIOS.values() for metric in (ratio.numerator, ratio.denominator)]
+    + list(GROWTH_RATIOS.values())
+))
+
+LABEL_COLUMNS = ["corp_name", "bsns_year", "fs_div"]
+
+
+def canonical_ratio(name: str) -> Optional[str]:
+    """비율명 또는 별칭을 표준 비율명으로 바꿉니다. 알 수 없는 이름이면 None을 반환합니다."""
+    name = name.strip()
+    if name in RATIO_NAMES:
+        return name
+    if name in RATIO_ALIASES:
+        return RATIO_ALIASES[name]
+    upper = name.upper()
+    return upper if upper in RATIOS else None
+
+
+def describe_ratio(name: str) -> str:
+    """비율의 계산식 설명을 반환합니다."""
+    if name in RATIOS:
+        return RATIOS[name].description
+    metric = GROWTH_RATIOS[name]
+    return f"(당기 {metric} - 전기 {metric}) / |전기 {metric}| × 100"
+
+
+def compute_ratios(current: pd.DataFrame, previous: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    기초 지표 컬럼으로 모든 표준 비율을 컬럼 단위로 계산합니다.
+
+    Args:
+        current (pd.DataFrame): 행별 당기 금액 (컬럼: 표준 지표명)
+        previous (pd.DataFrame, optional): 같은 인덱스의 전기 금액 (없으면 증가율은 NaN)
+
+    Returns:
+        pd.DataFrame: 같은 인덱스, RATIO_NAMES 컬럼의 비율 표 (단위: %, 분모가 0이거나 없으면 NaN)
+    """
+    current = current.reindex(columns=BASE_METRICS).astype("float64")
+    previous = (previous.reindex(index=current.index, columns=BASE_METRICS).astype("float64")
+                if previous is not None else pd.DataFrame(np.nan, index=current.index, columns=BASE_METRICS))
+
+    ratios = {}
+    for ratio in RATIOS.values():
+        denominator = current[ratio.denominator]
+        ratios[ratio.name] = current[ratio.numerator] / denominator.where(denominator != 0) * 100
+    for name, metric in GROWTH_RATIOS.items():
+        base = previous[metric].abs()
+        ratios[name] = (current[metric] - previous[metric]) / base.where(base != 0) * 100
+    return pd.DataFrame(ratios, index=current.index).replace([np.inf, -np.inf], np.nan)
+
+
+class RatioEngine:
+    """
+    SessionDataStore와 함께 유지되는 재무비율 테이블.
+
+    update()는 저장소 키 하나의 기초 지표만 추출하므로 데이터가 추가될 때 비용이 작고,
+    비율 계산은 frame을 처음 조회할 때 전체 키에 대해 한 번에 수행합니다.
+    """
+
+    def __init__(self):
+        self._labels: Dict[str, Tuple] = {}
+        self._current: Dict[str, List[float]] = {}
+        self._previous: Dict[str, List[float]] = {}
+        self._frame: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+    def update(self, key: str, df: pd.DataFrame, label: Tuple = (None, None, ""),
+               standard: Optional[Dict[str, Tuple[int, str]]] = None) -> bool:
+        """
+        저장소 키의 재무제표에서 기초 지표를 추출합니다 (같은 키는 교체).
+
+        Args:
+            key (str): 저장소 키
+            df (pd.DataFrame): 단일회사 전체 재무제표 DataFrame
+            label (tuple): (회사명, 사업연도, 재무제표 구분) 표시용 정보
+            standard (dict, optional): 미리 계산한 standard_positions(df) 결과
+
+        Returns:
+            bool: 재무제표 형식이어서 비율 테이블에 반영되었는지 여부
+        """
+        if df.empty or any(col not in df.columns for col in ("account_nm", "sj_div", "thstrm_amount")):
+            self.remove(key)
+            return False
+
+        resolved = resolve(df, BASE_METRICS, amount_columns=("thstrm_amount", "frmtrm_amount"),
+                           standard=standard)
+        if resolved["position"].isna().all():
+            self.remove(key)
+            return False
+
+        current = pd.to_numeric(resolved["thstrm_amount"], errors="coerce").astype("float64")
+        previous = pd.to_numeric(resolved["frmtrm_amount"], errors="coerce").astype("float64")
+        with self._lock:
+            self._labels[key] = tuple(label)
+            self._current[key] = current.tolist()
+            self._previous[key] = previous.tolist()
+            self._frame = None
+        return True
+
+    def remove(self, key: str):
+        """저장소 키의 비율을 제거합니다."""
+        with self._lock:
+            if self._labels.pop(key, None) is not None:
+                self._current.pop(key, None)
+                self._previous.pop(key, None)
+                self._frame = None
+
+    def keys(self) -> List[str]:
+        """비율이 계산된 저장소 키 목록을 반환합니다."""
+        return list(self._labels)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """저장소 키 × (회사명, 사업연도, 재무제표 구분, 비율...) 테이블 (단위: %)"""
+        with self._lock:
+            if self._frame is None:
+                self._frame = self._build()
+            return self._frame
+
+    def _build(self) -> pd.DataFrame:
+        """보관된 기초 지표로 모든 비율을 컬럼 단위로 계산합니다."""
+        keys = list(self._labels)
+        labels = pd.DataFrame([self._labels[key] for key in keys], index=keys, columns=LABEL_COLUMNS)
+        current = pd.DataFrame([self._current[key] for key in keys], index=keys,
+                               columns=BASE_METRICS, dtype="float64")
+        previous = pd.DataFrame([self._previous[key] for key in keys], index=keys,
+                                columns=BASE_METRICS, dtype="float64")
+
+        frame = pd.concat([labels, compute_ratios(current, previous)], axis=1)
+        frame.index.name = "key"
+        return frame
+
+    def table(self, keys: Optional[List[str]] = None, ratios: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        (회사명, 사업연도, 재무제표 구분) × 비율 표를 반환합니다.
+
+        Args:
+            keys (List[str], optional): 저장소 키 목록 (기본값: 전체)
+            ratios (List[str], optional): 비율명 목록 (기본값: 전체, 별칭 허용)
+
+        Returns:
+            pd.DataFrame: 회사명/사업연도 순으로 정렬된 비율 표 (비율이 없는 키는 제외)
+        """
+        frame = self.frame
+        if keys is not None:
+            frame = frame.loc[[key for key in keys if key in frame.index]]
+        columns = RATIO_NAMES if ratios is None else [
+            name for name in dict.fromkeys(canonical_ratio(r) for r in ratios) if name is not None
+        ]
+        table = frame.set_index(LABEL_COLUMNS)[columns]
+        if table.index.get_level_values("fs_div").isin(["", None]).all():
+            table = table.droplevel("fs_div")
+        return table.sort_index()
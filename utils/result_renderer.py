@@ -0,0 +1,255 @@
+"""
+분석 도구 결과 렌더링 모듈
+
+도구가 에이전트에 돌려주는 표를 행/열/글자 수 예산 안에서 CSV 형식의 간결한 텍스트로 변환합니다.
+금액은 억원/조원 단위로 줄여 표시하고, 예산을 넘는 나머지 행은 결과 핸들에 보관하여
+get_result_page 도구로 나누어 조회할 수 있게 합니다. 큰 결과 전체를 to_string()으로 만들지 않으므로
+렌더링 비용과 LLM 컨텍스트 사용량이 결과 크기와 무관하게 일정합니다.
+"""
+
+import csv
+import io
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.account_taxonomy import PER_SHARE_METRICS, STANDARD_ACCOUNTS
+
+# 렌더링 예산 (한 번에 보여줄 최대 행/열/글자 수)
+MAX_ROWS = 30
+MAX_COLUMNS = 12
+MAX_CHARS = 4000
+MAX_CELL_CHARS = 40
+
+# 세션당 보관할 결과 핸들 수 (오래된 것부터 삭제)
+MAX_HANDLES = 20
+
+# 금액으로 표시할 컬럼 이름 (이 밖의 숫자 컬럼은 값이 1억 이상일 때 금액으로 간주)
+AMOUNT_METRICS = set(STANDARD_ACCOUNTS) - PER_SHARE_METRICS
+AMOUNT_THRESHOLD = 100_000_000
+
+PAGE_TOOL = "get_result_page"
+
+
+def format_amount(value) -> str:
+    """원 단위 금액을 조원/억원 단위 문자열로 변환합니다 (1억 미만은 원 단위)."""
+    if pd.isna(value):
+        return ""
+    value = float(value)
+    if abs(value) >= 1_000_000_000_000:
+        return f"{value / 1_000_000_000_000:.1f}조원"
+    if abs(value) >= AMOUNT_THRESHOLD:
+        return f"{value / AMOUNT_THRESHOLD:.0f}억원"
+    return f"{value:.0f}원"
+
+
+def _format_number(value) -> str:
+    """금액이 아닌 숫자를 소수점 둘째 자리까지 표시합니다."""
+    if pd.isna(value):
+        return ""
+    if isinstance(value, (int, np.integer)):
+        return str(value)
+    text = f"{float(value):.2f}"
+    return text.rstrip("0").rstrip(".") if "." in text else text
+
+
+def _format_text(value) -> str:
+    """문자열 값을 셀 글자 수 예산에 맞게 자릅니다."""
+    if value is None or (not isinstance(value, (list, tuple, dict)) and pd.isna(value)):
+        return ""
+    text = str(value).replace("\n", " ")
+    return text if len(text) <= MAX_CELL_CHARS else text[:MAX_CELL_CHARS - 1] + "…"
+
+
+def is_amount_column(name, series: pd.Series) -> bool:
+    """
+    컬럼 이름(금액 컬럼, 표준 금액 지표)이나 값(절댓값 1억 이상)으로 금액 컬럼인지 판단합니다.
+    NaN이나 나눗셈 때문에 float가 된 금액 컬럼(피벗, 평균 등)도 값으로 판단합니다.
+    """
+    if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+        return False
+    label = str(name)
+    if label.endswith("amount") or label in AMOUNT_METRICS:
+        return True
+    if len(series):
+        peak = series.abs().max()
+        return not pd.isna(peak) and peak >= AMOUNT_THRESHOLD
+    return False
+
+
+def _column_formatter(name, series: pd.Series, amount_columns: Optional[Iterable]):
+    """컬럼 하나의 셀 변환 함수를 고릅니다."""
+    if amount_columns is not None:
+        is_amount = name in amount_columns and pd.api.types.is_numeric_dtype(series)
+    else:
+        is_amount = is_amount_column(name, series)
+    if is_amount:
+        return format_amount, True
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return _format_number, False
+    return _format_text, False
+
+
+def _as_frame(result: Union[pd.DataFrame, pd.Series]) -> pd.DataFrame:
+    """Series는 한 컬럼 DataFrame으로 바꿉니다."""
+    if isinstance(result, pd.Series):
+        return result.to_frame(name=result.name if result.name is not None else "value")
+    return result
+
+
+def _has_default_index(df: pd.DataFrame) -> bool:
+    return isinstance(df.index, pd.RangeIndex) and df.index.name is None
+
+
+class ResultPager:
+    """
+    예산을 넘는 결과 표를 핸들로 보관하는 세션별 저장소.
+
+    최근 MAX_HANDLES개만 유지하며, 오래된 결과부터 삭제합니다.
+    """
+
+    def __init__(self, max_handles: int = MAX_HANDLES):
+        self._results: "OrderedDict[str, Tuple[pd.DataFrame, Optional[List]]]" = OrderedDict()
+        self._counter = 0
+        self._max_handles = max_handles
+        self._lock = threading.Lock()
+
+    def register(self, df: pd.DataFrame, amount_columns: Optional[Iterable] = None) -> str:
+        """결과 표를 보관하고 핸들을 반환합니다."""
+        with self._lock:
+            self._counter += 1
+            handle = f"result_{self._counter}"
+            self._results[handle] = (df, list(amount_columns) if amount_columns is not None else None)
+            while len(self._results) > self._max_handles:
+                self._results.popitem(last=False)
+            return handle
+
+    def get(self, handle: str) -> Tuple[pd.DataFrame, Optional[List]]:
+        """
+        핸들의 결과 표와 금액 컬럼 목록을 반환합니다.
+
+        Raises:
+            KeyError: 핸들이 없거나 이미 삭제된 경우
+        """
+        with self._lock:
+            if handle not in self._results:
+                raise KeyError(f"'{handle}' 결과를 찾을 수 없습니다. 만료되었을 수 있으니 다시 실행하세요.")
+            self._results.move_to_end(handle)
+            return self._results[handle]
+
+    def handles(self) -> List[str]:
+        """보관 중인 핸들 목록을 반환합니다."""
+        return list(self._results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+def render_frame(result: Union[pd.DataFrame, pd.Series],
+                 pager: Optional[ResultPager] = None,
+                 title: str = "DataFrame 결과",
+                 offset: int = 0,
+                 handle: Optional[str] = None,
+                 columns: Optional[List[str]] = None,
+                 amount_columns: Optional[Iterable] = None,
+                 max_rows: int = MAX_ROWS,
+                 max_columns: int = MAX_COLUMNS,
+                 max_chars: int = MAX_CHARS) -> str:
+    """
+    DataFrame/Series를 예산 안의 CSV 형식 텍스트로 변환합니다.
+
+    Args:
+        result: 변환할 DataFrame 또는 Series
+        pager (ResultPager, optional): 남은 행이 있을 때 결과를 보관할 저장소 (없으면 생략 표시만 함)
+        title (str): 첫 줄에 표시할 제목
+        offset (int): 시작 행 위치
+        handle (str, optional): 이미 보관된 결과의 핸들 (페이지 조회 시)
+        columns (List[str], optional): 표시할 컬럼 (기본값: 앞에서부터 max_columns개)
+        amount_columns (Iterable, optional): 억원/조원으로 표시할 컬럼 (기본값: 이름과 값으로 자동 판단)
+        max_rows (int): 최대 행 수
+        max_columns (int): 최대 열 수
+        max_chars (int): 최대 글자 수 (행 단위로 자름)
+
+    Returns:
+        str: 제목, CSV 헤더/행, 남은 행 안내로 구성된 텍스트
+    """
+    df = _as_frame(result)
+    total_rows, total_columns = df.shape
+    offset = max(0, min(int(offset), total_rows))
+
+    page = df.iloc[offset:offset + max_rows]
+    if not _has_default_index(page):
+        page = page.reset_index()
+        index_columns = [col for col in page.columns if col not in df.columns]
+    else:
+        index_columns = []
+
+    if columns:
+        unknown = [col for col in columns if col not in page.columns]
+        if unknown:
+            raise KeyError(f"존재하지 않는 컬럼입니다: {unknown}")
+        selected = index_columns + [col for col in columns if col not in index_columns]
+    else:
+        selected = index_columns + [col for col in page.columns if col not in index_columns][:max_columns]
+    omitted = [col for col in df.columns if col not in selected]
+    page = page[selected]
+
+    formatters = []
+    has_amounts = False
+    for col in page.columns:
+        formatter, is_amount = _column_formatter(col, page[col], amount_columns)
+        formatters.append(formatter)
+        has_amounts = has_amounts or is_amount
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow([_format_text(col) for col in page.columns])
+    shown = 0
+    for row in page.itertuples(index=False, name=None):
+        position = buffer.tell()
+        writer.writerow([formatter(value) for formatter, value in zip(formatters, row)])
+        if buffer.tell() > max_chars and shown > 0:
+            buffer.seek(position)
+            buffer.truncate()
+            break
+        shown += 1
+
+    header = f"{title} (shape: ({total_rows}, {total_columns})"
+    if total_rows:
+        header += f", 행 {offset + 1}-{offset + shown}" if shown else ""
+    header += ", 금액은 억원/조원 단위" if has_amounts else ""
+    lines = [header + ")", buffer.getvalue().rstrip("\n")]
+
+    if omitted:
+        names = ", ".join(str(col) for col in omitted[:10]) + (" 등" if len(omitted) > 10 else "")
+        lines.append(f"... 생략된 컬럼 {len(omitted)}개: {names} (columns 인자로 선택 가능)")
+
+    remaining = total_rows - offset - shown
+    if remaining > 0:
+        if handle is None and pager is not None:
+            handle = pager.register(df, amount_columns)
+        if handle is not None:
+            lines.append(f"... 이후 {remaining:,}개 행이 더 있습니다: "
+                         f"{PAGE_TOOL}(handle=\"{handle}\", offset={offset + shown})")
+        else:
+            lines.append(f"... 이후 {remaining:,}개 행 생략")
+    return "\n".join(lines)
+
+
+def render_text(text: str, max_chars: int = MAX_CHARS) -> str:
+    """긴 문자열 결과를 글자 수 예산에 맞게 자릅니다."""
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars] + f"\n... 이후 {len(text) - max_chars:,}자 생략 (결과를 DataFrame으로 반환하면 나누어 조회할 수 있습니다)"
+
+
+def render_value(value, pager: Optional[ResultPager] = None, title: Optional[str] = None) -> str:
+    """도구 실행 결과를 종류에 맞게 렌더링합니다 (DataFrame/Series는 표, 그 밖의 값은 문자열)."""
+    if isinstance(value, pd.DataFrame):
+        return render_frame(value, pager, title or "DataFrame 결과")
+    if isinstance(value, pd.Series):
+        return render_frame(value, pager, title or "Series 결과")
+    return render_text(str(value))
@@ -0,0 +1,457 @@
+"""
+LLM이 생성한 파이썬 코드를 격리된 작업 프로세스에서 실행하는 샌드박스 풀 모듈
+
+execute_python_on_dataframes의 코드는 서버 프로세스가 아닌 미리 띄워 둔 작업 프로세스에서 실행됩니다.
+- 작업 프로세스는 pandas/numpy를 미리 import한 forkserver에서 만들어지므로 시작 비용이 작습니다.
+- 저장소의 DataFrame은 저장소가 디스크에 내려놓는 파일(없으면 이때 한 번 씀)을 작업 프로세스가
+  직접 읽어 pickle 직렬화 없이 공유합니다. 팩트 테이블은 코드에서 facts를 사용할 때만
+  Arrow IPC 파일(디스크)로 내보냅니다 (pyarrow가 없으면 파이프로 전달합니다).
+- 호출마다 CPU 시간/실행 시간 제한과 메모리(RSS) 한도를 적용하고, 한도를 넘은 작업 프로세스는
+  종료한 뒤 새로 띄웁니다. 정해진 횟수만큼 실행한 작업 프로세스도 새것으로 교체합니다.
+"""
+
+import atexit
+import itertools
+import multiprocessing
+import os
+import queue
+import re
+import signal
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+import weakref
+from collections.abc import Mapping
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+# 샌드박스 설정 (환경 변수로 재정의 가능)
+SANDBOX_ENABLED = os.getenv("DART_SANDBOX", "1") != "0"
+SANDBOX_WORKERS = int(os.getenv("DART_SANDBOX_WORKERS", "2"))
+SANDBOX_MAX_TASKS = int(os.getenv("DART_SANDBOX_MAX_TASKS", "50"))
+SANDBOX_CPU_SECONDS = float(os.getenv("DART_SANDBOX_CPU_SECONDS", "10"))
+SANDBOX_WALL_SECONDS = float(os.getenv("DART_SANDBOX_WALL_SECONDS", "30"))
+SANDBOX_MAX_RSS_MB = int(os.getenv("DART_SANDBOX_MAX_RSS_MB", "1024"))
+
+# 작업 프로세스에 미리 import할 모듈
+PRELOAD_MODULES = ["numpy", "pandas", "utils.fact_table", "utils.sandbox"]
+
+# 팩트 테이블을 전달할 때 쓰는 예약 키
+FACTS_KEY = "__facts__"
+
+# 메모리 사용량 확인 주기 (초)
+_POLL_INTERVAL = 0.05
+
+# 실행 결과를 돌려받는 디렉터리 (결과를 읽은 즉시 삭제하므로 공유 메모리 사용)
+_SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+# 팩트 테이블처럼 여러 번 재사용하는 파일을 내보내는 디렉터리 (메모리를 차지하지 않도록 디스크 사용)
+EXPORT_DIR = os.getenv("DART_SANDBOX_EXPORT_DIR", tempfile.gettempdir())
+
+
+class _CpuTimeExceeded(Exception):
+    """작업 프로세스의 CPU 시간 제한 초과"""
+
+
+def run_code(code: str, namespace: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    코드를 실행하고 'result' 변수 값을 반환합니다. DataFrame/Series가 아닌 값은 문자열로 변환합니다.
+
+    Returns:
+        Dict[str, Any]: {"value": DataFrame, Series 또는 문자열} 또는 {"error": 메시지}
+    """
+    namespace = dict(namespace, result=None)
+    try:
+        exec(code, namespace)
+    except _CpuTimeExceeded:
+        raise
+    except Exception as e:
+        return {"error": f"코드 실행 중 오류 발생:\n{str(e)}\n\n상세 정보:\n{traceback.format_exc()}"}
+
+    result = namespace.get("result")
+    if result is None:
+        return {"error": "코드 실행은 성공했지만 'result' 변수가 설정되지 않았습니다."}
+    if not isinstance(result, (pd.DataFrame, pd.Series)):
+        result = str(result)
+    return {"value": result}
+
+
+# --- 작업 프로세스 ---
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _write_frame(df: pd.DataFrame, directory: str = _SHM_DIR) -> str:
+    """DataFrame을 Arrow IPC 파일로 내보내고 경로를 반환합니다 (기본값: 공유 메모리 디렉터리)."""
+    path = os.path.join(directory, f"dart_sandbox_{os.getpid()}_{uuid.uuid4().hex}.arrow")
+    table = pa.Table.from_pandas(df)
+    try:
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    except Exception:
+        _remove_file(path)
+        raise
+    return path
+
+
+def _pack_value(reply: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    결과 DataFrame/Series를 Arrow IPC 파일로 내보내 파이프로는 경로만 전달합니다.
+    Arrow로 변환할 수 없는 결과(혼합 타입 컬럼 등)는 그대로 전달합니다.
+    """
+    value = reply.get("value")
+    if not HAS_ARROW or not isinstance(value, (pd.DataFrame, pd.Series)):
+        return reply
+    series = isinstance(value, pd.Series)
+    frame = value.to_frame(name=value.name if value.name is not None else "value") if series else value
+    try:
+        return {"frame": _write_frame(frame), "series": series}
+    except Exception:
+        return reply
+
+
+def _unpack_value(reply: Dict[str, Any]) -> Dict[str, Any]:
+    """작업 프로세스가 내보낸 결과 파일을 읽고 삭제합니다."""
+    if "frame" not in reply:
+        return reply
+    try:
+        value = _read_frame(reply["frame"])
+    finally:
+        _remove_file(reply["frame"])
+    if reply.get("series"):
+        value = value.iloc[:, 0]
+    return {"value": value}
+
+
+def _read_frame(location: Any) -> pd.DataFrame:
+    """전달받은 위치(Arrow IPC/Feather 파일 경로, Parquet 파일 경로 또는 DataFrame)에서 DataFrame을 읽습니다."""
+    if isinstance(location, pd.DataFrame):
+        return location
+    if location.endswith(".parquet"):
+        return pd.read_parquet(location)
+    with pa.memory_map(location, "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+class _SharedFrames(Mapping):
+    """
+    작업 프로세스의 'data' 딕셔너리. 코드가 실제로 사용하는 DataFrame만 읽고,
+    같은 DataFrame(같은 토큰)은 다음 호출에서도 다시 읽지 않습니다.
+    """
+
+    def __init__(self, manifest: Dict[str, Tuple[Any, Any]], cache: Dict[str, Tuple[Any, pd.DataFrame]]):
+        self._manifest = manifest
+        self._cache = cache
+
+    def __getitem__(self, key: str) -> pd.DataFrame:
+        if key not in self._manifest:
+            raise KeyError(key)
+        token, location = self._manifest[key]
+        cached = self._cache.get(key)
+        if cached is None or cached[0] != token:
+            cached = self._cache[key] = (token, _read_frame(location))
+        return cached[1]
+
+    def __iter__(self):
+        return iter(self._manifest)
+
+    def __len__(self) -> int:
+        return len(self._manifest)
+
+
+def _raise_cpu_exceeded(signum, frame):
+    raise _CpuTimeExceeded()
+
+
+def _set_cpu_limit(seconds: Optional[float]):
+    """이번 호출에 쓸 수 있는 CPU 시간을 지정합니다 (None이면 해제)."""
+    if resource is None or not hasattr(resource, "RLIMIT_CPU"):
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if seconds is None:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime + seconds) + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn):
+    """작업 프로세스의 메인 루프: (코드, 공유 DataFrame 목록, CPU 제한)을 받아 실행 결과를 돌려줍니다."""
+    import numpy as np
+    from utils.fact_table import FactTable
+
+    if hasattr(signal, "SIGXCPU"):
+        signal.signal(signal.SIGXCPU, _raise_cpu_exceeded)
+    cache: Dict[str, Tuple[Any, pd.DataFrame]] = {}
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        code, manifest, cpu_seconds = message
+
+        try:
+            frames = {key: value for key, value in manifest.items() if key != FACTS_KEY}
+            data = _SharedFrames(frames, cache)
+            facts = FactTable()
+            if FACTS_KEY in manifest:
+                facts = FactTable.from_frame(_SharedFrames({FACTS_KEY: manifest[FACTS_KEY]}, cache)[FACTS_KEY])
+            # 더 이상 저장소에 없는 DataFrame은 캐시에서 제거
+            for key in [key for key in cache if key not in manifest]:
+                del cache[key]
+
+            _set_cpu_limit(cpu_seconds)
+            try:
+                reply = run_code(code, {"data": data, "facts": facts, "pd": pd, "np": np})
+            finally:
+                _set_cpu_limit(None)
+        except _CpuTimeExceeded:
+            reply = {"error": f"코드 실행이 CPU 시간 제한({cpu_seconds:g}초)을 초과하여 중단되었습니다."}
+        except Exception as e:
+            reply = {"error": f"샌드박스 실행 준비 중 오류 발생: {e}"}
+
+        try:
+            conn.send(_pack_value(reply))
+        except Exception as e:
+            conn.send({"error": f"실행 결과를 전달할 수 없습니다: {e}"})
+
+
+# --- 부모 프로세스 ---
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """프로세스의 현재 RSS(MB)를 반환합니다 (확인할 수 없으면 None)."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+class _Worker:
+    """작업 프로세스 하나와 통신 파이프"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def kill(self):
+        """작업 프로세스를 즉시 종료합니다."""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+    def stop(self):
+        """작업 프로세스에 종료를 요청하고, 응답이 없으면 강제 종료합니다."""
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=1)
+        except (OSError, ValueError):
+            pass
+        self.kill()
+
+
+class SandboxPool:
+    """
+    미리 띄워 둔 작업 프로세스 풀.
+
+    run()은 유휴 작업 프로세스 하나를 빌려 코드를 실행하고, 실행 시간/메모리 한도를 감시합니다.
+    """
+
+    def __init__(self,
+                 size: int = SANDBOX_WORKERS,
+                 max_tasks: int = SANDBOX_MAX_TASKS,
+                 cpu_seconds: float = SANDBOX_CPU_SECONDS,
+                 wall_seconds: float = SANDBOX_WALL_SECONDS,
+                 max_rss_mb: int = SANDBOX_MAX_RSS_MB):
+        """
+        Args:
+            size (int): 작업 프로세스 수 (동시에 실행할 수 있는 코드 수)
+            max_tasks (int): 작업 프로세스 하나가 교체되기 전까지 실행할 호출 수
+            cpu_seconds (float): 호출당 CPU 시간 제한 (초)
+            wall_seconds (float): 호출당 실행 시간 제한 (초)
+            max_rss_mb (int): 작업 프로세스의 최대 메모리 사용량 (MB)
+        """
+        self.size = max(1, size)
+        self.max_tasks = max_tasks
+        self.cpu_seconds = cpu_seconds
+        self.wall_seconds = wall_seconds
+        self.max_rss_mb = max_rss_mb
+
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        if self._context.get_start_method() == "forkserver":
+            self._context.set_forkserver_preload(PRELOAD_MODULES)
+
+        # id(DataFrame) → (약한 참조, Arrow IPC 파일 경로, 토큰)
+        # 토큰은 내보낼 때마다 새로 발급하여, 재사용된 id의 새 DataFrame을 작업 프로세스가 캐시로 착각하지 않게 함
+        self._exports: Dict[int, Tuple[weakref.ref, str, int]] = {}
+        self._tokens = itertools.count(1)
+        self._export_lock = threading.Lock()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._closed = False
+        for _ in range(self.size):
+            self._idle.put(_Worker(self._context))
+
+    # DataFrame 공유
+
+    def _export(self, df: pd.DataFrame) -> Tuple[Any, Any]:
+        """
+        DataFrame을 디스크의 Arrow IPC 파일로 한 번만 내보내고 (토큰, 위치)를 반환합니다.
+        파일은 원본 DataFrame이 사라질 때 함께 삭제됩니다. pyarrow가 없으면 DataFrame을 그대로 반환합니다.
+        """
+        if not HAS_ARROW:
+            return next(self._tokens), df
+        with self._export_lock:
+            exported = self._exports.get(id(df))
+            if exported is not None and exported[0]() is df:
+                return exported[2], exported[1]
+
+            path = _write_frame(df, EXPORT_DIR)
+            token = next(self._tokens)
+            self._exports[id(df)] = (weakref.ref(df), path, token)
+            weakref.finalize(df, self._forget, id(df), path)
+            return token, path
+
+    def _forget(self, object_id: int, path: str):
+        """원본 DataFrame이 사라지면 내보낸 파일을 삭제합니다."""
+        with self._export_lock:
+            exported = self._exports.get(object_id)
+            if exported is not None and exported[1] == path:
+                del self._exports[object_id]
+        _remove_file(path)
+
+    def _manifest(self, data_store, code: str) -> Dict[str, Tuple[Any, Any]]:
+        """저장소의 DataFrame과 (코드에서 사용하는 경우) 팩트 테이블의 공유 위치 목록을 만듭니다."""
+        manifest = {}
+        for key in data_store.list_keys():
+            # 저장소가 디스크에 저장한 파일을 작업 프로세스가 직접 읽음 (파일 경로는 저장할 때마다 새로 만들어지므로 토큰으로 사용)
+            path = data_store.file_for(key)
+            if path is None:
+                # 파일로 저장할 수 없는 DataFrame(pyarrow 없음 등)은 메모리에 있으므로 직접 내보냄
+                frame, path = data_store.locate(key)
+                if frame is not None:
+                    manifest[key] = self._export(frame)
+                    continue
+            manifest[key] = (path, path)
+        facts = getattr(data_store, "facts", None) if re.search(r"\bfacts\b", code) else None
+        if facts is not None and len(facts.source_keys()):
+            manifest[FACTS_KEY] = self._export(facts.frame)
+        return manifest
+
+    # 실행
+
+    def _replace(self, worker: _Worker, kill: bool):
+        """작업 프로세스를 종료하고 새 작업 프로세스를 풀에 넣습니다."""
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+        if not self._closed:
+            self._idle.put(_Worker(self._context))
+
+    def run(self, code: str, data_store) -> Dict[str, Any]:
+        """
+        저장소의 데이터를 공유한 작업 프로세스에서 코드를 실행합니다.
+
+        Args:
+            code (str): 실행할 코드 ('result' 변수에 결과 할당)
+            data_store (SessionDataStore): 'data'/'facts'로 노출할 데이터 저장소
+
+        Returns:
+            Dict[str, Any]: {"value": DataFrame, Series 또는 문자열} 또는 {"error": 메시지}
+        """
+        if self._closed:
+            return {"error": "샌드박스가 종료되었습니다."}
+        manifest = self._manifest(data_store, code)
+
+        try:
+            worker = self._idle.get(timeout=self.wall_seconds)
+        except queue.Empty:
+            return {"error": "실행 가능한 샌드박스 작업 프로세스가 없습니다. 잠시 후 다시 시도하세요."}
+
+        try:
+            worker.conn.send((code, manifest, self.cpu_seconds))
+            deadline = time.monotonic() + self.wall_seconds
+            while not worker.conn.poll(_POLL_INTERVAL):
+                if not worker.process.is_alive():
+                    self._replace(worker, kill=True)
+                    return {"error": "코드 실행 중 작업 프로세스가 비정상 종료되었습니다."}
+                rss = _rss_mb(worker.process.pid)
+                if rss is not None and rss > self.max_rss_mb:
+                    self._replace(worker, kill=True)
+                    return {"error": f"코드 실행이 메모리 한도({self.max_rss_mb}MB)를 초과하여 중단되었습니다."}
+                if time.monotonic() > deadline:
+                    self._replace(worker, kill=True)
+                    return {"error": f"코드 실행이 시간 제한({self.wall_seconds:g}초)을 초과하여 중단되었습니다."}
+            reply = _unpack_value(worker.conn.recv())
+        except (EOFError, OSError) as e:
+            self._replace(worker, kill=True)
+            return {"error": f"작업 프로세스와 통신 중 오류 발생: {e}"}
+
+        worker.tasks += 1
+        rss = _rss_mb(worker.process.pid)
+        if worker.tasks >= self.max_tasks or (rss is not None and rss > self.max_rss_mb):
+            self._replace(worker, kill=False)
+        else:
+            self._idle.put(worker)
+        return reply
+
+    def close(self):
+        """모든 작업 프로세스를 종료하고 내보낸 파일을 삭제합니다."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+        with self._export_lock:
+            paths = [path for _, path, _ in self._exports.values()]
+            self._exports.clear()
+        for path in paths:
+            _remove_file(path)
+
+
+# 프로세스 전역 풀 (최초 사용 시 생성)
+_pool: Optional[SandboxPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_sandbox_pool() -> SandboxPool:
+    """프로세스 전역 샌드박스 풀을 반환합니다 (최초 호출 시 작업 프로세스를 띄웁니다)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SandboxPool()
+            atexit.register(_pool.close)
+        return _pool
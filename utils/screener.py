@@ -0,0 +1,291 @@
+"""
+재무 스크리닝 모듈
+
+많은 회사의 주요계정을 (corp_code, bsns_year, reprt_code, fs_div)당 한 행인 컬럼형 테이블로 보관하고,
+"영업이익률 > 15", "부채비율 < 100" 같은 조건을 컬럼 전체에 대한 numpy 비교로 한 번에 평가합니다.
+테이블은 다중회사 주요계정(fnlttMultiAcnt) 응답이나 SessionDataStore에 저장되는 재무제표로 채우며,
+비율은 ratio_engine과 같은 정의로 테이블이 바뀔 때 한 번만 계산합니다.
+"""
+
+import operator
+import re
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.account_taxonomy import canonical_metric, resolve
+from utils.ratio_engine import BASE_METRICS, RATIO_NAMES, canonical_ratio, compute_ratios
+
+# 테이블 한 행을 식별하는 키
+SCREEN_KEYS = ["corp_code", "bsns_year", "reprt_code", "fs_div"]
+LABEL_COLUMNS = ["corp_name", "stock_code"]
+
+# 보관하는 금액 지표 (비율 계산용 지표 + 주요계정에 있는 그 밖의 지표)
+SCREEN_METRICS: List[str] = list(dict.fromkeys(BASE_METRICS + ["비유동자산", "비유동부채", "법인세비용차감전순이익"]))
+PREVIOUS_SUFFIX = "_전기"
+
+# 조건식: "<지표> <비교 연산자> <숫자>[단위]"
+_CONDITION_PATTERN = re.compile(
+    r"^\s*(?P<field>.+?)\s*(?P<op>>=|<=|==|!=|>|<)\s*(?P<value>-?[\d,]*\.?\d+)\s*(?P<unit>조원|조|억원|억|원|%)?\s*$"
+)
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+_UNITS = {"조원": 1e12, "조": 1e12, "억원": 1e8, "억": 1e8, "원": 1, "%": 1, None: 1}
+
+
+class Condition(NamedTuple):
+    """스크리닝 조건 하나"""
+    field: str      # 테이블 컬럼 (표준 비율명 또는 표준 지표명)
+    op: str         # 비교 연산자
+    value: float    # 비교 값 (금액은 원 단위로 환산)
+
+    def __str__(self) -> str:
+        return f"{self.field} {self.op} {self.value:g}"
+
+
+def resolve_field(name: str) -> Optional[str]:
+    """조건/정렬에 쓴 이름을 테이블 컬럼명(표준 비율명 또는 표준 지표명)으로 바꿉니다."""
+    ratio = canonical_ratio(name)
+    if ratio is not None:
+        return ratio
+    metric = canonical_metric(name)
+    return metric if metric in SCREEN_METRICS else None
+
+
+def parse_condition(text: str) -> Condition:
+    """
+    "영업이익률 > 15", "매출액 >= 1조" 같은 조건식을 파싱합니다.
+
+    Raises:
+        ValueError: 형식이 맞지 않거나 지원하지 않는 지표인 경우
+    """
+    match = _CONDITION_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"조건식 형식이 올바르지 않습니다: '{text}' (예: '영업이익률 > 15')")
+    field = resolve_field(match.group("field"))
+    if field is None:
+        raise ValueError(f"지원하지 않는 지표입니다: '{match.group('field')}'")
+    value = float(match.group("value").replace(",", "")) * _UNITS[match.group("unit")]
+    return Condition(field, match.group("op"), value)
+
+
+def _key_accounts_rows(df: pd.DataFrame, amount_column: str) -> pd.DataFrame:
+    """주요계정 긴 형식 행을 SCREEN_KEYS × 지표 넓은 형식으로 바꿉니다."""
+    if amount_column not in df.columns:
+        return pd.DataFrame(columns=SCREEN_METRICS)
+    wide = df.pivot_table(index=SCREEN_KEYS, columns="metric", values=amount_column,
+                          aggfunc="first", observed=True)
+    return wide.reindex(columns=SCREEN_METRICS).astype("float64")
+
+
+class ScreeningTable:
+    """
+    스크리닝용 회사 × 연도 주요계정 테이블.
+
+    load_key_accounts()/add_statement()로 행을 추가하면 다음 조회 때 비율까지 포함한 테이블을
+    한 번 다시 만들고, 이후 screen()은 만들어 둔 컬럼에 대한 벡터 연산만 수행합니다.
+    """
+
+    def __init__(self):
+        self._rows = pd.DataFrame(columns=LABEL_COLUMNS + SCREEN_METRICS
+                                  + [metric + PREVIOUS_SUFFIX for metric in SCREEN_METRICS])
+        self._rows.index = pd.MultiIndex.from_arrays([[]] * len(SCREEN_KEYS), names=SCREEN_KEYS)
+        self._frame: Optional[pd.DataFrame] = None
+        # (사업연도, 보고서 코드, 우선 재무제표 구분) → (회사당 한 행으로 고른 조회 대상, 컬럼별 numpy 배열)
+        self._views: Dict[Tuple[str, str, str], Tuple[pd.DataFrame, Dict[str, np.ndarray]]] = {}
+        self._years: Optional[List[str]] = None
+        self._lock = threading.Lock()
+
+    def _merge(self, rows: pd.DataFrame):
+        """행을 추가합니다 (같은 키는 새 값으로 교체)."""
+        with self._lock:
+            rows = rows.reindex(columns=self._rows.columns)
+            merged = pd.concat([self._rows, rows]) if len(self._rows) else rows
+            self._rows = merged[~merged.index.duplicated(keep="last")]
+            self._frame = None
+            self._views = {}
+            self._years = None
+
+    def load_key_accounts(self, df: pd.DataFrame, corp_names: Optional[Dict[str, str]] = None,
+                          stock_codes: Optional[Dict[str, str]] = None) -> int:
+        """
+        다중회사 주요계정(fnlttMultiAcnt) 응답 DataFrame을 테이블에 추가합니다.
+
+        Args:
+            df (pd.DataFrame): corp_code, bsns_year, reprt_code, fs_div, account_nm, 금액 컬럼을 가진 DataFrame
+            corp_names (dict, optional): corp_code → 회사명
+            stock_codes (dict, optional): corp_code → 종목코드
+
+        Returns:
+            int: 추가된 행 수
+        """
+        if df is None or df.empty or any(col not in df.columns for col in ["account_nm"] + SCREEN_KEYS):
+            return 0
+        df = df.copy()
+        for col in SCREEN_KEYS:
+            df[col] = df[col].astype(str)
+        names = {name: canonical_metric(name) for name in df["account_nm"].astype(str).unique()}
+        df["metric"] = df["account_nm"].astype(str).map(names)
+        df = df[df["metric"].isin(SCREEN_METRICS)]
+        if df.empty:
+            return 0
+
+        current = _key_accounts_rows(df, "thstrm_amount")
+        previous = _key_accounts_rows(df, "frmtrm_amount").add_suffix(PREVIOUS_SUFFIX)
+        rows = current.join(previous)
+        corp_codes = rows.index.get_level_values("corp_code")
+        stock_from_response = {}
+        if "stock_code" in df.columns:
+            stock_from_response = dict(zip(df["corp_code"], df["stock_code"].astype(str).str.strip()))
+        rows["corp_name"] = [(corp_names or {}).get(code, code) for code in corp_codes]
+        rows["stock_code"] = [(stock_codes or {}).get(code) or stock_from_response.get(code, "") for code in corp_codes]
+        self._merge(rows)
+        return len(rows)
+
+    def add_statement(self, df: pd.DataFrame, metadata: Dict[str, Any],
+                      standard: Optional[Dict[str, Tuple[int, str]]] = None) -> bool:
+        """
+        단일회사 전체 재무제표 DataFrame 하나를 테이블 행으로 추가합니다.
+
+        Args:
+            df (pd.DataFrame): 단일회사 전체 재무제표 DataFrame
+            metadata (dict): corp_code, corp_name, bsns_year, reprt_code, fs_div
+            standard (dict, optional): 미리 계산한 standard_positions(df) 결과
+
+        Returns:
+            bool: 재무제표 형식이고 식별 정보가 있어 추가되었는지 여부
+        """
+        if not metadata.get("corp_code") or not metadata.get("bsns_year"):
+            return False
+        if df.empty or any(col not in df.columns for col in ("account_nm", "sj_div", "thstrm_amount")):
+            return False
+        resolved = resolve(df, SCREEN_METRICS, amount_columns=("thstrm_amount", "frmtrm_amount"), standard=standard)
+        if resolved["position"].isna().all():
+            return False
+
+        row = {
+            "corp_name": metadata.get("corp_name") or metadata["corp_code"],
+            "stock_code": metadata.get("stock_code", ""),
+        }
+        current = pd.to_numeric(resolved["thstrm_amount"], errors="coerce").astype("float64")
+        previous = pd.to_numeric(resolved["frmtrm_amount"], errors="coerce").astype("float64")
+        row.update(zip(SCREEN_METRICS, current.tolist()))
+        row.update(zip([metric + PREVIOUS_SUFFIX for metric in SCREEN_METRICS], previous.tolist()))
+        key = (str(metadata["corp_code"]), str(metadata["bsns_year"]),
+               str(metadata.get("reprt_code") or "11011"), str(metadata.get("fs_div") or "CFS"))
+        self._merge(pd.DataFrame([row], index=pd.MultiIndex.from_tuples([key], names=SCREEN_KEYS)))
+        return True
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """식별 컬럼, 회사명, 지표, 비율(%)을 가진 테이블 (행 번호 인덱스)"""
+        with self._lock:
+            if self._frame is None:
+                self._frame = self._build()
+            return self._frame
+
+    def _build(self) -> pd.DataFrame:
+        """보관된 지표로 비율을 계산하여 조회용 테이블을 만듭니다."""
+        rows = self._rows
+        current = rows[SCREEN_METRICS].astype("float64")
+        previous = rows[[metric + PREVIOUS_SUFFIX for metric in SCREEN_METRICS]].astype("float64")
+        previous.columns = SCREEN_METRICS
+        frame = pd.concat([rows[LABEL_COLUMNS], current, compute_ratios(current, previous)], axis=1)
+        return frame.reset_index()
+
+    def _view(self, year: str, reprt_code: str, fs_div: str) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+        """
+        조회 대상 행을 회사당 한 행으로 고릅니다. 우선 구분(fs_div) 행이 없는 회사는 다른 구분의 행을 사용합니다.
+        조건 평가에 쓴 컬럼은 numpy 배열로 함께 캐시합니다.
+        """
+        frame = self.frame
+        view_key = (year, reprt_code, fs_div)
+        cached = self._views.get(view_key)
+        if cached is None:
+            mask = (frame["bsns_year"].to_numpy() == year) & (frame["reprt_code"].to_numpy() == reprt_code)
+            view = frame[mask]
+            view = view.iloc[np.argsort(view["fs_div"].to_numpy() != fs_div, kind="stable")]
+            view = view[~view["corp_code"].duplicated(keep="first")]
+            cached = self._views[view_key] = (view, {})
+        return cached
+
+    @staticmethod
+    def _values(view: Tuple[pd.DataFrame, Dict[str, np.ndarray]], field: str) -> np.ndarray:
+        """조회 대상의 컬럼 값을 float 배열로 반환합니다 (캐시)."""
+        frame, columns = view
+        if field not in columns:
+            columns[field] = frame[field].to_numpy(dtype="float64")
+        return columns[field]
+
+    def years(self) -> List[str]:
+        """테이블에 있는 사업연도 목록 (최근 연도 순)"""
+        if self._years is None:
+            self._years = sorted(self._rows.index.get_level_values("bsns_year").unique(), reverse=True)
+        return list(self._years)
+
+    def screen(self, conditions: List[str],
+               year: Optional[str] = None,
+               reprt_code: str = "11011",
+               fs_div: str = "CFS",
+               sort_by: Optional[str] = None,
+               ascending: bool = False,
+               top_k: Optional[int] = 20) -> Tuple[pd.DataFrame, int]:
+        """
+        조건을 모두 만족하는 회사를 찾아 정렬합니다.
+
+        Args:
+            conditions (List[str]): 조건식 목록 (모두 만족해야 함, 예: ["영업이익률 > 15", "부채비율 < 100"])
+            year (str, optional): 사업연도 (기본값: 테이블의 가장 최근 연도)
+            reprt_code (str): 보고서 코드 (기본값: 사업보고서)
+            fs_div (str): 우선 사용할 재무제표 구분. 그 구분이 없는 회사는 다른 구분의 값을 사용합니다.
+            sort_by (str, optional): 정렬 기준 (기본값: 첫 번째 조건의 지표)
+            ascending (bool): 오름차순 정렬 여부
+            top_k (int, optional): 반환할 최대 회사 수 (None이면 전체)
+
+        Returns:
+            tuple: (회사명, 종목코드, 재무제표 구분, 조건/정렬 지표 컬럼을 가진 결과 DataFrame, 조건을 만족한 전체 회사 수)
+
+        Raises:
+            ValueError: 조건식이나 정렬 기준이 올바르지 않은 경우
+        """
+        parsed = [parse_condition(text) for text in conditions]
+        sort_field = resolve_field(sort_by) if sort_by else (parsed[0].field if parsed else None)
+        if sort_by and sort_field is None:
+            raise ValueError(f"지원하지 않는 정렬 기준입니다: '{sort_by}'")
+
+        if len(self) == 0:
+            return self.frame, 0
+        year = str(year) if year else self.years()[0]
+        view = self._view(year, reprt_code, fs_div)
+
+        selected = np.ones(len(view[0]), dtype=bool)
+        for condition in parsed:
+            with np.errstate(invalid="ignore"):
+                selected &= _OPERATORS[condition.op](self._values(view, condition.field), condition.value)
+        positions = np.flatnonzero(selected)
+
+        if sort_field is not None:
+            keys = self._values(view, sort_field)[positions]
+            # 값이 없는(NaN) 회사는 정렬 방향과 관계없이 마지막
+            positions = positions[np.argsort(keys if ascending else -keys, kind="stable")]
+        if top_k is not None:
+            positions = positions[:top_k]
+        columns = ["corp_name", "stock_code", "fs_div"] + list(dict.fromkeys(
+            [condition.field for condition in parsed] + ([sort_field] if sort_field else [])))
+        return view[0].iloc[positions][columns].reset_index(drop=True), int(selected.sum())
+
+
+def is_ratio(field: str) -> bool:
+    """컬럼이 비율(%)인지 여부 (아니면 원 단위 금액)"""
+    return field in RATIO_NAMES
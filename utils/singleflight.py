@@ -0,0 +1,75 @@
+"""
+동일한 작업의 중복 실행을 막는 singleflight 유틸리티
+
+같은 키로 동시에 들어온 호출들은 하나의 실행 결과를 기다렸다가 함께 공유합니다.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """진행 중인 호출 하나의 상태"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    키별로 동시에 하나의 실행만 허용하는 호출 병합기.
+
+    먼저 들어온 호출이 실제 함수를 실행하고, 실행 중에 같은 키로 들어온 호출들은
+    그 결과(또는 예외)를 그대로 받습니다. 실행이 끝나면 키가 해제되므로 결과를 캐시하지는 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        key에 대해 fn(*args, **kwargs)를 실행하거나, 진행 중인 실행의 결과를 기다립니다.
+
+        Args:
+            key (Hashable): 동일한 작업을 식별하는 키
+            fn (Callable): 실행할 함수
+
+        Returns:
+            Any: fn의 반환값
+
+        Raises:
+            fn에서 발생한 예외를 모든 대기자에게 그대로 전달합니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """현재 진행 중인 키의 개수를 반환합니다."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,171 @@
+"""
+SessionDataStore SQL 조회 모듈 (선택 사항)
+
+duckdb가 설치되어 있으면 저장소의 모든 DataFrame을 복사 없이 DuckDB 테이블(뷰)로 등록하여
+여러 재무제표에 걸친 조인/필터/집계를 SQL 한 문장으로 실행합니다. DuckDB는 서버 프로세스 안에서
+컬럼 단위 벡터 연산과 멀티스레드로 실행되며, SELECT 문만 허용하고 파일/네트워크 접근을 막으며
+실행 시간/메모리 한도를 적용합니다.
+
+등록되는 테이블:
+- 저장소 키: 각 DataFrame (예: "삼성전자_fs_2023_consolidated", 이름은 큰따옴표로 감쌈)
+- facts: 재무 팩트 테이블 (corp_name, fiscal_year, account_id, account_nm, period, amount 등)
+- ratios: 저장소 키별 표준 재무비율 (%)
+- screening: 스크리닝 테이블 (주요계정 지표와 비율)
+
+디스크에 있는 DataFrame(내려놓거나 영속화한 파일)은 메모리로 불러오지 않고 파일을 직접 조회합니다.
+duckdb(와 pyarrow)가 없으면 HAS_DUCKDB가 False이며 SQL 도구는 등록되지 않습니다.
+"""
+
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+
+try:
+    import duckdb
+    import pyarrow.dataset as pa_dataset
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+# SQL 실행 설정 (환경 변수로 재정의 가능)
+SQL_TIMEOUT_SECONDS = float(os.getenv("DART_SQL_TIMEOUT_SECONDS", "30"))
+SQL_MEMORY_LIMIT = os.getenv("DART_SQL_MEMORY_LIMIT", "1GB")
+SQL_THREADS = int(os.getenv("DART_SQL_THREADS", "0"))  # 0이면 DuckDB 기본값 (CPU 코어 수)
+
+# 결과로 가져올 최대 행 수
+SQL_MAX_ROWS = 100_000
+
+# 허용하는 SQL 문 종류 (WITH ... SELECT 포함)
+ALLOWED_STATEMENTS = ("SELECT",)
+
+
+class SqlEngine:
+    """
+    SessionDataStore에 연결된 DuckDB 인메모리 데이터베이스.
+
+    query()를 호출할 때마다 저장소와 등록된 테이블을 비교하여 새로 추가되거나 바뀐 DataFrame만
+    다시 등록합니다. 등록은 DataFrame을 복사하지 않고 DuckDB가 직접 스캔하도록 연결하는 것입니다.
+    """
+
+    def __init__(self, data_store,
+                 timeout_seconds: float = SQL_TIMEOUT_SECONDS,
+                 memory_limit: str = SQL_MEMORY_LIMIT,
+                 threads: int = SQL_THREADS):
+        """
+        Args:
+            data_store (SessionDataStore): 테이블로 등록할 데이터 저장소
+            timeout_seconds (float): 쿼리당 실행 시간 제한 (초)
+            memory_limit (str): DuckDB 메모리 한도 (예: '1GB')
+            threads (int): DuckDB 스레드 수 (0이면 기본값)
+
+        Raises:
+            ImportError: duckdb가 설치되어 있지 않은 경우
+        """
+        if not HAS_DUCKDB:
+            raise ImportError("duckdb가 설치되어 있지 않습니다. 'pip install duckdb'로 설치하세요.")
+        # 파일/네트워크 접근은 막고 등록한 DataFrame만 조회할 수 있게 함
+        config = {"memory_limit": memory_limit, "enable_external_access": False}
+        if threads:
+            config["threads"] = threads
+        self._con = duckdb.connect(":memory:", config=config)
+        self._store = data_store
+        self.timeout_seconds = timeout_seconds
+        # 테이블명 → (원본 객체 또는 Parquet 경로, 등록한 객체): 원본이 바뀌었을 때만 다시 등록
+        self._registered: Dict[str, Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _derived_tables(self) -> Dict[str, Tuple[Callable[[], Any], Callable[[Any], pd.DataFrame]]]:
+        """저장소 키 외에 등록할 테이블: 이름 → (원본 조회 함수, 등록용 DataFrame 변환 함수)"""
+        store = self._store
+        return {
+            "facts": (lambda: store.facts.frame, lambda frame: frame.reset_index()),
+            "ratios": (lambda: store.ratios.frame, lambda frame: frame.reset_index()),
+            "screening": (lambda: store.screening.frame, lambda frame: frame),
+        }
+
+    def _sync(self, sql: str):
+        """
+        저장소의 DataFrame과 파생 테이블을 등록 상태와 맞춥니다.
+        파생 테이블(facts 등)은 쿼리에서 사용할 때만 최신 상태로 다시 만듭니다.
+        """
+        sources: Dict[str, Tuple[Any, Callable[[Any], Any]]] = {}
+        for key in self._store.list_keys():
+            # 디스크에 있는 DataFrame은 불러오지 않고 Parquet/Feather 파일을 Arrow 데이터셋으로 등록
+            frame, path = self._store.locate(key)
+            if path is not None:
+                sources[key] = (path, lambda source: pa_dataset.dataset(
+                    source, format="parquet" if source.endswith(".parquet") else "feather"))
+            else:
+                sources[key] = (frame, lambda source: source)
+        for name, (source, convert) in self._derived_tables().items():
+            if name in sources:
+                continue
+            if not re.search(rf"\b{name}\b", sql, re.IGNORECASE):
+                if name in self._registered:
+                    sources[name] = (self._registered[name][0], convert)
+                continue
+            try:
+                sources[name] = (source(), convert)
+            except Exception as e:
+                print(f"SQL 테이블 '{name}' 준비 중 오류 발생: {e}")
+
+        for name in [name for name in self._registered if name not in sources]:
+            self._con.unregister(name)
+            del self._registered[name]
+        for name, (source, convert) in sources.items():
+            registered = self._registered.get(name)
+            if registered is not None and registered[0] is source:
+                continue
+            frame = convert(source)
+            self._con.register(name, frame)
+            self._registered[name] = (source, frame)
+
+    def table_names(self) -> List[str]:
+        """SQL에서 사용할 수 있는 테이블 이름 목록을 반환합니다."""
+        keys = self._store.list_keys()
+        return keys + [name for name in self._derived_tables() if name not in keys]
+
+    def query(self, sql: str, max_rows: int = SQL_MAX_ROWS) -> Tuple[pd.DataFrame, bool]:
+        """
+        SELECT 문 하나를 실행합니다.
+
+        Args:
+            sql (str): 실행할 SQL (SELECT 또는 WITH ... SELECT)
+            max_rows (int): 가져올 최대 행 수
+
+        Returns:
+            tuple: (결과 DataFrame, max_rows를 넘어 잘렸는지 여부)
+
+        Raises:
+            ValueError: SELECT가 아닌 문이거나 여러 문을 실행하려는 경우
+            TimeoutError: 실행 시간 제한을 넘은 경우
+            duckdb.Error: SQL 문법/실행 오류
+        """
+        with self._lock:
+            self._sync(sql)
+            statements = self._con.extract_statements(sql)
+            if len(statements) != 1:
+                raise ValueError("SQL 문은 한 번에 하나만 실행할 수 있습니다.")
+            if statements[0].type.name not in ALLOWED_STATEMENTS:
+                raise ValueError(f"조회(SELECT) 문만 실행할 수 있습니다: {statements[0].type.name}")
+
+            timer = threading.Timer(self.timeout_seconds, self._con.interrupt)
+            timer.start()
+            try:
+                result = self._con.sql(sql).limit(max_rows + 1).df()
+            except duckdb.InterruptException:
+                raise TimeoutError(f"SQL 실행이 시간 제한({self.timeout_seconds:g}초)을 초과하여 중단되었습니다.")
+            finally:
+                timer.cancel()
+
+        truncated = len(result) > max_rows
+        return (result.iloc[:max_rows] if truncated else result), truncated
+
+    def close(self):
+        """DuckDB 연결을 닫습니다."""
+        with self._lock:
+            self._registered.clear()
+            self._con.close()
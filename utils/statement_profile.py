@@ -0,0 +1,81 @@
+"""
+재무제표 DataFrame 요약(profile) 모듈
+
+SessionDataStore에 DataFrame이 저장될 때 크기, 컬럼 타입, 재무제표 구분별 행 수,
+금액 상위 계정, 주요 재무 항목, 상위 행 미리보기를 한 번만 계산해 둡니다.
+get_dataframe_info 등의 도구는 호출할 때마다 정렬/검색을 다시 하지 않고 이 요약을 사용합니다.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from utils.account_taxonomy import resolve
+from utils.result_renderer import render_frame
+
+# 요약에 포함할 주요 재무 항목 (재무상태표, 손익계산서)
+BS_KEY_ITEMS = ["자산총계", "부채총계", "자본총계", "유동자산", "비유동자산"]
+IS_KEY_ITEMS = ["매출액", "매출총이익", "영업이익", "당기순이익"]
+KEY_ITEMS = BS_KEY_ITEMS + IS_KEY_ITEMS
+
+TOP_ACCOUNTS = 10
+HEAD_ROWS = 5
+
+
+class StatementProfile(NamedTuple):
+    """DataFrame 하나의 저장 시점 요약"""
+    shape: Tuple[int, int]
+    dtypes: Dict[str, str]                  # 컬럼명 → 데이터 타입
+    statements: Dict[str, int]              # 재무제표 구분(sj_div) → 행 수
+    top_accounts: List[Tuple[str, int]]     # 당기 금액 상위 (계정명, 금액)
+    key_items: Dict[str, int]               # 주요 재무 항목 → 당기 금액 (원)
+    head: str                               # 상위 행 미리보기 (CSV 형식)
+
+
+def extract_key_items(df: pd.DataFrame, standard: Optional[Dict[str, Tuple[int, str]]] = None) -> Dict[str, int]:
+    """
+    IFRS 계정 ID 기반 분류표로 주요 재무 항목의 당기 금액을 한 번에 조회합니다.
+
+    Args:
+        df (pd.DataFrame): 단일회사 재무제표 DataFrame
+        standard (dict, optional): 미리 계산한 standard_positions(df) 결과
+
+    Returns:
+        Dict[str, int]: 항목명 → 당기 금액 (찾지 못한 항목은 제외)
+    """
+    if df is None or df.empty or any(col not in df.columns for col in ("account_id", "account_nm", "sj_div", "thstrm_amount")):
+        return {}
+    resolved = resolve(df, KEY_ITEMS, standard=standard)
+    return {item: int(amount) for item, amount in resolved["thstrm_amount"].items() if pd.notna(amount)}
+
+
+def build_profile(df: pd.DataFrame, standard: Optional[Dict[str, Tuple[int, str]]] = None) -> StatementProfile:
+    """
+    DataFrame의 요약을 계산합니다.
+
+    Args:
+        df (pd.DataFrame): 저장할 DataFrame (재무제표 형식이 아니어도 됨)
+        standard (dict, optional): 미리 계산한 standard_positions(df) 결과
+
+    Returns:
+        StatementProfile: DataFrame 요약
+    """
+    statements = {}
+    if "sj_div" in df.columns:
+        statements = {str(sj_div): int(count) for sj_div, count in df["sj_div"].value_counts(sort=False).items()}
+
+    top_accounts = []
+    if "account_nm" in df.columns and "thstrm_amount" in df.columns:
+        amounts = pd.to_numeric(df["thstrm_amount"], errors="coerce").reset_index(drop=True)
+        top = amounts.dropna().nlargest(TOP_ACCOUNTS)
+        names = df["account_nm"].iloc[top.index]
+        top_accounts = [(str(name), int(amount)) for name, amount in zip(names, top)]
+
+    return StatementProfile(
+        shape=df.shape,
+        dtypes={str(col): str(dtype) for col, dtype in df.dtypes.items()},
+        statements=statements,
+        top_accounts=top_accounts,
+        key_items=extract_key_items(df, standard),
+        head=render_frame(df.head(HEAD_ROWS), title=f"상위 {HEAD_ROWS}개 행"),
+    )
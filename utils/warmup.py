@@ -0,0 +1,96 @@
+"""
+프로세스 시작 시 백그라운드 준비(warm-up) 모듈
+
+첫 번째 사용자 요청이 무거운 초기화 비용을 떠안지 않도록,
+회사 인덱스/검색 엔진, OpenDart HTTP 연결, 프롬프트, 컴파일된 워크플로우를
+백그라운드 스레드에서 미리 준비하고 준비 완료 여부를 알려줍니다.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+_ready = threading.Event()
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_workflows: Dict[bool, Any] = {}
+_errors: List[str] = []
+_timings: Dict[str, float] = {}
+
+
+def _step(name: str, fn):
+    """준비 단계 하나를 실행하고 소요 시간/오류를 기록합니다."""
+    started = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        _errors.append(f"{name}: {e}")
+    finally:
+        _timings[name] = time.perf_counter() - started
+
+
+def _warm_up(verbose: bool):
+    """백그라운드 스레드에서 실행되는 준비 작업"""
+    from resources.config import get_dart_api_key
+    from resources.prompt_loader import prompt_loader
+
+    def load_corp_search():
+        from tools.opendart.corp_search import get_corp_search
+        get_corp_search(get_dart_api_key())
+
+    def open_http_pool():
+        from tools.opendart.client import get_client
+        get_client().warm_up()
+
+    def load_prompts():
+        for agent_name in ("planner", "opendart", "analyze"):
+            prompt_loader.load_agent_prompts(agent_name)
+
+    def compile_workflow():
+        from agent.graph import create_dart_workflow
+        _workflows[verbose] = create_dart_workflow(verbose=verbose)
+
+    _step("corp_search", load_corp_search)
+    _step("http_pool", open_http_pool)
+    _step("prompts", load_prompts)
+    _step("workflow", compile_workflow)
+    _ready.set()
+
+
+def start_warmup(verbose: bool = False) -> threading.Thread:
+    """
+    백그라운드 준비 작업을 시작합니다. 이미 시작된 경우 기존 스레드를 반환합니다.
+
+    Args:
+        verbose (bool): 미리 컴파일할 워크플로우의 verbose 설정
+    """
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_warm_up, args=(verbose,), name="dart-warmup", daemon=True)
+            _thread.start()
+    return _thread
+
+
+def is_ready() -> bool:
+    """준비 작업이 끝났는지 여부를 반환합니다 (일부 단계가 실패해도 끝나면 True)."""
+    return _ready.is_set()
+
+
+def wait_until_ready(timeout: Optional[float] = None) -> bool:
+    """준비 작업이 끝날 때까지 최대 timeout초 기다립니다."""
+    return _ready.wait(timeout)
+
+
+def get_warm_workflow(verbose: bool = False):
+    """미리 컴파일된 워크플로우를 반환합니다 (아직 준비되지 않았으면 None)."""
+    return _workflows.get(verbose)
+
+
+def get_warmup_status() -> Dict[str, Any]:
+    """준비 상태, 단계별 소요 시간(초)과 오류 목록을 반환합니다."""
+    return {
+        "ready": is_ready(),
+        "timings": dict(_timings),
+        "errors": list(_errors),
+    }